@@ -1,4 +1,6 @@
 import os
+import click
+from urllib.parse import urlencode
 from flask import Flask, request
 from config import Config
 from extensions import db, login_manager, migrate, csrf
@@ -11,9 +13,36 @@ def create_app():
     # Initialize extensions
     db.init_app(app)
     login_manager.init_app(app)
-    migrate.init_app(app, db)
+    # init_db migrates too, from whatever directory a command or benchmark runs in
+    migrate.init_app(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
+
+    # Must run before CSRFProtect's hook, which is the first to read the form
+    @app.before_request
+    def raise_bulk_upload_limit():
+        if request.endpoint == 'admin.bulk_upload':
+            request.max_content_length = app.config['BULK_UPLOAD_MAX_SIZE']
+
     csrf.init_app(app)
 
+    from services.enquiry_queue import enquiry_queue
+    from services.jobs import job_runner
+    from services.listing_snapshot import listing_snapshot
+    from services.perf import perf_monitor
+    from services.response_cache import response_cache
+    from services.suggest import suggestion_index
+    from services.view_counter import view_counter
+    enquiry_queue.init_app(app)
+    job_runner.init_app(app)
+    if app.config['ANALYTICS_ROLLUP_INTERVAL']:
+        job_runner.schedule('analytics_rollup', app.config['ANALYTICS_ROLLUP_INTERVAL'])
+    if app.config['LISTING_SNAPSHOT']:
+        job_runner.schedule('listing_changes_prune', app.config['LISTING_SNAPSHOT_PRUNE_INTERVAL'])
+    listing_snapshot.init_app(app)
+    perf_monitor.init_app(app)
+    response_cache.init_app(app)
+    suggestion_index.init_app(app)
+    view_counter.init_app(app)
+
     # Exempt API endpoints from CSRF
     from routes.public import public_bp
     from routes.auth import auth_bp
@@ -46,14 +75,59 @@ def create_app():
                 args.pop(key, None)
             else:
                 args[key] = val
-        return '{}?{}'.format(request.path, '&'.join(f'{k}={v}' for k, v in args.items() if v))
+        return '{}?{}'.format(request.path, urlencode([(k, v) for k, v in args.items(multi=True) if v]))
 
-    # Create tables and seed data
-    with app.app_context():
-        import models  # noqa: F401
-        db.create_all()
-        from seed import seed_all
-        seed_all()
+    @app.cli.command('explain-queries')
+    @click.option('--verbose', is_flag=True, help='Print the full plan of every query.')
+    def explain_queries(verbose):
+        """Check that the hot listing queries use index scans."""
+        from services.explain import check_indexes
+        failed = 0
+        for name, (plan, scans) in check_indexes().items():
+            status = 'ok' if not scans else 'FULL SCAN on ' + ', '.join(scans)
+            click.echo(f'{name:<22} {status}')
+            if verbose or scans:
+                click.echo(plan)
+            failed += bool(scans)
+        if failed:
+            raise SystemExit(1)
+
+    @app.cli.command('build-similar')
+    def build_similar():
+        """Recompute the similar-properties table for every live listing."""
+        from services.similar import rebuild
+        click.echo(f'Stored neighbours for {rebuild()} listings')
+
+    @app.cli.command('gc-images')
+    @click.option('--dry-run', is_flag=True, help='Only report what would be removed.')
+    @click.option('--grace', type=int, default=None, help='Keep photos unused for fewer seconds than this.')
+    def gc_images(dry_run, grace):
+        """Remove stored photos no listing or profile uses any more."""
+        from services.image_store import collect_garbage
+        report = collect_garbage(grace=grace, dry_run=dry_run)
+        verb = 'Would remove' if dry_run else 'Removed'
+        click.echo(f"{verb} {report['blobs']} photos: {report['files']} files, "
+                   f"{report['bytes'] / (1024 * 1024):.1f} MB")
+
+    @app.cli.command('rollup-analytics')
+    def rollup_analytics():
+        """Bring the admin analytics rollups up to date, however far behind they are."""
+        from services.rollups import run
+        covered = run()['covered']
+        click.echo('Rolled up ' + ', '.join(f'{n:,} {name}' for name, n in covered.items()))
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Migrate or create the schema, then seed the localities, admin and sample listings."""
+        from seed import init_db
+        init_db()
+        click.echo('Database ready.')
+
+    # Off in production, where build.sh runs `flask init-db` once per deploy
+    if app.config['AUTO_INIT_DB']:
+        with app.app_context():
+            from seed import init_db
+            init_db()
 
     return app
 
@@ -61,4 +135,7 @@ def create_app():
 app = create_app()
 
 if __name__ == '__main__':
+    with app.app_context():
+        from seed import init_db
+        init_db()
     app.run(debug=True, port=5001)
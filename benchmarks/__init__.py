@@ -0,0 +1 @@
+"""Benchmarks, run as modules against a throwaway database: ``python -m benchmarks.<name> --help``."""
@@ -0,0 +1,228 @@
+"""Synthetic Mumbai dataset at benchmark scale, written with bulk inserts.
+
+    python -m benchmarks.dataset --database sqlite:////tmp/bench.db --listings 100000 --enquiries 10000000
+
+Listings are variations on the builder listings in ``seed_builders``: same
+property types, configurations, descriptions and amenities, spread over the
+``seed.LOCALITIES`` localities with prices scaled by zone. They belong to the
+builder accounts plus synthetic agents. Enquiry clicks favour the most viewed
+listings. Rows come from a seeded generator, so the same arguments give the
+same data (timestamps aside, which count back from now). Tables are only
+topped up: rerunning with larger sizes adds the difference.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+
+CHUNK_SIZE = 50000
+ENQUIRY_CHUNK_SIZE = 200000
+HISTORY_DAYS = 730
+
+# Price relative to the builder listing it is modelled on
+ZONE_PRICE_FACTOR = {
+    'South Mumbai': 2.2, 'Western Suburbs': 1.3, 'Central Suburbs': 1.0,
+    'Harbour Line': 0.75, 'Thane': 0.7, 'Navi Mumbai': 0.7,
+}
+STATUSES = (('active', 0.9), ('sold', 0.04), ('rented', 0.04), ('inactive', 0.02))
+TYPE_NAMES = {'flat': 'Flat', 'house': 'House', 'villa': 'Villa', 'plot': 'Plot', 'office': 'Office Space',
+              'shop': 'Shop', 'warehouse': 'Warehouse'}
+
+
+def _counts(db):
+    from sqlalchemy import func
+    from models import EnquiryLog, Property, User
+    return {
+        'listings': db.session.query(func.count(Property.id)).scalar(),
+        'enquiries': db.session.query(func.count(EnquiryLog.id)).scalar(),
+        'agents': db.session.query(func.count(User.id)).filter(User.role.in_(['agent', 'broker'])).scalar(),
+    }
+
+
+def ensure_agents(db, count):
+    """Create the builder accounts, then synthetic agents up to ``count`` agents in all."""
+    from sqlalchemy import insert
+    from werkzeug.security import generate_password_hash
+    from models import User
+    from seed_builders import BUILDERS
+
+    existing = {email for (email,) in db.session.query(User.email)}
+    password = generate_password_hash('bench123')
+    now = datetime.utcnow()
+    rows = [{
+        'name': b['name'], 'email': b['email'], 'phone': b['phone'], 'password_hash': password,
+        'role': 'broker', 'company': b['company'], 'rera_number': b['rera'], 'is_approved': True, 'created_at': now,
+    } for b in BUILDERS if b['email'] not in existing]
+    missing = count - _counts(db)['agents'] - len(rows)
+    start = sum(1 for email in existing if email.endswith('@agents.example'))
+    rows += [{
+        'name': f'Agent {n}', 'email': f'agent{n}@agents.example', 'phone': f'98{n:08d}'[:10],
+        'password_hash': password, 'role': 'agent', 'company': f'Agency {n % 500}', 'rera_number': f'A5{n:09d}',
+        'is_approved': True, 'created_at': now,
+    } for n in range(start, start + max(missing, 0))]
+    if rows:
+        db.session.execute(insert(User.__table__), rows)
+        db.session.commit()
+    return [user_id for (user_id,) in db.session.query(User.id).filter(User.role.in_(['agent', 'broker']))]
+
+
+def add_listings(db, start, stop, seed=1):
+    """Insert synthetic listings numbered ``start`` to ``stop - 1``."""
+    from sqlalchemy import insert
+    from helpers import slugify
+    from models import PRICE_MULTIPLIERS, Locality, Property, User, amenity_bits, price_to_inr
+    from seed_builders import BUILDER_PROPERTIES
+
+    rng = np.random.default_rng([seed, start])
+    localities = db.session.query(Locality.id, Locality.name, Locality.zone).all()
+    agent_ids = np.array([user_id for (user_id,) in db.session.query(User.id).filter(
+        User.role.in_(['agent', 'broker']))] or [None])
+    templates = []
+    for p in BUILDER_PROPERTIES:
+        amenities = json.loads(p['amenities'])
+        templates.append(dict(p, amenity_list=amenities, price_inr=price_to_inr(p['price'], p['price_unit'])))
+    statuses, weights = zip(*STATUSES)
+    now = datetime.utcnow()
+
+    for offset in range(start, stop, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, stop - offset)
+        picks = rng.integers(len(templates), size=size)
+        places = rng.integers(len(localities), size=size)
+        scale = rng.lognormal(0, 0.35, size)
+        area_scale = rng.normal(1, 0.15, size).clip(0.6, 1.6)
+        status = rng.choice(len(statuses), size=size, p=weights)
+        approved = rng.random(size) < 0.95
+        agents = rng.choice(agent_ids, size=size)
+        views = rng.lognormal(4, 1.2, size).astype(np.int64)
+        age = rng.integers(HISTORY_DAYS * 86400, size=size)
+        keep = rng.random((size, 17))
+
+        rows = []
+        for i in range(size):
+            t = templates[picks[i]]
+            _, loc_name, zone = localities[places[i]]
+            price_inr = int(t['price_inr'] * ZONE_PRICE_FACTOR.get(zone, 1) * scale[i])
+            unit = t['price_unit']
+            amenities = [a for j, a in enumerate(t['amenity_list']) if keep[i, j % 16] < 0.8]
+            kind = f"{t['bhk']} BHK {TYPE_NAMES.get(t['property_type'], 'Property')}" if t['bhk'] else \
+                TYPE_NAMES.get(t['property_type'], 'Property')
+            title = f"{kind} for {'Rent' if t['listing_type'] == 'rent' else 'Sale'} in {loc_name}"
+            rows.append({
+                'title': title,
+                'slug': f'{slugify(title)}-{offset + i}',
+                'property_type': t['property_type'],
+                'listing_type': t['listing_type'],
+                'price': round(price_inr / PRICE_MULTIPLIERS[unit], 2),
+                'price_unit': unit,
+                'price_inr': price_inr,
+                'bhk': t['bhk'],
+                'area_sqft': round(t['area_sqft'] * area_scale[i]),
+                'carpet_area': round((t['carpet_area'] or t['area_sqft'] * 0.75) * area_scale[i]),
+                'floor_number': t['floor_number'],
+                'total_floors': t['total_floors'],
+                'age_years': t['age_years'],
+                'furnished': t['furnished'],
+                'facing': t['facing'],
+                'description': t['description'],
+                'amenities': json.dumps(amenities),
+                'amenity_bits': amenity_bits(amenities),
+                'address': f'{loc_name}, {zone}',
+                'locality_id': localities[places[i]][0],
+                'is_featured': bool(t['is_featured'] and keep[i, 16] < 0.1),
+                'is_approved': bool(approved[i]),
+                'status': statuses[status[i]],
+                'views_count': int(views[i]),
+                'user_id': None if agents[i] is None else int(agents[i]),
+                'created_at': now - timedelta(seconds=int(age[i])),
+            })
+        db.session.execute(insert(Property.__table__), rows)
+        db.session.commit()
+
+
+def add_enquiries(db, count, seed=1):
+    """Insert ``count`` enquiry clicks, more of them on the most viewed listings."""
+    from sqlalchemy import insert
+    from models import EnquiryLog, Property
+
+    listings = db.session.query(Property.id, Property.views_count).all()
+    if not listings:
+        return
+    ids = np.array([prop_id for prop_id, _ in listings])
+    weights = np.array([views or 0 for _, views in listings], dtype=np.float64) + 1
+    weights /= weights.sum()
+    rng = np.random.default_rng([seed, count, len(ids)])
+    now = datetime.utcnow()
+
+    for offset in range(0, count, ENQUIRY_CHUNK_SIZE):
+        size = min(ENQUIRY_CHUNK_SIZE, count - offset)
+        property_ids = rng.choice(ids, size=size, p=weights)
+        whatsapp = rng.random(size) < 0.35
+        ips = rng.integers(1, 255, size=(size, 2))
+        age = np.sort(rng.integers(HISTORY_DAYS * 86400, size=size))[::-1]
+        db.session.execute(insert(EnquiryLog.__table__), [{
+            'property_id': int(property_ids[i]),
+            'action': 'whatsapp_click' if whatsapp[i] else 'phone_click',
+            'visitor_ip': f'10.0.{ips[i, 0]}.{ips[i, 1]}',
+            'created_at': now - timedelta(seconds=int(age[i])),
+        } for i in range(size)])
+        db.session.commit()
+
+
+def generate(db, listings, enquiries, agents=200, seed=1, log=sys.stderr):
+    """Top the database up to the requested sizes; returns the final counts."""
+    from sqlalchemy import text
+    from seed import init_db
+
+    init_db()
+    counts = _counts(db)
+    started = time.perf_counter()
+    ensure_agents(db, agents)
+    if counts['listings'] < listings:
+        add_listings(db, counts['listings'], listings, seed)
+        print(f'{listings - counts["listings"]:,} listings added in {time.perf_counter() - started:.1f}s', file=log)
+    started = time.perf_counter()
+    if counts['enquiries'] < enquiries:
+        add_enquiries(db, enquiries - counts['enquiries'], seed)
+        print(f'{enquiries - counts["enquiries"]:,} enquiries added in {time.perf_counter() - started:.1f}s',
+              file=log)
+    if db.engine.dialect.name in ('sqlite', 'postgresql'):
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+    return _counts(db)
+
+
+def add_arguments(parser):
+    parser.add_argument('--database', help='database URL; a throwaway SQLite file by default')
+    parser.add_argument('--listings', type=int, default=10000)
+    parser.add_argument('--enquiries', type=int, default=100000)
+    parser.add_argument('--agents', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+
+
+def use_database(url):
+    """Point the app at ``url`` (or a new temporary SQLite file); call before importing it."""
+    if not url:
+        import tempfile
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ['DATABASE_URL'] = url
+    return url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    url = use_database(args.database)
+    from app import app
+    from extensions import db
+    with app.app_context():
+        counts = generate(db, args.listings, args.enquiries, args.agents, args.seed)
+    print(json.dumps({'database': url, **counts}))
+
+
+if __name__ == '__main__':
+    main()
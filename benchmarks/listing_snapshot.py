@@ -0,0 +1,128 @@
+"""Filter/sort/page latency of /api/v1/properties: SQL vs the listing snapshot.
+
+    python -m benchmarks.listing_snapshot --sizes 10000,100000,1000000
+
+Sizes are run in increasing order against one throwaway SQLite database,
+topped up with ``benchmarks.dataset`` listings before each. Both paths answer the
+same filter combinations with the ids of one page and the total; loading
+and serializing the page's cards is the same for both and is left out.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from sqlalchemy import text
+from benchmarks.dataset import use_database
+
+CASES = {
+    'all, newest': ({}, 'newest'),
+    'buy, price_low': ({'listing_type': ['buy']}, 'price_low'),
+    'rent 2-3 BHK, furnished': ({'listing_type': ['rent'], 'bhk': [2, 3], 'furnished': ['fully']}, 'newest'),
+    'buy flat, zone, 1-2 Cr': ({'listing_type': ['buy'], 'property_type': ['flat'], 'zone': ['Western Suburbs'],
+                                'min_price': 10000000, 'max_price': 20000000}, 'price_high'),
+    'locality, amenities': ({'locality_id': 1, 'amenities': ['Gym', 'Swimming Pool']}, 'area'),
+    'page 50, newest': ({'listing_type': ['buy']}, 'newest', 49),
+}
+PER_PAGE = 12
+
+
+def _filters(values):
+    filters = {'listing_type': [], 'property_type': [], 'locality_id': None, 'zone': [], 'bhk': [],
+               'furnished': [], 'amenities': [], 'min_price': None, 'max_price': None}
+    filters.update(values)
+    return filters
+
+
+def sql_page(db, filters, sort, page):
+    from models import Property
+    from routes.api import filter_properties
+
+    q = filter_properties(db.session.query(Property.id).filter_by(status='active', is_approved=True), filters)
+    order = {
+        'price_low': Property.price_inr.asc(),
+        'price_high': Property.price_inr.desc(),
+        'area': Property.area_sqft.desc().nullslast(),
+    }.get(sort, Property.created_at.desc())
+    total = q.count()
+    ids = [prop_id for (prop_id,) in q.order_by(order).offset(page * PER_PAGE).limit(PER_PAGE)]
+    return ids, total
+
+
+def _time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+def run(sizes, repeat):
+    from app import app
+    from extensions import db
+    from services.listing_snapshot import listing_snapshot
+    from benchmarks.dataset import add_listings, ensure_agents
+    from seed import init_db
+
+    report = []
+    inserted = 0
+    with app.app_context():
+        listing_snapshot.poll_interval = float('inf')  # no change-log polls mid-run
+        init_db()
+        ensure_agents(db, 200)
+        for n in sorted(sizes):
+            started = time.perf_counter()
+            add_listings(db, inserted, n)
+            db.session.execute(text('ANALYZE'))
+            db.session.commit()
+            inserted = n
+            print(f'{n:,} listings inserted in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+            _, build = _time(listing_snapshot.rebuild, 1)
+
+            for name, case in CASES.items():
+                values, sort = case[:2]
+                page = case[2] if len(case) > 2 else 0
+                filters = _filters(values)
+                (sql_ids, sql_total), sql = _time(lambda: sql_page(db, filters, sort, page), repeat)
+                (snap_ids, snap_total), snap = _time(
+                    lambda: listing_snapshot.select(filters, sort, page * PER_PAGE, PER_PAGE), repeat)
+                report.append({
+                    'listings': n,
+                    'case': name,
+                    'matches': sql_total,
+                    'same_total': sql_total == snap_total,
+                    'sql_ms_p50': round(statistics.median(sql), 3),
+                    'sql_ms_max': round(max(sql), 3),
+                    'snapshot_ms_p50': round(statistics.median(snap), 3),
+                    'snapshot_ms_max': round(max(snap), 3),
+                    'snapshot_build_ms': round(build[0], 1),
+                })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000', help='comma-separated listing counts')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per case')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    use_database(None)
+    report = run([int(n) for n in args.sizes.split(',')], args.repeat)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f'{"listings":>9} {"case":<28} {"matches":>8} {"sql p50":>9} {"snap p50":>9} {"speedup":>8}')
+    for row in report:
+        speedup = row['sql_ms_p50'] / row['snapshot_ms_p50'] if row['snapshot_ms_p50'] else float('inf')
+        print(f'{row["listings"]:>9,} {row["case"]:<28} {row["matches"]:>8,} {row["sql_ms_p50"]:>7.2f}ms '
+              f'{row["snapshot_ms_p50"]:>7.3f}ms {speedup:>7.0f}x' + ('' if row['same_total'] else '  TOTALS DIFFER'))
+    for n in sorted({row['listings'] for row in report}):
+        build = next(row['snapshot_build_ms'] for row in report if row['listings'] == n)
+        print(f'snapshot load, {n:,} listings: {build:.0f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+"""Latency, queries and throughput of the hot public and API endpoints.
+
+    python -m benchmarks.load --database sqlite:////tmp/bench.db --listings 100000 --enquiries 1000000 \\
+        --target client,gunicorn --out bench.json --baseline previous.json
+
+The database is first topped up with ``benchmarks.dataset``; reusing one file
+across runs skips that. Every endpoint case then gets the same seeded list of
+requests (pages, filters, slugs, prefixes) against each target:
+
+- ``client``: the Flask test client in this process, one request at a time.
+  Also counts the SQL statements each request runs.
+- ``gunicorn``: a local ``gunicorn app:app`` started for the run, driven by
+  ``--concurrency`` threads. ``--gunicorn-args`` is passed through, e.g. to
+  compare worker settings.
+
+The response cache is off unless ``--cache`` is given, so every request does
+its full work. The JSON report carries the commit and dataset it was measured
+on; ``--baseline`` prints the change against an earlier report.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+import numpy as np
+from benchmarks.dataset import add_arguments, generate, use_database
+
+PERCENTILES = (50, 95, 99)
+
+
+def _query(path, **params):
+    return f'{path}?{urlencode(params)}' if params else path
+
+
+# name -> function(rng, sample) returning one request path
+CASES = {
+    'home': lambda rng, s: '/',
+    'listings': lambda rng, s: _query('/properties', page=int(rng.integers(1, 6))),
+    'listings, filtered': lambda rng, s: _query(
+        '/properties', listing_type='buy', zone=rng.choice(s['zones']), bhk=int(rng.integers(1, 4)),
+        min_price=50, max_price=500, sort=rng.choice(['newest', 'price_low', 'price_high'])),
+    'listings, search': lambda rng, s: _query('/properties', q=rng.choice(s['words'])),
+    'property detail': lambda rng, s: f"/property/{rng.choice(s['slugs'])}",
+    'api home': lambda rng, s: '/api/v1/home',
+    'api listings': lambda rng, s: _query('/api/v1/properties', page=int(rng.integers(1, 6))),
+    'api listings, filtered': lambda rng, s: _query(
+        '/api/v1/properties', listing_type='rent', furnished=rng.choice(['fully', 'semi']),
+        bhk=f'{rng.integers(1, 3)},{rng.integers(3, 5)}', amenities='Gym', sort='price_low'),
+    'api listings, cursor': lambda rng, s: _query('/api/v1/properties', listing_type='buy', after=''),
+    'api facets': lambda rng, s: _query('/api/v1/properties/facets', listing_type='buy', zone=rng.choice(s['zones'])),
+    'api detail': lambda rng, s: f"/api/v1/properties/{rng.choice(s['ids'])}",
+    'api suggestions': lambda rng, s: _query('/api/v1/search/suggestions', q=rng.choice(s['prefixes'])),
+}
+
+
+def _sample(db, size=500, seed=1):
+    """Live listings and localities the requests are drawn from."""
+    from sqlalchemy import func
+    from models import Locality, Property
+
+    live = db.session.query(Property.id, Property.slug).filter_by(is_approved=True, status='active').order_by(
+        func.random()).limit(size).all()
+    names = [name for (name,) in db.session.query(Locality.name)]
+    return {
+        'ids': [prop_id for prop_id, _ in live],
+        'slugs': [slug for _, slug in live],
+        'zones': sorted({zone for (zone,) in db.session.query(Locality.zone)}),
+        'words': sorted({word for name in names for word in name.lower().split()}),
+        'prefixes': sorted({name[:n].lower() for name in names for n in (2, 3, 5)}),
+    }
+
+
+def plan(sample, requests, seed=1):
+    """The request paths for every case, the same for every target."""
+    plans = {}
+    for i, (name, make) in enumerate(CASES.items()):
+        rng = np.random.default_rng([seed, i])
+        plans[name] = [make(rng, sample) for _ in range(requests)]
+    return plans
+
+
+def _summary(target, case, timings, wall, errors, queries=None):
+    timings = sorted(timings)
+    row = {'target': target, 'case': case, 'requests': len(timings), 'errors': errors}
+    for p in PERCENTILES:
+        row[f'p{p}_ms'] = round(float(np.percentile(timings, p)), 3) if timings else None
+    row['mean_ms'] = round(statistics.fmean(timings), 3) if timings else None
+    row['throughput_rps'] = round(len(timings) / wall, 1) if wall else None
+    row['queries_per_request'] = round(statistics.fmean(queries), 2) if queries else None
+    return row
+
+
+def run_client(app, db, plans, warmup):
+    from sqlalchemy import event
+
+    client = app.test_client()
+    thread = threading.get_ident()
+    counter = [0]
+
+    def count(*args):
+        if threading.get_ident() == thread:
+            counter[0] += 1
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    report = []
+    try:
+        for case, paths in plans.items():
+            for path in paths[:warmup]:
+                client.get(path)
+            timings, queries, errors = [], [], 0
+            wall_started = time.perf_counter()
+            for path in paths:
+                counter[0] = 0
+                started = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - started) * 1000)
+                queries.append(counter[0])
+                errors += response.status_code >= 400
+            report.append(_summary('client', case, timings, time.perf_counter() - wall_started, errors, queries))
+            print(f"client    {case:<26} p50 {report[-1]['p50_ms']:8.2f}ms", file=sys.stderr)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    return report
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _get(conn, path):
+    conn.request('GET', path)
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def start_gunicorn(extra_args, env, timeout=120):
+    port = _free_port()
+    command = [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}',
+               '--log-level', 'warning', *shlex.split(extra_args)]
+    process = subprocess.Popen(command, env=env)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with status {process.returncode}')
+        try:
+            _get(http.client.HTTPConnection('127.0.0.1', port, timeout=5), '/api/v1/localities')
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start in time')
+
+
+def run_gunicorn(port, plans, concurrency, warmup):
+    report = []
+    for case, paths in plans.items():
+        for path in paths[:warmup]:
+            _get(http.client.HTTPConnection('127.0.0.1', port, timeout=60), path)
+        timings, errors = [], [0]
+        pending = iter(paths)
+        lock = threading.Lock()
+
+        def worker():
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            while True:
+                with lock:
+                    path = next(pending, None)
+                if path is None:
+                    return
+                started = time.perf_counter()
+                try:
+                    status = _get(conn, path)
+                except (OSError, http.client.HTTPException):
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                    status = 599
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    timings.append(elapsed)
+                    errors[0] += status >= 400
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        wall_started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report.append(_summary('gunicorn', case, timings, time.perf_counter() - wall_started, errors[0]))
+        print(f"gunicorn  {case:<26} p50 {report[-1]['p50_ms']:8.2f}ms "
+              f"{report[-1]['throughput_rps']:8.1f} req/s", file=sys.stderr)
+    return report
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Print the change in p50, p95, throughput and queries against ``baseline``."""
+    before = {(row['target'], row['case']): row for row in baseline['results']}
+    print(f'{"target":<9} {"case":<26} {"p50":>9} {"p95":>9} {"req/s":>9} {"queries":>9}')
+    for row in report['results']:
+        old = before.get((row['target'], row['case']))
+        if old is None:
+            continue
+        changes = []
+        for key in ('p50_ms', 'p95_ms', 'throughput_rps', 'queries_per_request'):
+            if row[key] is None or not old[key]:
+                changes.append(f'{"-":>9}')
+            else:
+                changes.append(f'{(row[key] - old[key]) / old[key]:>+9.0%}')
+        print(f'{row["target"]:<9} {row["case"]:<26} ' + ' '.join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument('--target', default='client', help='comma-separated: client, gunicorn')
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per case')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed requests per case first')
+    parser.add_argument('--concurrency', type=int, default=4, help='parallel connections to gunicorn')
+    parser.add_argument('--gunicorn-args', default='', help='extra gunicorn arguments, e.g. "--workers 4"')
+    parser.add_argument('--cases', help='comma-separated subset of: ' + ', '.join(CASES))
+    parser.add_argument('--cache', action='store_true', help='leave the response cache on')
+    parser.add_argument('--out', help='write the JSON report here instead of stdout')
+    parser.add_argument('--baseline', help='earlier JSON report to compare against')
+    args = parser.parse_args()
+
+    url = use_database(args.database)
+    if not args.cache:
+        os.environ['RESPONSE_CACHE_BACKEND'] = 'null'
+    from app import app
+    from extensions import db
+
+    with app.app_context():
+        counts = generate(db, args.listings, args.enquiries, args.agents, args.seed)
+        plans = plan(_sample(db, seed=args.seed), args.requests, args.seed)
+    if args.cases:
+        plans = {name: plans[name] for name in args.cases.split(',')}
+
+    results = []
+    targets = args.target.split(',')
+    if 'client' in targets:
+        results += run_client(app, db, plans, args.warmup)
+    if 'gunicorn' in targets:
+        process, port = start_gunicorn(args.gunicorn_args, dict(os.environ))
+        try:
+            results += run_gunicorn(port, plans, args.concurrency, args.warmup)
+        finally:
+            process.terminate()
+            process.wait()
+
+    report = {
+        'meta': {
+            'commit': _commit(),
+            'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'database': url.split(':', 1)[0],
+            'dataset': counts,
+            'requests_per_case': args.requests,
+            'concurrency': args.concurrency,
+            'gunicorn_args': args.gunicorn_args,
+            'response_cache': args.cache,
+        },
+        'results': results,
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
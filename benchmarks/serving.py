@@ -0,0 +1,116 @@
+"""Throughput of gunicorn's defaults against gunicorn.conf.py.
+
+    python -m benchmarks.serving --listings 20000 --slow-clients 2 --out serving.json
+
+Each profile serves the same seeded requests from ``benchmarks.load``:
+
+- ``default``: ``gunicorn app:app`` as the Procfile used to start it, i.e. one
+  sync worker;
+- ``tuned``: ``gunicorn -c gunicorn.conf.py app:app``.
+
+``--slow-clients`` connections trickle a request body to the enquiry
+endpoint meanwhile, as a phone on a poor network uploading photos would. A
+sync worker is stuck until the body arrives; a gthread worker loses only
+the one thread.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from benchmarks.dataset import add_arguments, generate, use_database
+from benchmarks.load import _commit, _sample, plan, run_gunicorn, start_gunicorn
+
+PROFILES = {
+    'default': '--config /dev/null',
+    'tuned': '--config gunicorn.conf.py',
+}
+CASES = ('home', 'listings', 'api listings', 'api detail', 'api suggestions')
+
+
+def _slow_client(port, stop):
+    """POST a JSON body a few bytes at a time, over and over, until ``stop`` is set."""
+    body = json.dumps({'property_id': 1, 'action': 'phone_click', 'padding': 'x' * 200}).encode()
+    while not stop.is_set():
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+                sock.sendall(b'POST /api/enquiry HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                             b'Content-Length: %d\r\n\r\n' % len(body))
+                for i in range(0, len(body), 16):
+                    if stop.wait(0.25):
+                        return
+                    sock.sendall(body[i:i + 16])
+                sock.recv(4096)
+        except OSError:
+            time.sleep(0.1)
+
+
+def run_profile(name, args, plans, env):
+    process, port = start_gunicorn(PROFILES[name], env)
+    stop = threading.Event()
+    slow = [threading.Thread(target=_slow_client, args=(port, stop), daemon=True) for _ in range(args.slow_clients)]
+    try:
+        for thread in slow:
+            thread.start()
+        time.sleep(0.5 if slow else 0)
+        rows = run_gunicorn(port, plans, args.concurrency, args.warmup)
+    finally:
+        stop.set()
+        process.terminate()
+        process.wait()
+    for row in rows:
+        row['target'] = f'gunicorn {name}'
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per case')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed requests per case first')
+    parser.add_argument('--concurrency', type=int, default=8, help='parallel connections')
+    parser.add_argument('--slow-clients', type=int, default=0, help='connections trickling uploads meanwhile')
+    parser.add_argument('--out', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    url = use_database(args.database)
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'null'
+    from app import app
+    from extensions import db
+    with app.app_context():
+        counts = generate(db, args.listings, args.enquiries, args.agents, args.seed)
+        plans = plan(_sample(db, seed=args.seed), args.requests, args.seed)
+    plans = {name: plans[name] for name in CASES}
+
+    results = []
+    for name in PROFILES:
+        print(f'--- {name}: gunicorn {PROFILES[name]}', file=sys.stderr)
+        results += run_profile(name, args, plans, dict(os.environ))
+
+    report = {
+        'meta': {'commit': _commit(), 'database': url.split(':', 1)[0], 'cpus': os.cpu_count(), 'dataset': counts,
+                 'requests_per_case': args.requests, 'concurrency': args.concurrency,
+                 'slow_clients': args.slow_clients, 'profiles': PROFILES},
+        'results': results,
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    by_case = {}
+    for row in results:
+        by_case.setdefault(row['case'], {})[row['target']] = row
+    print(f'{"case":<18} {"default req/s":>14} {"tuned req/s":>12} {"default p95":>12} {"tuned p95":>10}',
+          file=sys.stderr)
+    for case, rows in by_case.items():
+        default, tuned = rows['gunicorn default'], rows['gunicorn tuned']
+        print(f'{case:<18} {default["throughput_rps"]:>14.1f} {tuned["throughput_rps"]:>12.1f} '
+              f'{default["p95_ms"]:>10.1f}ms {tuned["p95_ms"]:>8.1f}ms', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
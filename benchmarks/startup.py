@@ -0,0 +1,110 @@
+"""Cold-start cost of the app: import, first request and gunicorn boot.
+
+    python -m benchmarks.startup --repeat 10 --workers 2 --out startup.json
+
+- ``import``: ``import app`` in a fresh interpreter. Every gunicorn worker pays
+  this unless the app is preloaded. The packages that take longest to import
+  come from ``python -X importtime``.
+- ``first request``: the first response in that interpreter, which includes
+  the setup done lazily on first use.
+- ``gunicorn``: from launching gunicorn with ``--workers`` to its first
+  answered request.
+
+The schema is created once beforehand with ``flask init-db``, the same way
+build.sh does it.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from benchmarks.dataset import use_database
+from benchmarks.load import _commit, start_gunicorn
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+status = app.app.test_client().get('/api/v1/localities').status_code
+answered = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'first_request_ms': (answered - imported) * 1000,
+                  'status': status}))
+"""
+
+
+def _stats(values):
+    return {'p50': round(statistics.median(values), 1), 'min': round(min(values), 1), 'max': round(max(values), 1)}
+
+
+def measure_process(env, repeat):
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', _PROBE], env=env, capture_output=True, text=True, check=True)
+        run = json.loads(output.stdout.strip().splitlines()[-1])
+        run['process_ms'] = (time.perf_counter() - started) * 1000
+        runs.append(run)
+    return {name: _stats([run[name] for run in runs]) for name in ('import_ms', 'first_request_ms', 'process_ms')}
+
+
+def slowest_imports(env, limit=15):
+    """Top-level packages by total import time (ms) when importing the app."""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], env=env,
+                            capture_output=True, text=True, check=True)
+    totals = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{'package': package, 'ms': round(us / 1000, 1)} for package, us in ranked]
+
+
+def measure_gunicorn(env, workers, extra_args, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        process, _ = start_gunicorn(f'--workers {workers} {extra_args}', env)
+        timings.append((time.perf_counter() - started) * 1000)
+        process.terminate()
+        process.wait()
+    return _stats(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='database URL; a throwaway SQLite file by default')
+    parser.add_argument('--repeat', type=int, default=5, help='cold starts measured per figure')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers; 0 skips gunicorn')
+    parser.add_argument('--gunicorn-args', default='', help='extra gunicorn arguments')
+    parser.add_argument('--out', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    url = use_database(args.database)
+    env = dict(os.environ)
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], env=env, check=True,
+                   capture_output=True)
+
+    report = {
+        'meta': {'commit': _commit(), 'database': url.split(':', 1)[0], 'repeat': args.repeat,
+                 'workers': args.workers, 'gunicorn_args': args.gunicorn_args},
+        'process': measure_process(env, args.repeat),
+        'slowest_imports': slowest_imports(env),
+    }
+    if args.workers:
+        report['gunicorn_ready_ms'] = measure_gunicorn(env, args.workers, args.gunicorn_args, args.repeat)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
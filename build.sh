@@ -1,4 +1,9 @@
 #!/usr/bin/env bash
 set -o errexit
 pip install -r requirements.txt
-python seed.py
+# Schema changes and rebuilds may run longer than the web statement timeout
+export DB_STATEMENT_TIMEOUT_MS=0
+# Migrates an existing database (or creates and stamps an empty one), then seeds
+FLASK_APP=app flask init-db
+FLASK_APP=app flask build-similar
+FLASK_APP=app flask rollup-analytics
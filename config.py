@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,11 +7,75 @@ load_dotenv()
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
 
+def available_cpus():
+    """CPUs this process may run on, which in a container can be fewer than the host's."""
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', f'sqlite:///{os.path.join(BASE_DIR, "realestate.db")}')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Postgres pool per worker process: gunicorn.conf.py sets DB_POOL_SIZE to its threads
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 5)),  # background flush/job threads
+        'pool_timeout': 10,  # seconds to wait for a connection before failing the request
+        'pool_pre_ping': True,  # drop connections the server closed while idle
+        'pool_recycle': 1800,
+        # Milliseconds; build.sh sets 0 (no limit) for migrations and rebuilds
+        'connect_args': {'options': f"-c statement_timeout={int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))}"},
+    } if SQLALCHEMY_DATABASE_URI.startswith('postgres') else {}
+    # Create tables and seed when the app is created, instead of through `flask init-db`
+    AUTO_INIT_DB = os.getenv('AUTO_INIT_DB', '').lower() in ('1', 'true', 'yes')
     UPLOAD_FOLDER = os.path.join(BASE_DIR, 'static', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max upload
+    BULK_UPLOAD_MAX_SIZE = 1024 * 1024 * 1024  # sheet + photo ZIP on the admin bulk uploader
+    BULK_IMAGE_MAX_SIZE = 25 * 1024 * 1024  # per photo inside the ZIP
+    # Processes rendering a bulk upload's photo ZIP, started for that job only
+    BULK_IMAGE_WORKERS = int(os.environ.get('BULK_IMAGE_WORKERS', 0)) or available_cpus()
     PROPERTIES_PER_PAGE = 12
-    THUMBNAIL_SIZE = (400, 300)
+    # (name, width, height) boxes every property photo is resized into, and
+    # the formats each is written in: preferred first, universal fallback last
+    IMAGE_RENDITIONS = [('thumb', 400, 300), ('card', 640, 480), ('detail', 1200, 900), ('2x', 2400, 1800)]
+    IMAGE_FORMATS = os.getenv('IMAGE_FORMATS', 'webp,jpeg').split(',')  # avif needs Pillow >= 11.2
+    IMAGE_QUALITY = {'avif': 55, 'webp': 78, 'jpeg': 82}
+    IMAGE_GC_GRACE = 24 * 60 * 60  # seconds an unreferenced photo is kept before `flask gc-images` removes it
+    SIMILAR_PROPERTIES_K = 12  # neighbours stored per listing; detail pages show the live ones first
+    CARD_IMAGE_WIDTH = 400  # width property cards are laid out at
+    DETAIL_IMAGE_WIDTH = 1200
+    SUGGEST_INDEX_TTL = 300  # seconds between background rebuilds of a worker's autocomplete index
+    SUGGEST_INDEX_WAIT = 5  # seconds a suggestion request waits for the worker's first build
+    HOME_STATS_TTL = 60  # seconds the home screen counts are cached per worker
+    LOCALITY_REGISTRY_TTL = 300  # seconds before a worker reloads its locality list
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')  # memory, filesystem, null
+    RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'mumbai-realestate-cache'))
+    RESPONSE_CACHE_SIZE = 512
+    RESPONSE_CACHE_DIR_ENTRIES = 10000  # filesystem backend; least recently used go first
+    RESPONSE_CACHE_DIR_BYTES = 256 * 1024 * 1024
+    RESPONSE_CACHE_TTL = 60  # memory backend only; bounds staleness across workers
+    RESPONSE_CACHE_MAX_AGE = 30
+    # Serve /api/v1/properties filters and sorts from per-worker NumPy arrays instead of SQL
+    LISTING_SNAPSHOT = os.getenv('LISTING_SNAPSHOT', '').lower() in ('1', 'true', 'yes')
+    LISTING_SNAPSHOT_POLL = 1.0  # seconds between checks for changed listings
+    LISTING_SNAPSHOT_KEEP = 60 * 60  # seconds the change log is kept
+    LISTING_SNAPSHOT_PRUNE_INTERVAL = 10 * 60  # seconds between prunes of the change log
+    # Per-endpoint query counts and timings, shown on /admin/perf
+    PERF_MONITOR = os.getenv('PERF_MONITOR', '1').lower() in ('1', 'true', 'yes')
+    PERF_SAMPLES = 1000  # recent requests per endpoint kept for percentiles
+    PERF_SLOW_QUERY_MS = float(os.environ['PERF_SLOW_QUERY_MS']) if os.getenv('PERF_SLOW_QUERY_MS') else None
+    PERF_METRICS_TOKEN = os.getenv('PERF_METRICS_TOKEN')  # bearer token for scraping /admin/perf/metrics
+    VIEW_COUNT_FLUSH_INTERVAL = 10  # seconds between batched view-count writes
+    VIEW_COUNT_FLUSH_SIZE = 500  # flush early once this many views are pending
+    ENQUIRY_QUEUE_SIZE = 10000  # buffered enquiry clicks per worker before dropping
+    ENQUIRY_BATCH_SIZE = 500
+    ENQUIRY_FLUSH_INTERVAL = 2.0  # seconds
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 0)) or available_cpus()  # per web worker; see gunicorn.conf.py
+    JOB_POLL_INTERVAL = 2.0  # seconds
+    JOB_STALE_AFTER = 600  # seconds before a 'running' job is retried
+    JOB_MAX_ATTEMPTS = 3
+    # Daily rollups behind the admin dashboard and analytics (services.rollups)
+    ANALYTICS_ROLLUP_INTERVAL = 300  # seconds between rollup jobs; 0 turns them off
+    ANALYTICS_ROLLUP_BATCH = 50000  # source rows per transaction
+    ANALYTICS_ROLLUP_LAG = 60  # seconds a row is left for in-flight transactions to commit
+    ANALYTICS_ROLLUP_BUDGET = 60  # seconds one job runs before leaving the rest to the next
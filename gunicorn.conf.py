@@ -0,0 +1,66 @@
+"""Production gunicorn settings, read automatically from the working directory.
+
+``GUNICORN_WORKER_CLASS`` picks the serving model:
+
+- ``gthread`` (default): CPUs + 1 processes with ``GUNICORN_THREADS`` threads
+  each, so a slow upload or client ties up one thread, not a whole worker.
+- ``gevent``: one process per CPU serving ``GUNICORN_WORKER_CONNECTIONS``
+  greenlets. Needs ``pip install gevent psycogreen``.
+
+``WEB_CONCURRENCY`` overrides the number of processes. Each worker's
+database pool is sized to its threads (see ``DB_POOL_SIZE`` in config.py),
+and its background-job process pool gets an equal share of the CPUs, at
+least one process (``JOB_WORKERS`` overrides).
+"""
+import os
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+# config.available_cpus(); config itself reads the environment set below, so is not imported here
+cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+if worker_class == 'gevent':
+    workers = int(os.getenv('WEB_CONCURRENCY', cpus))
+    worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 100))
+    concurrency = worker_connections
+else:
+    workers = int(os.getenv('WEB_CONCURRENCY', cpus + 1))
+    threads = int(os.getenv('GUNICORN_THREADS', 4))
+    concurrency = threads
+
+# One connection per thread; greenlets mostly wait on the network, so they share a smaller pool
+os.environ.setdefault('DB_POOL_SIZE', str(min(concurrency, 10)))
+# Every job pool process imports the whole app; one per CPU per worker would overcommit memory
+os.environ.setdefault('JOB_WORKERS', str(max(1, cpus // workers)))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+timeout = 120  # the bulk uploader's 1 GB sheet + photo ZIPs
+graceful_timeout = 30
+keepalive = 5
+
+# Importing the app once in the master makes forking workers cheap. This is
+# safe because creating the app opens no connections and starts no threads
+# (see post_fork). gevent must patch the standard library before the app's
+# imports, so it loads the app in each worker instead.
+preload_app = os.getenv('GUNICORN_PRELOAD', '1' if worker_class != 'gevent' else '0') == '1'
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()  # otherwise every psycopg2 call blocks all greenlets
+        except ImportError:
+            server.log.warning('psycogreen is not installed; database calls will block other greenlets')
+
+    if preload_app:
+        from app import app
+        from extensions import db
+        # Connections made in the master must not be shared with the workers
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # Build the autocomplete index while the worker waits for its first requests
+    from services.suggest import suggestion_index
+    suggestion_index.start()
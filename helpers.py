@@ -1,7 +1,9 @@
+import hashlib
+import io
 import os
 import re
 import uuid
-from PIL import Image
+from PIL import Image, ImageOps
 from flask import current_app
 
 
@@ -12,31 +14,79 @@ def slugify(text):
     return re.sub(r'-+', '-', text)
 
 
-def save_property_image(file, property_id):
-    """Save an uploaded property image, create thumbnail, return filename."""
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in ('.jpg', '.jpeg', '.png', '.webp'):
-        return None
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
 
-    filename = f"{property_id}_{uuid.uuid4().hex[:8]}{ext}"
-    upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'properties')
-    os.makedirs(upload_dir, exist_ok=True)
 
-    filepath = os.path.join(upload_dir, filename)
-    img = Image.open(file)
-    img.thumbnail((1200, 900), Image.LANCZOS)
-    if img.mode in ('RGBA', 'P'):
+def image_settings():
+    """Rendition settings from the app config, as keyword arguments for ``render_property_image``."""
+    return {
+        'renditions': [tuple(r) for r in current_app.config['IMAGE_RENDITIONS']],
+        'formats': list(current_app.config['IMAGE_FORMATS']),
+        'quality': dict(current_app.config['IMAGE_QUALITY']),
+    }
+
+
+# Pillow format name, file extension and extra save options per output format
+OUTPUT_FORMATS = {
+    'avif': ('AVIF', 'avif', {}),
+    'webp': ('WEBP', 'webp', {'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'optimize': True, 'progressive': True}),
+}
+
+
+def render_property_image(source, upload_dir, stem, renditions, formats, quality):
+    """Decode ``source`` (path or file object) once and write every rendition in every format.
+
+    ``renditions`` is a list of ``(name, width, height)`` boxes; each is written
+    to ``<upload_dir>/<name>/<stem>.<ext>`` (``stem`` may contain a subfolder). Boxes the source is too small to
+    fill would repeat a smaller rendition's size and are skipped. Returns the
+    ``{'formats': [...], 'sizes': {name: [width, height]}}`` stored on
+    ``PropertyImage.renditions``. Needs no app context, so it can run in a job
+    runner worker process.
+    """
+    img = Image.open(source)
+    # For JPEGs, let the decoder downscale by up to 8x while decoding
+    longest = max(max(w, h) for _, w, h in renditions)
+    img.draft('RGB', (longest, longest))
+    img = ImageOps.exif_transpose(img)
+    if img.mode != 'RGB':
         img = img.convert('RGB')
-    img.save(filepath, quality=85, optimize=True)
 
-    # Create thumbnail
-    thumb_dir = os.path.join(upload_dir, 'thumbs')
-    os.makedirs(thumb_dir, exist_ok=True)
-    thumb = Image.open(filepath)
-    thumb.thumbnail(current_app.config['THUMBNAIL_SIZE'], Image.LANCZOS)
-    thumb.save(os.path.join(thumb_dir, filename), quality=80, optimize=True)
+    # Each rendition is resized from the previous, larger one; when two boxes
+    # give the same size, the smaller box's name wins
+    frames = {}
+    frame = img
+    for name, width, height in sorted(renditions, key=lambda r: r[1] * r[2], reverse=True):
+        frame = frame.copy()
+        frame.thumbnail((width, height), Image.LANCZOS)
+        frames[frame.size] = (name, frame)
+
+    sizes = {}
+    for (width, height), (name, frame) in frames.items():
+        for fmt in formats:
+            pil_format, ext, options = OUTPUT_FORMATS[fmt]
+            path = os.path.join(upload_dir, name, f'{stem}.{ext}')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so a file shared by several listings is never seen half-written
+            tmp_path = f'{path}.{uuid.uuid4().hex[:8]}.tmp'
+            frame.save(tmp_path, pil_format, quality=quality.get(fmt, 80), **options)
+            os.replace(tmp_path, path)
+        sizes[name] = [width, height]
+
+    return {'formats': list(formats), 'sizes': sizes}
+
+
+def stage_upload(file, extensions=IMAGE_EXTENSIONS):
+    """Write an upload to the staging area untouched, return its path (or None)."""
+    ext = os.path.splitext(file.filename)[1].lower()
+    if ext not in extensions:
+        return None
 
-    return filename
+    staging_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'staging')
+    os.makedirs(staging_dir, exist_ok=True)
+    path = os.path.join(staging_dir, f"{uuid.uuid4().hex}{ext}")
+    file.save(path)
+    return path
 
 
 def save_user_photo(file):
@@ -45,30 +95,50 @@ def save_user_photo(file):
     if ext not in ('.jpg', '.jpeg', '.png', '.webp'):
         return None
 
-    filename = f"user_{uuid.uuid4().hex[:8]}{ext}"
+    # Named after the upload's content, so re-uploading the same photo is free
+    data = file.read()
+    filename = f"user_{hashlib.sha256(data).hexdigest()[:32]}{ext}"
     upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'users')
     os.makedirs(upload_dir, exist_ok=True)
 
     filepath = os.path.join(upload_dir, filename)
-    img = Image.open(file)
+    if os.path.exists(filepath):
+        os.utime(filepath)  # still in use; see services.image_store.collect_garbage
+        return filename
+    img = Image.open(io.BytesIO(data))
     img.thumbnail((300, 300), Image.LANCZOS)
     if img.mode in ('RGBA', 'P'):
         img = img.convert('RGB')
-    img.save(filepath, quality=85, optimize=True)
+    tmp_path = f'{filepath}.{uuid.uuid4().hex[:8]}.tmp'
+    img.save(tmp_path, Image.registered_extensions()[ext], quality=85, optimize=True)
+    os.replace(tmp_path, filepath)
     return filename
 
 
-def delete_property_image(filename):
-    """Delete a property image and its thumbnail."""
-    upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'properties')
-    filepath = os.path.join(upload_dir, filename)
-    thumb_path = os.path.join(upload_dir, 'thumbs', filename)
-    if os.path.exists(filepath):
-        os.remove(filepath)
-    if os.path.exists(thumb_path):
-        os.remove(thumb_path)
-
+def delete_property_image(filename, renditions=None):
+    """Delete a property image's files, unless they live in the shared image store.
 
+    Content-addressed images (``ab/abcdef...``) may be used by other listings;
+    ``services.image_store.collect_garbage`` removes them once nothing does.
+    """
+    if '/' in filename:
+        return
+    upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'properties')
+    if renditions:
+        paths = [
+            os.path.join(upload_dir, name, f'{filename}.{OUTPUT_FORMATS[fmt][1]}')
+            for name in renditions['sizes'] for fmt in renditions['formats']
+        ]
+    else:
+        paths = [os.path.join(upload_dir, filename), os.path.join(upload_dir, 'thumbs', filename)]
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# Property.amenity_bits stores one bit per entry by position: only ever append
 AMENITY_ICONS = {
     "Parking": "bi-car-front",
     "Lift": "bi-arrow-up-square",
@@ -0,0 +1,52 @@
+"""normalised price_inr column
+
+Revision ID: 0c5a8e3f7d61
+Revises: e2b6d9a4c013
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c5a8e3f7d61'
+down_revision = 'e2b6d9a4c013'
+branch_labels = None
+depends_on = None
+
+LIVE = "is_approved = true AND status = 'active'"
+
+BACKFILL = """
+UPDATE properties SET price_inr = CAST(ROUND(price * CASE price_unit
+    WHEN 'crore' THEN 10000000
+    WHEN 'month' THEN 1
+    ELSE 100000
+END) AS BIGINT)
+"""
+
+
+def upgrade():
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('properties')}
+    # create_all() at startup may already have added it on a fresh database
+    if 'price_inr' not in columns:
+        with op.batch_alter_table('properties') as batch_op:
+            batch_op.add_column(sa.Column('price_inr', sa.BigInteger(), nullable=True))
+    op.execute(BACKFILL)
+
+    # The raw price mixes units, so indexes on it served no meaningful order
+    op.drop_index('ix_properties_live_price', table_name='properties', if_exists=True)
+    op.drop_index('ix_properties_live_bhk', table_name='properties', if_exists=True)
+    op.create_index('ix_properties_live_price_inr', 'properties', ['price_inr'], if_not_exists=True,
+                    postgresql_where=sa.text(LIVE))
+    op.create_index('ix_properties_live_bhk_price_inr', 'properties', ['bhk', 'price_inr'], if_not_exists=True,
+                    postgresql_where=sa.text(LIVE))
+
+
+def downgrade():
+    op.drop_index('ix_properties_live_bhk_price_inr', table_name='properties', if_exists=True)
+    op.drop_index('ix_properties_live_price_inr', table_name='properties', if_exists=True)
+    op.create_index('ix_properties_live_bhk', 'properties', ['bhk', 'price'], postgresql_where=sa.text(LIVE))
+    op.create_index('ix_properties_live_price', 'properties', ['price'], postgresql_where=sa.text(LIVE))
+    with op.batch_alter_table('properties') as batch_op:
+        batch_op.drop_column('price_inr')
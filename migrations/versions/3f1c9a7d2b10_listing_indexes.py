@@ -0,0 +1,48 @@
+"""listing filter and sort indexes
+
+Revision ID: 3f1c9a7d2b10
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+LIVE = "is_approved = true AND status = 'active'"
+
+# name, table, columns, partial predicate (Postgres only)
+INDEXES = [
+    ('ix_properties_live_created', 'properties', ['created_at'], LIVE),
+    ('ix_properties_live_price', 'properties', ['price'], LIVE),
+    ('ix_properties_live_area', 'properties', ['area_sqft'], LIVE),
+    ('ix_properties_live_views', 'properties', ['views_count'], LIVE),
+    ('ix_properties_live_type', 'properties', ['listing_type', 'property_type', 'created_at'], LIVE),
+    ('ix_properties_live_locality', 'properties', ['locality_id', 'created_at'], LIVE),
+    ('ix_properties_live_bhk', 'properties', ['bhk', 'price'], LIVE),
+    ('ix_properties_live_featured', 'properties', ['created_at'], LIVE + ' AND is_featured = true'),
+    ('ix_properties_status_approved', 'properties', ['status', 'is_approved', 'created_at'], None),
+    ('ix_properties_user_id', 'properties', ['user_id', 'created_at'], None),
+    ('ix_property_images_property_id', 'property_images', ['property_id', 'sort_order'], None),
+    ('ix_enquiry_logs_property_id', 'enquiry_logs', ['property_id', 'action'], None),
+    ('ix_enquiry_logs_action', 'enquiry_logs', ['action'], None),
+]
+
+
+def upgrade():
+    # Tables predate migrations (they come from db.create_all), which also
+    # creates these indexes on fresh databases, hence if_not_exists.
+    for name, table, columns, where in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True,
+                        postgresql_where=sa.text(where) if where else None)
+
+
+def downgrade():
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
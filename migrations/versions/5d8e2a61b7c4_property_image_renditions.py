@@ -0,0 +1,32 @@
+"""property image renditions
+
+Revision ID: 5d8e2a61b7c4
+Revises: c47a1e9d5f22
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8e2a61b7c4'
+down_revision = 'c47a1e9d5f22'
+branch_labels = None
+depends_on = None
+
+
+def _columns():
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns('property_images')}
+
+
+def upgrade():
+    # create_all() at startup may already have added it on a fresh database
+    if 'renditions' not in _columns():
+        with op.batch_alter_table('property_images') as batch_op:
+            batch_op.add_column(sa.Column('renditions', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('property_images') as batch_op:
+        batch_op.drop_column('renditions')
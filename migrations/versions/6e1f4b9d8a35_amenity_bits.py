@@ -0,0 +1,70 @@
+"""amenity bitmask column
+
+Revision ID: 6e1f4b9d8a35
+Revises: 0c5a8e3f7d61
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e1f4b9d8a35'
+down_revision = '0c5a8e3f7d61'
+branch_labels = None
+depends_on = None
+
+# helpers.AMENITY_ICONS as of this revision; bit i is AMENITIES[i]
+AMENITIES = [
+    'Parking', 'Lift', 'Gym', 'Swimming Pool', 'Security', 'Power Backup', 'Club House', 'Garden',
+    'Children Play Area', 'Terrace', 'Jogging Track', 'Fire Safety', 'Cafeteria', 'Road Access',
+    'Water Supply', 'Electricity', 'CCTV', 'Intercom', 'Rainwater Harvesting', 'Vastu Compliant',
+    'Piped Gas', 'Visitor Parking',
+]
+BATCH_SIZE = 1000
+
+
+def _names(raw):
+    try:
+        names = json.loads(raw) if raw else []
+        # The seed scripts used to store the JSON text JSON-encoded a second time
+        if isinstance(names, str):
+            names = json.loads(names)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return names if isinstance(names, list) else []
+
+
+def upgrade():
+    bind = op.get_bind()
+    columns = {c['name'] for c in sa.inspect(bind).get_columns('properties')}
+    # create_all() at startup may already have added it on a fresh database
+    if 'amenity_bits' not in columns:
+        with op.batch_alter_table('properties') as batch_op:
+            batch_op.add_column(sa.Column('amenity_bits', sa.BigInteger(), nullable=True))
+
+    properties = sa.table('properties', sa.column('id'), sa.column('amenities'), sa.column('amenity_bits'))
+    update = properties.update().where(properties.c.id == sa.bindparam('pid')).values(
+        amenities=sa.bindparam('names'), amenity_bits=sa.bindparam('bits'))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(properties.c.id, properties.c.amenities)
+            .where(properties.c.id > last_id).order_by(properties.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        values = []
+        for row in rows:
+            names = _names(row.amenities)
+            bits = sum(1 << AMENITIES.index(name) for name in set(names) if name in AMENITIES)
+            values.append({'pid': row.id, 'names': json.dumps(names), 'bits': bits})
+        bind.execute(update, values)
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('properties') as batch_op:
+        batch_op.drop_column('amenity_bits')
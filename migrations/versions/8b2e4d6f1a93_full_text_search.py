@@ -0,0 +1,72 @@
+"""full-text search index on properties
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f1c9a7d2b10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a93'
+down_revision = '3f1c9a7d2b10'
+branch_labels = None
+depends_on = None
+
+PG_UPGRADE = [
+    "ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(address, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_properties_search_vector ON properties USING gin (search_vector)",
+]
+
+PG_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_properties_search_vector",
+    "ALTER TABLE properties DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5("
+    "title, description, address, content='properties', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN "
+    "INSERT INTO properties_fts(rowid, title, description, address) "
+    "VALUES (new.id, new.title, new.description, new.address); END",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN "
+    "INSERT INTO properties_fts(properties_fts, rowid, title, description, address) "
+    "VALUES ('delete', old.id, old.title, old.description, old.address); END",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE OF title, description, address "
+    "ON properties BEGIN "
+    "INSERT INTO properties_fts(properties_fts, rowid, title, description, address) "
+    "VALUES ('delete', old.id, old.title, old.description, old.address); "
+    "INSERT INTO properties_fts(rowid, title, description, address) "
+    "VALUES (new.id, new.title, new.description, new.address); END",
+    # Index rows that existed before the table was created
+    "INSERT INTO properties_fts(properties_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS properties_fts_au",
+    "DROP TRIGGER IF EXISTS properties_fts_ad",
+    "DROP TRIGGER IF EXISTS properties_fts_ai",
+    "DROP TABLE IF EXISTS properties_fts",
+]
+
+
+def _run(postgres, sqlite):
+    dialect = op.get_bind().dialect.name
+    statements = {'postgresql': postgres, 'sqlite': sqlite}.get(dialect, [])
+    for stmt in statements:
+        op.execute(stmt)
+
+
+def upgrade():
+    _run(PG_UPGRADE, SQLITE_UPGRADE)
+
+
+def downgrade():
+    _run(PG_DOWNGRADE, SQLITE_DOWNGRADE)
@@ -0,0 +1,35 @@
+"""content-addressed image blobs
+
+Revision ID: 9a4f7c3e1b28
+Revises: 5d8e2a61b7c4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f7c3e1b28'
+down_revision = '5d8e2a61b7c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'image_blobs',
+        sa.Column('filename', sa.String(length=200), nullable=False),
+        sa.Column('renditions', sa.Text(), nullable=False),
+        sa.Column('source_bytes', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('filename'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_property_images_filename', 'property_images', ['filename'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_property_images_filename', table_name='property_images')
+    op.drop_table('image_blobs')
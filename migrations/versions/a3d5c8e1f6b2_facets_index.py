@@ -0,0 +1,29 @@
+"""covering index for facet counts
+
+Revision ID: a3d5c8e1f6b2
+Revises: 6e1f4b9d8a35
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d5c8e1f6b2'
+down_revision = '6e1f4b9d8a35'
+branch_labels = None
+depends_on = None
+
+LIVE = "is_approved = true AND status = 'active'"
+
+
+def upgrade():
+    op.create_index('ix_properties_live_facets', 'properties',
+                    ['listing_type', 'property_type', 'bhk', 'furnished', 'locality_id', 'price_inr',
+                     'status', 'is_approved'],
+                    if_not_exists=True, postgresql_where=sa.text(LIVE))
+
+
+def downgrade():
+    op.drop_index('ix_properties_live_facets', table_name='properties', if_exists=True)
@@ -0,0 +1,103 @@
+"""daily analytics rollups and the view batches that feed them
+
+Revision ID: b8e3f1d7c5a4
+Revises: f7b2a9c4e6d1
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e3f1d7c5a4'
+down_revision = 'f7b2a9c4e6d1'
+branch_labels = None
+depends_on = None
+
+COUNTERS = ('views', 'phone_clicks', 'whatsapp_clicks')
+
+
+def _counters(*extra):
+    return [sa.Column(name, sa.Integer(), nullable=False) for name in COUNTERS + extra]
+
+
+def upgrade():
+    op.create_table(
+        'view_batches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True,
+        if_not_exists=True,
+    )
+    op.create_table(
+        'rollup_state',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'property_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        *_counters(),
+        sa.PrimaryKeyConstraint('day', 'property_id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'property_monthly_stats',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        *_counters(),
+        sa.PrimaryKeyConstraint('month', 'property_id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'locality_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('locality_id', sa.Integer(), nullable=False),
+        *_counters('new_listings'),
+        sa.PrimaryKeyConstraint('day', 'locality_id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'agent_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        *_counters('new_listings'),
+        sa.PrimaryKeyConstraint('day', 'user_id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'agent_monthly_stats',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        *_counters('new_listings'),
+        sa.PrimaryKeyConstraint('month', 'user_id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'site_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        *_counters('new_listings'),
+        sa.PrimaryKeyConstraint('day'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_jobs_kind', 'jobs', ['kind', 'id'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_jobs_kind', table_name='jobs')
+    op.drop_table('site_daily_stats')
+    op.drop_table('agent_monthly_stats')
+    op.drop_table('agent_daily_stats')
+    op.drop_table('locality_daily_stats')
+    op.drop_table('property_monthly_stats')
+    op.drop_table('property_daily_stats')
+    op.drop_table('rollup_state')
+    op.drop_table('view_batches')
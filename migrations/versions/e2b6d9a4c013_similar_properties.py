@@ -0,0 +1,32 @@
+"""precomputed similar properties
+
+Revision ID: e2b6d9a4c013
+Revises: 9a4f7c3e1b28
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6d9a4c013'
+down_revision = '9a4f7c3e1b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'similar_properties',
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('neighbours', sa.Text(), nullable=False),
+        sa.Column('kth_distance', sa.Float(), nullable=True),
+        sa.Column('computed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('property_id'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('similar_properties')
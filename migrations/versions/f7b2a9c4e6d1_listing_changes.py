@@ -0,0 +1,34 @@
+"""listing change log for the in-memory listing snapshot
+
+Revision ID: f7b2a9c4e6d1
+Revises: a3d5c8e1f6b2
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b2a9c4e6d1'
+down_revision = 'a3d5c8e1f6b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'listing_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True,
+        if_not_exists=True,
+    )
+    op.create_index('ix_listing_changes_created_at', 'listing_changes', ['created_at'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_listing_changes_created_at', table_name='listing_changes')
+    op.drop_table('listing_changes')
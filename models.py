@@ -2,7 +2,16 @@ import json
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
+from sqlalchemy import DDL, event
 from extensions import db, login_manager
+from helpers import AMENITY_ICONS, OUTPUT_FORMATS
+
+PRICE_MULTIPLIERS = {'lakh': 100000, 'crore': 10000000, 'month': 1}
+# Bit positions follow the order of helpers.AMENITY_ICONS, so new amenities go at its end
+AMENITY_BITS = {name: 1 << i for i, name in enumerate(AMENITY_ICONS)}
+
+LEGACY_THUMB_WIDTH = 400
+LEGACY_FULL_WIDTH = 1200
 
 
 class User(UserMixin, db.Model):
@@ -61,6 +70,7 @@ class Property(db.Model):
     listing_type = db.Column(db.String(10), nullable=False)  # buy, rent
     price = db.Column(db.Float, nullable=False)
     price_unit = db.Column(db.String(10), default='lakh')  # lakh, crore, month
+    price_inr = db.Column(db.BigInteger)  # price in rupees, kept in sync with price/price_unit
     bhk = db.Column(db.Integer)
     area_sqft = db.Column(db.Float)
     carpet_area = db.Column(db.Float)
@@ -71,6 +81,7 @@ class Property(db.Model):
     facing = db.Column(db.String(20))
     description = db.Column(db.Text)
     _amenities = db.Column('amenities', db.Text, default='[]')
+    amenity_bits = db.Column(db.BigInteger, default=0)  # known amenities, see AMENITY_BITS
     address = db.Column(db.String(300))
     locality_id = db.Column(db.Integer, db.ForeignKey('localities.id'))
     is_featured = db.Column(db.Boolean, default=False)
@@ -96,6 +107,13 @@ class Property(db.Model):
 
     @property
     def primary_image(self):
+        preloaded = getattr(self, '_preloaded_images', None)
+        if preloaded is not None:
+            for img in preloaded:
+                if img.is_primary:
+                    return img
+            return preloaded[0] if preloaded else None
+
         img = db.session.query(PropertyImage).filter_by(
             property_id=self.id, is_primary=True
         ).first()
@@ -115,11 +133,41 @@ class Property(db.Model):
 
     @property
     def all_images(self):
+        preloaded = getattr(self, '_preloaded_images', None)
+        if preloaded is not None:
+            return list(preloaded)
         return db.session.query(PropertyImage).filter_by(
             property_id=self.id
         ).order_by(PropertyImage.sort_order).all()
 
 
+def price_to_inr(price, price_unit):
+    if price is None:
+        return None
+    return int(round(price * PRICE_MULTIPLIERS.get(price_unit or 'lakh', PRICE_MULTIPLIERS['lakh'])))
+
+
+def amenity_bits(names):
+    """Bitmask of the known amenities in ``names``; unknown names are ignored."""
+    bits = 0
+    for name in names:
+        bits |= AMENITY_BITS.get(name, 0)
+    return bits
+
+
+def has_amenities(names):
+    """Filter for listings that have every amenity in ``names``."""
+    mask = amenity_bits(names)
+    return Property.amenity_bits.op('&')(mask) == mask
+
+
+@event.listens_for(Property, 'before_insert')
+@event.listens_for(Property, 'before_update')
+def _sync_derived_columns(mapper, connection, target):
+    target.price_inr = price_to_inr(target.price, target.price_unit)
+    target.amenity_bits = amenity_bits(target.amenities)
+
+
 class PropertyImage(db.Model):
     __tablename__ = 'property_images'
     id = db.Column(db.Integer, primary_key=True)
@@ -127,6 +175,96 @@ class PropertyImage(db.Model):
     filename = db.Column(db.String(200), nullable=False)
     is_primary = db.Column(db.Boolean, default=False)
     sort_order = db.Column(db.Integer, default=0)
+    _renditions = db.Column('renditions', db.Text)  # {"formats": [...], "sizes": {name: [w, h]}}; NULL for older uploads
+
+    @property
+    def renditions(self):
+        try:
+            return json.loads(self._renditions) if self._renditions else None
+        except (json.JSONDecodeError, TypeError):
+            return None
+
+    @renditions.setter
+    def renditions(self, value):
+        self._renditions = json.dumps(value) if value else None
+
+    @property
+    def formats(self):
+        info = self.renditions
+        return info['formats'] if info else ['jpeg']
+
+    def variants(self, fmt='jpeg', max_width=None):
+        """(static path, width) of each rendition in ``fmt``, smallest first, none wider than ``max_width``."""
+        info = self.renditions
+        if not info:
+            # Uploaded before renditions: one thumbnail and one full-size file
+            variants = [(f'uploads/properties/thumbs/{self.filename}', LEGACY_THUMB_WIDTH),
+                        (f'uploads/properties/{self.filename}', LEGACY_FULL_WIDTH)]
+        else:
+            if fmt not in info['formats']:
+                fmt = info['formats'][-1]
+            ext = OUTPUT_FORMATS[fmt][1]
+            variants = sorted(
+                ((f'uploads/properties/{name}/{self.filename}.{ext}', size[0])
+                 for name, size in info['sizes'].items()),
+                key=lambda v: v[1],
+            )
+        if max_width:
+            variants = [v for v in variants if v[1] <= max_width] or variants[:1]
+        return variants
+
+    def path(self, width=None, fmt='jpeg'):
+        """Static path of the smallest rendition at least ``width`` wide (else the largest)."""
+        variants = self.variants(fmt)
+        if width:
+            for path, w in variants:
+                if w >= width:
+                    return path
+        return variants[-1][0]
+
+
+class ImageBlob(db.Model):
+    """Renditions of one distinct photo, shared by every PropertyImage with the same filename."""
+    __tablename__ = 'image_blobs'
+    filename = db.Column(db.String(200), primary_key=True)  # <2 hex>/<sha256 of the source>
+    _renditions = db.Column('renditions', db.Text, nullable=False)
+    source_bytes = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @property
+    def renditions(self):
+        return json.loads(self._renditions)
+
+    @renditions.setter
+    def renditions(self, value):
+        self._renditions = json.dumps(value)
+
+
+class SimilarProperties(db.Model):
+    """Precomputed nearest neighbours of a live listing (see services.similar)."""
+    __tablename__ = 'similar_properties'
+    property_id = db.Column(db.Integer, primary_key=True)
+    _neighbours = db.Column('neighbours', db.Text, nullable=False, default='[]')  # [[id, distance], ...]
+    kth_distance = db.Column(db.Float)  # distance of the furthest kept neighbour; NULL while the list is short
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @property
+    def neighbours(self):
+        return json.loads(self._neighbours) if self._neighbours else []
+
+    @neighbours.setter
+    def neighbours(self, value):
+        self._neighbours = json.dumps(value or [])
+
+
+class ListingChange(db.Model):
+    """A committed change to a listing, polled by services.listing_snapshot."""
+    __tablename__ = 'listing_changes'
+    __table_args__ = {'sqlite_autoincrement': True}  # ids are never reused after pruning
+    id = db.Column(db.Integer, primary_key=True)
+    property_id = db.Column(db.Integer)  # NULL: reload every listing
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
 
 class EnquiryLog(db.Model):
@@ -136,3 +274,191 @@ class EnquiryLog(db.Model):
     action = db.Column(db.String(20), nullable=False)  # phone_click, whatsapp_click
     visitor_ip = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # property_images
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    _payload = db.Column('payload', db.Text, default='{}')
+    _result = db.Column('result', db.Text)
+    error = db.Column(db.Text)
+    attempts = db.Column(db.Integer, default=0)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    property_id = db.Column(db.Integer, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_jobs_status', 'status', 'id'),
+        db.Index('ix_jobs_kind', 'kind', 'id'),  # latest job of a scheduled kind
+    )
+
+    @property
+    def payload(self):
+        return json.loads(self._payload) if self._payload else {}
+
+    @payload.setter
+    def payload(self, value):
+        self._payload = json.dumps(value or {})
+
+    @property
+    def result(self):
+        return json.loads(self._result) if self._result else None
+
+    @result.setter
+    def result(self, value):
+        self._result = json.dumps(value) if value is not None else None
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed')
+
+
+class ViewBatch(db.Model):
+    """Views written by one view-counter flush, kept until services.rollups has counted them."""
+    __tablename__ = 'view_batches'
+    __table_args__ = {'sqlite_autoincrement': True}  # ids are never reused after pruning
+    id = db.Column(db.Integer, primary_key=True)
+    property_id = db.Column(db.Integer, nullable=False)
+    views = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class RollupState(db.Model):
+    """How far services.rollups has read one source table, by id."""
+    __tablename__ = 'rollup_state'
+    name = db.Column(db.String(50), primary_key=True)  # enquiries, views, listings
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)
+
+
+# Activity per UTC day, added to by services.rollups. Listings and agents,
+# which run to many rows a day, also get monthly totals so that long ranges
+# read a row per month. The ids are not foreign keys: history outlives
+# deleted listings, localities and agents.
+class PropertyDailyStats(db.Model):
+    __tablename__ = 'property_daily_stats'
+    day = db.Column(db.Date, primary_key=True)
+    property_id = db.Column(db.Integer, primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    phone_clicks = db.Column(db.Integer, nullable=False, default=0)
+    whatsapp_clicks = db.Column(db.Integer, nullable=False, default=0)
+
+
+class PropertyMonthlyStats(db.Model):
+    __tablename__ = 'property_monthly_stats'
+    month = db.Column(db.Date, primary_key=True)  # first day of the month
+    property_id = db.Column(db.Integer, primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    phone_clicks = db.Column(db.Integer, nullable=False, default=0)
+    whatsapp_clicks = db.Column(db.Integer, nullable=False, default=0)
+
+
+class LocalityDailyStats(db.Model):
+    __tablename__ = 'locality_daily_stats'
+    day = db.Column(db.Date, primary_key=True)
+    locality_id = db.Column(db.Integer, primary_key=True)  # 0: listings without a locality
+    views = db.Column(db.Integer, nullable=False, default=0)
+    phone_clicks = db.Column(db.Integer, nullable=False, default=0)
+    whatsapp_clicks = db.Column(db.Integer, nullable=False, default=0)
+    new_listings = db.Column(db.Integer, nullable=False, default=0)
+
+
+class AgentDailyStats(db.Model):
+    __tablename__ = 'agent_daily_stats'
+    day = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)  # 0: listings without an agent
+    views = db.Column(db.Integer, nullable=False, default=0)
+    phone_clicks = db.Column(db.Integer, nullable=False, default=0)
+    whatsapp_clicks = db.Column(db.Integer, nullable=False, default=0)
+    new_listings = db.Column(db.Integer, nullable=False, default=0)
+
+
+class AgentMonthlyStats(db.Model):
+    __tablename__ = 'agent_monthly_stats'
+    month = db.Column(db.Date, primary_key=True)  # first day of the month
+    user_id = db.Column(db.Integer, primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    phone_clicks = db.Column(db.Integer, nullable=False, default=0)
+    whatsapp_clicks = db.Column(db.Integer, nullable=False, default=0)
+    new_listings = db.Column(db.Integer, nullable=False, default=0)
+
+
+class SiteDailyStats(db.Model):
+    __tablename__ = 'site_daily_stats'
+    day = db.Column(db.Date, primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    phone_clicks = db.Column(db.Integer, nullable=False, default=0)
+    whatsapp_clicks = db.Column(db.Integer, nullable=False, default=0)
+    new_listings = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Indexes for the listing filter/sort paths. The partial ones only cover live
+# listings (approved + active), which is what every public query filters on;
+# SQLite has no way to prove that predicate from bound parameters, so there
+# they are plain indexes on the same columns.
+_LIVE = db.and_(Property.is_approved == db.true(), Property.status == 'active')
+
+db.Index('ix_properties_live_created', Property.created_at, postgresql_where=_LIVE)
+db.Index('ix_properties_live_price_inr', Property.price_inr, postgresql_where=_LIVE)
+db.Index('ix_properties_live_area', Property.area_sqft, postgresql_where=_LIVE)
+db.Index('ix_properties_live_views', Property.views_count, postgresql_where=_LIVE)
+db.Index('ix_properties_live_type', Property.listing_type, Property.property_type, Property.created_at,
+         postgresql_where=_LIVE)
+db.Index('ix_properties_live_locality', Property.locality_id, Property.created_at, postgresql_where=_LIVE)
+db.Index('ix_properties_live_bhk_price_inr', Property.bhk, Property.price_inr, postgresql_where=_LIVE)
+db.Index('ix_properties_live_featured', Property.created_at,
+         postgresql_where=db.and_(_LIVE, Property.is_featured == db.true()))
+# Covers the facet count query, which reads these columns of every live listing;
+# status and is_approved are included so SQLite can answer it from the index too
+db.Index('ix_properties_live_facets', Property.listing_type, Property.property_type, Property.bhk,
+         Property.furnished, Property.locality_id, Property.price_inr, Property.status, Property.is_approved,
+         postgresql_where=_LIVE)
+db.Index('ix_properties_status_approved', Property.status, Property.is_approved, Property.created_at)
+db.Index('ix_properties_user_id', Property.user_id, Property.created_at)
+db.Index('ix_property_images_property_id', PropertyImage.property_id, PropertyImage.sort_order)
+db.Index('ix_property_images_filename', PropertyImage.filename)
+db.Index('ix_enquiry_logs_property_id', EnquiryLog.property_id, EnquiryLog.action)
+db.Index('ix_enquiry_logs_action', EnquiryLog.action)
+
+
+# Full-text search index, kept in sync by the database itself: a generated
+# tsvector column on Postgres, an external-content FTS5 table maintained by
+# triggers on SQLite. Queried through services.search.
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(address, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+PG_SEARCH_DDL = [
+    f"ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({PG_SEARCH_VECTOR}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_properties_search_vector ON properties USING gin (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5("
+    "title, description, address, content='properties', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN "
+    "INSERT INTO properties_fts(rowid, title, description, address) "
+    "VALUES (new.id, new.title, new.description, new.address); END",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN "
+    "INSERT INTO properties_fts(properties_fts, rowid, title, description, address) "
+    "VALUES ('delete', old.id, old.title, old.description, old.address); END",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE OF title, description, address "
+    "ON properties BEGIN "
+    "INSERT INTO properties_fts(properties_fts, rowid, title, description, address) "
+    "VALUES ('delete', old.id, old.title, old.description, old.address); "
+    "INSERT INTO properties_fts(rowid, title, description, address) "
+    "VALUES (new.id, new.title, new.description, new.address); END",
+]
+
+for _stmt in PG_SEARCH_DDL:
+    event.listen(Property.__table__, 'after_create', DDL(_stmt).execute_if(dialect='postgresql'))
+for _stmt in SQLITE_SEARCH_DDL:
+    event.listen(Property.__table__, 'after_create', DDL(_stmt).execute_if(dialect='sqlite'))
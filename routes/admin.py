@@ -1,10 +1,22 @@
-import io
-import pandas as pd
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+import hmac
+import zipfile
+from datetime import date, datetime, timedelta
+from flask import Blueprint, Response, current_app, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy import case, func
 from extensions import db
-from models import Property, PropertyImage, User, Locality, EnquiryLog
+from models import Job, Property, PropertyImage, User, Locality
 from helpers import slugify
+from services.bulk_images import enqueue_bulk_images
+from services.enquiry_queue import enquiry_queue
+from services.home_stats import invalidate as invalidate_home_stats
+from services.jobs import job_runner
+from services.listing_snapshot import listing_snapshot
+from services.localities import locality_registry
+from services.perf import perf_monitor
+from services.response_cache import response_cache
+from services import rollups
+from services.suggest import suggestion_index
 from functools import wraps
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -21,18 +33,44 @@ def admin_required(f):
     return decorated
 
 
+# ?range= presets for the activity figures: key -> (label, days or None for all time)
+DATE_RANGES = {'7d': ('7 days', 7), '30d': ('30 days', 30), '90d': ('90 days', 90), '1y': ('1 year', 365),
+               'all': ('All time', None)}
+
+
+def _parse_day(value):
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _date_range():
+    """Template args for the UTC days asked for by ?from=&to= or a ?range= preset (30 days by default)."""
+    start, end = _parse_day(request.args.get('from')), _parse_day(request.args.get('to'))
+    preset = None
+    if start and end and start > end:
+        start, end = end, start
+    if not (start or end):
+        preset = request.args.get('range') if request.args.get('range') in DATE_RANGES else '30d'
+        days = DATE_RANGES[preset][1]
+        start = datetime.utcnow().date() - timedelta(days=days - 1) if days else None
+    return {'start': start, 'end': end, 'preset': preset,
+            'ranges': [(key, label) for key, (label, _) in DATE_RANGES.items()],
+            'updated': rollups.updated_at()}
+
+
 @admin_bp.route('/')
 @admin_required
 def dashboard():
-    total_properties = db.session.query(Property).count()
-    pending_properties = db.session.query(Property).filter_by(is_approved=False).count()
-    total_agents = db.session.query(User).filter(User.role.in_(['agent', 'broker'])).count()
-    pending_agents = db.session.query(User).filter_by(is_approved=False).filter(
-        User.role.in_(['agent', 'broker'])
-    ).count()
-    total_enquiries = db.session.query(EnquiryLog).count()
-    phone_clicks = db.session.query(EnquiryLog).filter_by(action='phone_click').count()
-    whatsapp_clicks = db.session.query(EnquiryLog).filter_by(action='whatsapp_click').count()
+    total_properties, pending_properties = db.session.query(
+        func.count(Property.id), func.sum(case((Property.is_approved == False, 1), else_=0))
+    ).one()
+    total_agents, pending_agents = db.session.query(
+        func.count(User.id), func.sum(case((User.is_approved == False, 1), else_=0))
+    ).filter(User.role.in_(['agent', 'broker'])).one()
+    period = _date_range()
+    activity = rollups.totals(period['start'], period['end'])
 
     recent_properties = db.session.query(Property).order_by(
         Property.created_at.desc()
@@ -40,13 +78,16 @@ def dashboard():
 
     return render_template('admin/dashboard.html',
                            total_properties=total_properties,
-                           pending_properties=pending_properties,
+                           pending_properties=pending_properties or 0,
                            total_agents=total_agents,
-                           pending_agents=pending_agents,
-                           total_enquiries=total_enquiries,
-                           phone_clicks=phone_clicks,
-                           whatsapp_clicks=whatsapp_clicks,
-                           recent_properties=recent_properties)
+                           pending_agents=pending_agents or 0,
+                           total_enquiries=activity['phone_clicks'] + activity['whatsapp_clicks'],
+                           phone_clicks=activity['phone_clicks'],
+                           whatsapp_clicks=activity['whatsapp_clicks'],
+                           views=activity['views'],
+                           new_listings=activity['new_listings'],
+                           recent_properties=recent_properties,
+                           **period)
 
 
 @admin_bp.route('/properties')
@@ -79,6 +120,7 @@ def approve_property(id):
     if prop:
         prop.is_approved = True
         db.session.commit()
+        suggestion_index.update_property(prop)
         flash(f'Property "{prop.title}" approved.', 'success')
     return redirect(request.referrer or url_for('admin.manage_properties'))
 
@@ -91,6 +133,7 @@ def reject_property(id):
         prop.is_approved = False
         prop.status = 'inactive'
         db.session.commit()
+        suggestion_index.remove_property(prop.id)
         flash(f'Property "{prop.title}" rejected.', 'warning')
     return redirect(request.referrer or url_for('admin.manage_properties'))
 
@@ -102,6 +145,7 @@ def toggle_feature(id):
     if prop:
         prop.is_featured = not prop.is_featured
         db.session.commit()
+        suggestion_index.update_property(prop)
         status = 'featured' if prop.is_featured else 'unfeatured'
         flash(f'Property "{prop.title}" {status}.', 'success')
     return redirect(request.referrer or url_for('admin.manage_properties'))
@@ -114,6 +158,7 @@ def delete_property(id):
     if prop:
         db.session.delete(prop)
         db.session.commit()
+        suggestion_index.remove_property(id)
         flash('Property deleted.', 'success')
     return redirect(url_for('admin.manage_properties'))
 
@@ -172,6 +217,9 @@ def promote_user(id):
 @admin_required
 def bulk_upload():
     if request.method == 'POST':
+        # pandas and openpyxl take longer to import than the rest of the app: load them on first use
+        from services.bulk_import import IMAGE_COLUMN, import_properties, missing_columns, read_sheet
+
         file = request.files.get('file')
         if not file or not file.filename:
             flash('Please select a file.', 'danger')
@@ -182,93 +230,67 @@ def bulk_upload():
             flash('Please upload a CSV or Excel file.', 'danger')
             return redirect(url_for('admin.bulk_upload'))
 
+        photos = request.files.get('images')
+        if photos and photos.filename:
+            if not zipfile.is_zipfile(photos):
+                flash('Photos must be uploaded as a ZIP file.', 'danger')
+                return redirect(url_for('admin.bulk_upload'))
+        else:
+            photos = None
+
         try:
-            if ext == 'csv':
-                df = pd.read_csv(file)
-            else:
-                df = pd.read_excel(file)
+            df = read_sheet(file, ext)
 
-            required_cols = ['title', 'property_type', 'listing_type', 'price']
-            missing = [c for c in required_cols if c not in df.columns]
+            missing = missing_columns(df)
             if missing:
                 flash(f'Missing required columns: {", ".join(missing)}', 'danger')
                 return redirect(url_for('admin.bulk_upload'))
+            if photos and IMAGE_COLUMN not in df.columns:
+                flash(f'Add an {IMAGE_COLUMN} column to say which photos belong to which row.', 'danger')
+                return redirect(url_for('admin.bulk_upload'))
 
-            count = 0
-            for _, row in df.iterrows():
-                title = str(row.get('title', '')).strip()
-                if not title:
-                    continue
-
-                base_slug = slugify(title)
-                slug = base_slug
-                counter = 1
-                while db.session.query(Property).filter_by(slug=slug).first():
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
-
-                locality_id = None
-                locality_name = str(row.get('locality', '')).strip()
-                if locality_name:
-                    loc = db.session.query(Locality).filter(
-                        Locality.name.ilike(locality_name)
-                    ).first()
-                    if loc:
-                        locality_id = loc.id
-
-                price_unit = str(row.get('price_unit', 'lakh')).strip().lower()
-                if price_unit not in ('lakh', 'crore', 'month'):
-                    price_unit = 'lakh'
-
-                prop = Property(
-                    title=title,
-                    slug=slug,
-                    property_type=str(row.get('property_type', 'flat')).strip().lower(),
-                    listing_type=str(row.get('listing_type', 'buy')).strip().lower(),
-                    price=float(row.get('price', 0)),
-                    price_unit=price_unit,
-                    bhk=int(row['bhk']) if pd.notna(row.get('bhk')) else None,
-                    area_sqft=float(row['area_sqft']) if pd.notna(row.get('area_sqft')) else None,
-                    carpet_area=float(row['carpet_area']) if pd.notna(row.get('carpet_area')) else None,
-                    floor_number=int(row['floor_number']) if pd.notna(row.get('floor_number')) else None,
-                    total_floors=int(row['total_floors']) if pd.notna(row.get('total_floors')) else None,
-                    age_years=int(row['age_years']) if pd.notna(row.get('age_years')) else None,
-                    furnished=str(row.get('furnished', 'unfurnished')).strip().lower(),
-                    facing=str(row.get('facing', '')).strip() or None,
-                    description=str(row.get('description', '')).strip() or None,
-                    address=str(row.get('address', '')).strip() or None,
-                    locality_id=locality_id,
-                    is_approved=True,
-                    status='active',
-                    user_id=current_user.id
-                )
-
-                amenities_str = str(row.get('amenities', '')).strip()
-                if amenities_str and amenities_str != 'nan':
-                    prop.amenities = [a.strip() for a in amenities_str.split(',')]
-
-                db.session.add(prop)
-                count += 1
-
-            db.session.commit()
-            flash(f'Successfully imported {count} properties.', 'success')
+            result = import_properties(df, current_user.id)
         except Exception as e:
             db.session.rollback()
             flash(f'Error importing file: {str(e)}', 'danger')
+            return redirect(url_for('admin.bulk_upload'))
 
-        return redirect(url_for('admin.bulk_upload'))
+        if photos and result['images']:
+            # Rendering hundreds of photos outlasts any request: the rows are in, the photos follow
+            result['photos_job'] = enqueue_bulk_images(photos, result['images'], current_user.id).id
+
+        # Rows go in through Core inserts, which bypass the ORM change hooks
+        response_cache.bump_version()
+        invalidate_home_stats()
+        listing_snapshot.record_reload()
+        suggestion_index.request_rebuild()
+        job_runner.enqueue('similar_rebuild', {})
+
+        flash(f'Successfully imported {result["imported"]} properties in {result["seconds"]:.1f}s '
+              f'({result["rows_per_sec"]:,.0f} rows/sec).', 'success')
+        if result.get('photos_job'):
+            flash('The photos are being processed in the background.', 'info')
+        if result['errors']:
+            flash(f'{len(result["errors"])} rows were skipped, see below.', 'warning')
+        return render_template('admin/bulk_upload.html', result=result)
 
     return render_template('admin/bulk_upload.html')
 
 
+@admin_bp.route('/bulk-upload/photos/<int:id>')
+@admin_required
+def bulk_photos(id):
+    job = db.session.get(Job, id)
+    if not job or job.kind != 'bulk_images':
+        flash('Photo upload not found.', 'danger')
+        return redirect(url_for('admin.bulk_upload'))
+    return render_template('admin/bulk_photos.html', job=job)
+
+
 @admin_bp.route('/localities')
 @admin_required
 def manage_localities():
-    localities = db.session.query(Locality).order_by(Locality.zone, Locality.name).all()
-    zones = {}
-    for loc in localities:
-        zones.setdefault(loc.zone, []).append(loc)
-    return render_template('admin/localities.html', zones=zones)
+    return render_template('admin/localities.html', zones=locality_registry.by_zone())
 
 
 @admin_bp.route('/locality/add', methods=['POST'])
@@ -282,6 +304,8 @@ def add_locality():
             loc = Locality(name=name, zone=zone, slug=slug)
             db.session.add(loc)
             db.session.commit()
+            locality_registry.invalidate()
+            suggestion_index.update_locality(loc)
             flash(f'Locality "{name}" added.', 'success')
         else:
             flash('Locality already exists.', 'warning')
@@ -295,37 +319,52 @@ def delete_locality(id):
     if loc:
         db.session.delete(loc)
         db.session.commit()
+        locality_registry.invalidate()
+        suggestion_index.remove_locality(id)
         flash(f'Locality "{loc.name}" deleted.', 'success')
     return redirect(url_for('admin.manage_localities'))
 
 
+@admin_bp.route('/enquiry-queue')
+@admin_required
+def enquiry_queue_stats():
+    return jsonify(enquiry_queue.report())
+
+
+@admin_bp.route('/perf')
+@admin_required
+def perf():
+    return render_template('admin/perf.html', report=perf_monitor.report(), enabled=perf_monitor.enabled)
+
+
+@admin_bp.route('/perf/reset', methods=['POST'])
+@admin_required
+def reset_perf():
+    perf_monitor.reset()
+    flash('Performance counters reset.', 'success')
+    return redirect(url_for('admin.perf'))
+
+
+@admin_bp.route('/perf/metrics')
+def perf_metrics():
+    """Prometheus scrape target: admins, or ``Authorization: Bearer <PERF_METRICS_TOKEN>``."""
+    token = current_app.config.get('PERF_METRICS_TOKEN')
+    offered = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not (token and hmac.compare_digest(offered.encode(), token.encode())) and \
+            not (current_user.is_authenticated and current_user.is_admin):
+        return Response('Forbidden\n', status=403, mimetype='text/plain')
+    return Response(perf_monitor.prometheus(), mimetype='text/plain; version=0.0.4')
+
+
 @admin_bp.route('/analytics')
 @admin_required
 def analytics():
-    # Top properties by enquiry
-    from sqlalchemy import func
-    top_properties = db.session.query(
-        Property.title, Property.slug,
-        func.count(EnquiryLog.id).label('clicks')
-    ).join(EnquiryLog, EnquiryLog.property_id == Property.id
-    ).group_by(Property.id).order_by(func.count(EnquiryLog.id).desc()).limit(10).all()
-
-    # Popular localities
-    popular_localities = db.session.query(
-        Locality.name, Locality.zone,
-        func.count(Property.id).label('count')
-    ).join(Property, Property.locality_id == Locality.id
-    ).filter(Property.is_approved == True
-    ).group_by(Locality.id).order_by(func.count(Property.id).desc()).limit(10).all()
-
-    # Top agents
-    top_agents = db.session.query(
-        User.name, User.company,
-        func.count(Property.id).label('count')
-    ).join(Property, Property.user_id == User.id
-    ).group_by(User.id).order_by(func.count(Property.id).desc()).limit(10).all()
-
+    # Read from the daily rollups kept by services.rollups, not the raw logs
+    period = _date_range()
+    start, end = period['start'], period['end']
     return render_template('admin/analytics.html',
-                           top_properties=top_properties,
-                           popular_localities=popular_localities,
-                           top_agents=top_agents)
+                           totals=rollups.totals(start, end),
+                           top_properties=rollups.top_properties(start, end),
+                           popular_localities=rollups.top_localities(start, end),
+                           top_agents=rollups.top_agents(start, end),
+                           **period)
@@ -1,9 +1,12 @@
 import os
-from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, jsonify
 from flask_login import login_required, current_user
 from extensions import db
-from models import Property, PropertyImage, Locality, EnquiryLog
-from helpers import slugify, save_property_image, save_user_photo, delete_property_image
+from models import Property, PropertyImage, EnquiryLog, Job
+from helpers import slugify, stage_upload, save_user_photo, delete_property_image
+from services.localities import locality_registry
+from services.property_images import enqueue_property_images
+from services.suggest import suggestion_index
 from functools import wraps
 
 agent_bp = Blueprint('agent', __name__, url_prefix='/agent')
@@ -46,15 +49,22 @@ def my_properties():
     pagination = current_user.properties.order_by(
         Property.created_at.desc()
     ).paginate(page=page, per_page=10, error_out=False)
+    pending_jobs = {
+        job.property_id: job for job in db.session.query(Job).filter(
+            Job.user_id == current_user.id,
+            Job.status.in_(['queued', 'running']),
+        ).all()
+    }
     return render_template('agent/my_properties.html',
                            properties=pagination.items,
-                           pagination=pagination)
+                           pagination=pagination,
+                           pending_jobs=pending_jobs)
 
 
 @agent_bp.route('/property/add', methods=['GET', 'POST'])
 @agent_required
 def add_property():
-    localities = db.session.query(Locality).order_by(Locality.zone, Locality.name).all()
+    localities = locality_registry.all()
 
     if request.method == 'POST':
         title = request.form.get('title', '').strip()
@@ -103,21 +113,11 @@ def add_property():
         db.session.add(prop)
         db.session.commit()
 
-        # Handle images
-        files = request.files.getlist('images')
-        for i, file in enumerate(files):
-            if file and file.filename:
-                filename = save_property_image(file, prop.id)
-                if filename:
-                    img = PropertyImage(
-                        property_id=prop.id,
-                        filename=filename,
-                        is_primary=(i == 0),
-                        sort_order=i
-                    )
-                    db.session.add(img)
+        # Images are resized in the background; only stage the raw uploads here
+        staged = [stage_upload(f) for f in request.files.getlist('images') if f and f.filename]
+        enqueue_property_images(prop, [p for p in staged if p], current_user.id)
 
-        db.session.commit()
+        suggestion_index.update_property(prop)
         flash('Property added successfully! It will be visible after admin approval.', 'success')
         return redirect(url_for('agent.my_properties'))
 
@@ -132,7 +132,7 @@ def edit_property(id):
         flash('Property not found.', 'danger')
         return redirect(url_for('agent.my_properties'))
 
-    localities = db.session.query(Locality).order_by(Locality.zone, Locality.name).all()
+    localities = locality_registry.all()
 
     if request.method == 'POST':
         prop.title = request.form.get('title', '').strip()
@@ -158,24 +158,9 @@ def edit_property(id):
         for img_id in delete_ids:
             img = db.session.get(PropertyImage, int(img_id))
             if img and img.property_id == prop.id:
-                delete_property_image(img.filename)
+                delete_property_image(img.filename, img.renditions)
                 db.session.delete(img)
 
-        # Handle new images
-        files = request.files.getlist('images')
-        existing_count = prop.images.count()
-        for i, file in enumerate(files):
-            if file and file.filename:
-                filename = save_property_image(file, prop.id)
-                if filename:
-                    img = PropertyImage(
-                        property_id=prop.id,
-                        filename=filename,
-                        is_primary=(existing_count == 0 and i == 0),
-                        sort_order=existing_count + i
-                    )
-                    db.session.add(img)
-
         # Set primary image
         primary_id = request.form.get('primary_image', type=int)
         if primary_id:
@@ -183,6 +168,12 @@ def edit_property(id):
                 img.is_primary = (img.id == primary_id)
 
         db.session.commit()
+
+        # New images are resized in the background; only stage the raw uploads here
+        staged = [stage_upload(f) for f in request.files.getlist('images') if f and f.filename]
+        enqueue_property_images(prop, [p for p in staged if p], current_user.id)
+
+        suggestion_index.update_property(prop)
         flash('Property updated successfully.', 'success')
         return redirect(url_for('agent.my_properties'))
 
@@ -199,10 +190,11 @@ def delete_property(id):
         return redirect(url_for('agent.my_properties'))
 
     for img in prop.all_images:
-        delete_property_image(img.filename)
+        delete_property_image(img.filename, img.renditions)
 
     db.session.delete(prop)
     db.session.commit()
+    suggestion_index.remove_property(id)
     flash('Property deleted.', 'success')
     return redirect(url_for('agent.my_properties'))
 
@@ -218,11 +210,28 @@ def change_status(id, status):
     if status in ('active', 'sold', 'rented', 'inactive'):
         prop.status = status
         db.session.commit()
+        suggestion_index.update_property(prop)
         flash(f'Property marked as {status}.', 'success')
 
     return redirect(url_for('agent.my_properties'))
 
 
+@agent_bp.route('/jobs/<int:id>')
+@login_required
+def job_status(id):
+    job = db.session.get(Job, id)
+    if not job or (job.user_id != current_user.id and not current_user.is_admin):
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'finished': job.is_finished,
+        'result': job.result,
+        'error': job.error,
+    })
+
+
 @agent_bp.route('/profile', methods=['GET', 'POST'])
 @login_required
 def profile():
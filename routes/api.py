@@ -1,47 +1,39 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from extensions import db
-from models import Property, PropertyImage, Locality, User, EnquiryLog
-from sqlalchemy import func, or_
+from models import AMENITY_BITS, Property, PropertyImage, Locality, User, has_amenities, price_to_inr
+from sqlalchemy import func
+from services.cards import load_cards, serialize_property_card
+from services.enquiry_queue import enquiry_queue, ACTIONS as ENQUIRY_ACTIONS
+from services.facets import facet_counts, requested_amenities, selected_facets
+from services.home_stats import get_home_stats
+from services.listing_snapshot import listing_snapshot
+from services.localities import locality_registry
+from services.pagination import keyset_page, InvalidCursor
+from services.response_cache import response_cache
+from services.search import apply_search, search_rank
+from services.similar import similar_properties
+from services.suggest import suggestion_index
+from services.view_counter import view_counter
 
 api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
 
+# Query arguments the cached endpoints read; no others go into their cache keys
+FILTER_ARGS = ('q', 'listing_type', 'property_type', 'locality', 'zone', 'bhk', 'furnished', 'amenities',
+               'min_price', 'max_price', 'min_price_inr', 'max_price_inr')
+PAGE_ARGS = ('page', 'per_page', 'after')
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def serialize_property_card(prop):
-    """Minimal property data for list/card views."""
-    primary = prop.primary_image
-    locality = prop.locality
-    return {
-        'id': prop.id,
-        'title': prop.title,
-        'slug': prop.slug,
-        'property_type': prop.property_type,
-        'listing_type': prop.listing_type,
-        'price': prop.price,
-        'price_unit': prop.price_unit,
-        'formatted_price': prop.formatted_price,
-        'bhk': prop.bhk,
-        'area_sqft': prop.area_sqft,
-        'carpet_area': prop.carpet_area,
-        'furnished': prop.furnished,
-        'locality': locality.name if locality else None,
-        'zone': locality.zone if locality else None,
-        'locality_id': prop.locality_id,
-        'image': f'/static/uploads/properties/thumbs/{primary.filename}' if primary else None,
-        'is_featured': prop.is_featured,
-        'views_count': prop.views_count,
-        'created_at': prop.created_at.isoformat() if prop.created_at else None,
-    }
-
-
 def serialize_property_detail(prop):
     """Full property data for detail view."""
     card = serialize_property_card(prop)
     owner = prop.owner
     images = prop.all_images
+    thumb_width = current_app.config['CARD_IMAGE_WIDTH']
+    detail_width = current_app.config['DETAIL_IMAGE_WIDTH']
     card.update({
         'floor_number': prop.floor_number,
         'total_floors': prop.total_floors,
@@ -54,8 +46,12 @@ def serialize_property_detail(prop):
         'images': [
             {
                 'id': img.id,
-                'url': f'/static/uploads/properties/{img.filename}',
-                'thumb': f'/static/uploads/properties/thumbs/{img.filename}',
+                'url': f'/static/{img.path(detail_width, img.formats[0])}',
+                'thumb': f'/static/{img.path(thumb_width, img.formats[0])}',
+                'sources': {
+                    fmt: [{'url': f'/static/{path}', 'width': width} for path, width in img.variants(fmt)]
+                    for fmt in img.formats
+                },
                 'is_primary': img.is_primary,
             }
             for img in images
@@ -71,6 +67,82 @@ def serialize_property_detail(prop):
     return card
 
 
+def cursor_page_response(q, sort, per_page, **extra):
+    """Keyset-paginated JSON response for an unordered property query."""
+    try:
+        properties, next_cursor = keyset_page(q, sort, request.args.get('after'), per_page)
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    load_cards(properties)
+    return jsonify({
+        **extra,
+        'properties': [serialize_property_card(p) for p in properties],
+        'pagination': {
+            'per_page': per_page,
+            'next_cursor': next_cursor,
+            'has_next': next_cursor is not None,
+        }
+    })
+
+
+def requested_price_range(listing_type):
+    """(min, max) rupees from min/max_price_inr, or min/max_price in lakhs (a month for rentals)."""
+    price_unit = 'month' if listing_type == 'rent' else 'lakh'
+    bounds = []
+    for name in ('min_price', 'max_price'):
+        value = request.args.get(f'{name}_inr', type=int)
+        if value is None and request.args.get(name, type=float) is not None:
+            value = price_to_inr(request.args.get(name, type=float), price_unit)
+        bounds.append(value)
+    return tuple(bounds)
+
+
+def requested_filters():
+    """The listing filters in the query string, for ``filter_properties`` or the listing snapshot.
+
+    Like the facets endpoint, the type, furnishing, zone and BHK filters take
+    several values, comma-separated or repeated; a listing matches any of them.
+    """
+    selected = selected_facets(request.args)
+    min_price, max_price = requested_price_range(request.args.get('listing_type'))
+    return {
+        'listing_type': sorted(selected.get('listing_type', ())),
+        'property_type': sorted(selected.get('property_type', ())),
+        'locality_id': request.args.get('locality', type=int),
+        'zone': sorted(selected.get('zone', ())),
+        'bhk': sorted(selected.get('bhk', ())),
+        'furnished': sorted(selected.get('furnished', ())),
+        'amenities': requested_amenities(request.args),
+        'min_price': min_price,
+        'max_price': max_price,
+    }
+
+
+def filter_properties(q, filters):
+    """Apply ``requested_filters()`` to a Property query."""
+    if filters['listing_type']:
+        q = q.filter(Property.listing_type.in_(filters['listing_type']))
+    if filters['property_type']:
+        q = q.filter(Property.property_type.in_(filters['property_type']))
+    if filters['locality_id']:
+        q = q.filter(Property.locality_id == filters['locality_id'])
+    if filters['zone']:
+        ids = [loc_id for zone in filters['zone'] for loc_id in locality_registry.zone_ids(zone)]
+        q = q.filter(Property.locality_id.in_(ids))
+    if filters['bhk']:
+        q = q.filter(Property.bhk.in_(filters['bhk']))
+    if filters['furnished']:
+        q = q.filter(Property.furnished.in_(filters['furnished']))
+    if filters['amenities']:
+        q = q.filter(has_amenities(filters['amenities']))
+    if filters['min_price'] is not None:
+        q = q.filter(Property.price_inr >= filters['min_price'])
+    if filters['max_price'] is not None:
+        q = q.filter(Property.price_inr <= filters['max_price'])
+    return q
+
+
 def add_cors(response):
     response.headers['Access-Control-Allow-Origin'] = '*'
     response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
@@ -88,122 +160,75 @@ def after_request(response):
 # ---------------------------------------------------------------------------
 
 @api_bp.route('/home', methods=['GET'])
+@response_cache.cached
 def home():
     """Home screen data: featured, zones, property types, stats."""
     # Featured properties
     featured = db.session.query(Property).filter_by(
         is_featured=True, is_approved=True, status='active'
     ).order_by(Property.created_at.desc()).limit(10).all()
+    load_cards(featured)
 
-    # Zones with counts
-    zone_data = db.session.query(
-        Locality.zone, func.count(Property.id)
-    ).outerjoin(Property, (Property.locality_id == Locality.id) & (Property.status == 'active') & (Property.is_approved == True)).group_by(
-        Locality.zone
-    ).all()
-    zones = [{'name': z, 'property_count': c} for z, c in zone_data]
-
-    # Property types with counts
-    type_data = db.session.query(
-        Property.property_type, func.count(Property.id)
-    ).filter_by(status='active', is_approved=True).group_by(
-        Property.property_type
-    ).all()
-    property_types = [{'name': t, 'count': c} for t, c in type_data]
-
-    # Stats
-    total = db.session.query(func.count(Property.id)).filter_by(
-        status='active', is_approved=True
-    ).scalar() or 0
-    buy_count = db.session.query(func.count(Property.id)).filter_by(
-        status='active', is_approved=True, listing_type='buy'
-    ).scalar() or 0
-    rent_count = db.session.query(func.count(Property.id)).filter_by(
-        status='active', is_approved=True, listing_type='rent'
-    ).scalar() or 0
-    locality_count = db.session.query(func.count(Locality.id)).scalar() or 0
+    stats = get_home_stats()
 
     return jsonify({
         'featured': [serialize_property_card(p) for p in featured],
-        'zones': zones,
-        'property_types': property_types,
+        'zones': [{'name': z, 'property_count': c} for z, c in stats['by_zone'].items()],
+        'property_types': [{'name': t, 'count': c} for t, c in stats['by_property_type'].items()],
         'stats': {
-            'total_properties': total,
-            'for_sale': buy_count,
-            'for_rent': rent_count,
-            'localities': locality_count,
+            'total_properties': stats['total_properties'],
+            'for_sale': stats['by_listing_type'].get('buy', 0),
+            'for_rent': stats['by_listing_type'].get('rent', 0),
+            'localities': stats['total_localities'],
         }
     })
 
 
 @api_bp.route('/properties', methods=['GET'])
+@response_cache.cached(args=FILTER_ARGS + PAGE_ARGS + ('sort',))
 def properties_list():
     """Paginated property list with filters."""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 12, type=int)
-    per_page = min(per_page, 50)
-
-    q = db.session.query(Property).filter_by(status='active', is_approved=True)
-
-    # Filters
-    listing_type = request.args.get('listing_type')
-    if listing_type:
-        q = q.filter(Property.listing_type == listing_type)
-
-    property_type = request.args.get('property_type')
-    if property_type:
-        q = q.filter(Property.property_type == property_type)
-
-    locality_id = request.args.get('locality')
-    if locality_id:
-        q = q.filter(Property.locality_id == int(locality_id))
-
-    zone = request.args.get('zone')
-    if zone:
-        locality_ids = [l.id for l in db.session.query(Locality.id).filter_by(zone=zone).all()]
-        if locality_ids:
-            q = q.filter(Property.locality_id.in_(locality_ids))
-
-    bhk = request.args.get('bhk')
-    if bhk:
-        bhk_list = [int(b) for b in bhk.split(',') if b.isdigit()]
-        if bhk_list:
-            q = q.filter(Property.bhk.in_(bhk_list))
-
-    furnished = request.args.get('furnished')
-    if furnished:
-        q = q.filter(Property.furnished == furnished)
-
-    min_price = request.args.get('min_price', type=float)
-    if min_price is not None:
-        q = q.filter(Property.price >= min_price)
-
-    max_price = request.args.get('max_price', type=float)
-    if max_price is not None:
-        q = q.filter(Property.price <= max_price)
-
-    search = request.args.get('q')
-    if search:
-        pattern = f'%{search}%'
-        q = q.filter(or_(
-            Property.title.ilike(pattern),
-            Property.address.ilike(pattern),
-            Property.description.ilike(pattern),
-        ))
-
-    # Sort
-    sort = request.args.get('sort', 'newest')
-    if sort == 'price_low':
-        q = q.order_by(Property.price.asc())
-    elif sort == 'price_high':
-        q = q.order_by(Property.price.desc())
-    elif sort == 'area':
-        q = q.order_by(Property.area_sqft.desc().nullslast())
+    per_page = min(max(per_page, 1), 50)
+
+    filters = requested_filters()
+    unknown = [a for a in filters['amenities'] if a not in AMENITY_BITS]
+    if unknown:
+        return jsonify({'error': f"Unknown amenities: {', '.join(unknown)}"}), 400
+
+    search = request.args.get('q', '').strip()
+    sort = request.args.get('sort', 'relevance' if search else 'newest')
+
+    if listing_snapshot.enabled and not search and 'after' not in request.args:
+        ids, total = listing_snapshot.select(filters, sort, (page - 1) * per_page, per_page)
+        found = {p.id: p for p in db.session.query(Property).filter(
+            Property.id.in_(ids), Property.status == 'active', Property.is_approved == True,
+        )}
+        properties = load_cards([found[i] for i in ids if i in found])
     else:
-        q = q.order_by(Property.created_at.desc())
-
-    total = q.count()
-    properties = q.offset((page - 1) * per_page).limit(per_page).all()
+        q = filter_properties(db.session.query(Property).filter_by(status='active', is_approved=True), filters)
+        if search:
+            q = apply_search(q, search)
+
+        # Cursor mode: pass ``after`` (empty for the first page) to skip COUNT/OFFSET
+        if 'after' in request.args:
+            return cursor_page_response(q, sort, per_page)
+
+        # Sort
+        if sort == 'relevance' and search:
+            q = q.order_by(search_rank(search))
+        elif sort == 'price_low':
+            q = q.order_by(Property.price_inr.asc())
+        elif sort == 'price_high':
+            q = q.order_by(Property.price_inr.desc())
+        elif sort == 'area':
+            q = q.order_by(Property.area_sqft.desc().nullslast())
+        else:
+            q = q.order_by(Property.created_at.desc())
+
+        total = q.count()
+        properties = load_cards(q.offset((page - 1) * per_page).limit(per_page).all())
 
     return jsonify({
         'properties': [serialize_property_card(p) for p in properties],
@@ -218,6 +243,31 @@ def properties_list():
     })
 
 
+@api_bp.route('/properties/facets', methods=['GET'])
+@response_cache.cached(args=FILTER_ARGS)
+def properties_facets():
+    """Counts per facet value for the filters ``/properties`` takes."""
+    q = db.session.query(Property).filter_by(status='active', is_approved=True)
+
+    locality_id = request.args.get('locality', type=int)
+    if locality_id:
+        q = q.filter(Property.locality_id == locality_id)
+
+    amenities = requested_amenities(request.args)
+    if amenities:
+        unknown = [a for a in amenities if a not in AMENITY_BITS]
+        if unknown:
+            return jsonify({'error': f"Unknown amenities: {', '.join(unknown)}"}), 400
+        q = q.filter(has_amenities(amenities))
+
+    search = request.args.get('q', '').strip()
+    if search:
+        q = apply_search(q, search)
+
+    min_price, max_price = requested_price_range(request.args.get('listing_type'))
+    return jsonify(facet_counts(q, selected_facets(request.args), min_price, max_price))
+
+
 @api_bp.route('/properties/<int:prop_id>', methods=['GET'])
 def property_detail(prop_id):
     """Full property detail."""
@@ -225,20 +275,10 @@ def property_detail(prop_id):
     if not prop or prop.status == 'inactive':
         return jsonify({'error': 'Property not found'}), 404
 
-    # Increment views
-    prop.views_count = (prop.views_count or 0) + 1
-    db.session.commit()
-
-    # Similar properties (same locality or type, exclude self)
-    similar_q = db.session.query(Property).filter(
-        Property.id != prop.id,
-        Property.status == 'active',
-        Property.is_approved == True,
-        or_(
-            Property.locality_id == prop.locality_id,
-            Property.property_type == prop.property_type,
-        )
-    ).order_by(Property.views_count.desc()).limit(6).all()
+    view_counter.record(prop.id)
+
+    similar_q = similar_properties(prop, 6)
+    load_cards([prop] + similar_q)
 
     return jsonify({
         'property': serialize_property_detail(prop),
@@ -247,31 +287,27 @@ def property_detail(prop_id):
 
 
 @api_bp.route('/localities', methods=['GET'])
+@response_cache.cached
 def localities():
     """All localities grouped by zone with property counts."""
-    results = db.session.query(
-        Locality,
-        func.count(Property.id).label('count')
-    ).outerjoin(
-        Property,
-        (Property.locality_id == Locality.id) & (Property.status == 'active') & (Property.is_approved == True)
-    ).group_by(Locality.id).order_by(Locality.zone, Locality.name).all()
+    counts = dict(db.session.query(Property.locality_id, func.count(Property.id)).filter(
+        Property.status == 'active', Property.is_approved == True
+    ).group_by(Property.locality_id).all())
 
     zones = {}
-    for loc, count in results:
-        if loc.zone not in zones:
-            zones[loc.zone] = []
-        zones[loc.zone].append({
+    for zone, locs in locality_registry.by_zone().items():
+        zones[zone] = [{
             'id': loc.id,
             'name': loc.name,
             'slug': loc.slug,
-            'property_count': count,
-        })
+            'property_count': counts.get(loc.id, 0),
+        } for loc in locs]
 
     return jsonify({'zones': zones})
 
 
 @api_bp.route('/localities/<int:loc_id>/properties', methods=['GET'])
+@response_cache.cached(args=PAGE_ARGS)
 def locality_properties(loc_id):
     """Properties in a locality (paginated)."""
     locality = db.session.get(Locality, loc_id)
@@ -280,22 +316,28 @@ def locality_properties(loc_id):
 
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 12, type=int)
-    per_page = min(per_page, 50)
+    per_page = min(max(per_page, 1), 50)
 
     q = db.session.query(Property).filter_by(
         locality_id=loc_id, status='active', is_approved=True
-    ).order_by(Property.created_at.desc())
+    )
+
+    locality_data = {
+        'id': locality.id,
+        'name': locality.name,
+        'zone': locality.zone,
+        'slug': locality.slug,
+    }
+
+    if 'after' in request.args:
+        return cursor_page_response(q, 'newest', per_page, locality=locality_data)
 
+    q = q.order_by(Property.created_at.desc())
     total = q.count()
-    properties = q.offset((page - 1) * per_page).limit(per_page).all()
+    properties = load_cards(q.offset((page - 1) * per_page).limit(per_page).all())
 
     return jsonify({
-        'locality': {
-            'id': locality.id,
-            'name': locality.name,
-            'zone': locality.zone,
-            'slug': locality.slug,
-        },
+        'locality': locality_data,
         'properties': [serialize_property_card(p) for p in properties],
         'pagination': {
             'page': page,
@@ -309,33 +351,22 @@ def locality_properties(loc_id):
 
 
 @api_bp.route('/search/suggestions', methods=['GET'])
+@response_cache.cached(args=('q',))
 def search_suggestions():
     """Autocomplete: top 5 localities + 5 properties matching query."""
     query = request.args.get('q', '').strip()
     if len(query) < 2:
         return jsonify({'localities': [], 'properties': []})
 
-    pattern = f'%{query}%'
-
-    locs = db.session.query(Locality).filter(
-        Locality.name.ilike(pattern)
-    ).limit(5).all()
-
-    props = db.session.query(Property).filter(
-        Property.status == 'active',
-        Property.is_approved == True,
-        or_(
-            Property.title.ilike(pattern),
-            Property.address.ilike(pattern),
-        )
-    ).limit(5).all()
+    matches = suggestion_index.suggest(query, limit=5)
+    if matches is None:
+        # Not cached: only 200s are, and "not ready" must not be taken for "no matches"
+        return jsonify({'error': 'Suggestions are not ready yet'}), 503, {'Retry-After': '5'}
+    locs, props = matches
 
     return jsonify({
-        'localities': [
-            {'id': l.id, 'name': l.name, 'zone': l.zone}
-            for l in locs
-        ],
-        'properties': [serialize_property_card(p) for p in props],
+        'localities': locs,
+        'properties': props,
     })
 
 
@@ -346,15 +377,14 @@ def log_enquiry():
     property_id = data.get('property_id')
     action = data.get('action')
 
-    if not property_id or action not in ('phone_click', 'whatsapp_click'):
+    try:
+        property_id = int(property_id)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid data'}), 400
+    if action not in ENQUIRY_ACTIONS:
         return jsonify({'error': 'Invalid data'}), 400
 
-    log = EnquiryLog(
-        property_id=property_id,
-        action=action,
-        visitor_ip=request.remote_addr,
-    )
-    db.session.add(log)
-    db.session.commit()
+    if not enquiry_queue.submit(property_id, action, request.remote_addr):
+        return jsonify({'error': 'Busy, try again'}), 503
 
     return jsonify({'status': 'ok'})
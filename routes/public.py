@@ -1,7 +1,17 @@
-from flask import Blueprint, render_template, request, jsonify
+from urllib.parse import urlencode
+from flask import Blueprint, abort, render_template, request, jsonify
 from sqlalchemy import func
 from extensions import db
-from models import Property, Locality, User, EnquiryLog
+from models import AMENITY_BITS, Property, Locality, has_amenities, price_to_inr
+from services.cards import load_cards
+from services.enquiry_queue import enquiry_queue, ACTIONS as ENQUIRY_ACTIONS
+from services.facets import facet_counts, requested_amenities, selected_facets
+from services.home_stats import get_home_stats
+from services.localities import locality_registry
+from services.response_cache import response_cache
+from services.search import apply_search, search_rank
+from services.similar import similar_properties
+from services.view_counter import view_counter
 
 public_bp = Blueprint('public', __name__)
 
@@ -11,23 +21,17 @@ def home():
     featured = db.session.query(Property).filter_by(
         is_approved=True, status='active', is_featured=True
     ).order_by(Property.created_at.desc()).limit(8).all()
+    load_cards(featured)
 
-    localities = db.session.query(Locality).all()
-    zones = {}
-    for loc in localities:
-        zones.setdefault(loc.zone, []).append(loc)
-
-    # Stats
-    total_properties = db.session.query(Property).filter_by(is_approved=True, status='active').count()
-    total_agents = db.session.query(User).filter(User.role.in_(['agent', 'broker']), User.is_approved == True).count()
-    total_localities = db.session.query(Locality).count()
+    zones = locality_registry.by_zone()
+    stats = get_home_stats()
 
     return render_template('public/home.html',
                            featured=featured,
                            zones=zones,
-                           total_properties=total_properties,
-                           total_agents=total_agents,
-                           total_localities=total_localities)
+                           total_properties=stats['total_properties'],
+                           total_agents=stats['total_agents'],
+                           total_localities=stats['total_localities'])
 
 
 @public_bp.route('/properties')
@@ -35,9 +39,26 @@ def properties():
     page = request.args.get('page', 1, type=int)
     per_page = 12
 
-    query = db.session.query(Property).filter_by(is_approved=True, status='active')
+    # Filters that are not facets narrow the listings the sidebar counts
+    base = db.session.query(Property).filter_by(is_approved=True, status='active')
+
+    locality_id = request.args.get('locality')
+    if locality_id:
+        base = base.filter_by(locality_id=locality_id)
+
+    amenities = requested_amenities(request.args)
+    if amenities:
+        # As in the API: an unknown name would otherwise drop out of the filter unnoticed
+        unknown = [a for a in amenities if a not in AMENITY_BITS]
+        if unknown:
+            abort(400, description=f"Unknown amenities: {', '.join(unknown)}")
+        base = base.filter(has_amenities(amenities))
+
+    search_q = request.args.get('q', '').strip()
+    if search_q:
+        base = apply_search(base, search_q)
 
-    # Filters
+    query = base
     listing_type = request.args.get('listing_type')
     if listing_type in ('buy', 'rent'):
         query = query.filter_by(listing_type=listing_type)
@@ -46,62 +67,58 @@ def properties():
     if property_type:
         query = query.filter_by(property_type=property_type)
 
-    locality_id = request.args.get('locality')
-    if locality_id:
-        query = query.filter_by(locality_id=locality_id)
-
     zone = request.args.get('zone')
     if zone:
-        loc_ids = [l.id for l in db.session.query(Locality).filter_by(zone=zone).all()]
-        if loc_ids:
-            query = query.filter(Property.locality_id.in_(loc_ids))
+        # An unknown zone matches nothing, as in the API and the sidebar counts
+        query = query.filter(Property.locality_id.in_(locality_registry.zone_ids(zone)))
 
-    bhk = request.args.get('bhk')
-    if bhk:
-        bhk_list = [int(b) for b in bhk.split(',') if b.isdigit()]
-        if bhk_list:
-            query = query.filter(Property.bhk.in_(bhk_list))
+    bhk_list = [int(b) for value in request.args.getlist('bhk') for b in value.split(',') if b.isdigit()]
+    if bhk_list:
+        query = query.filter(Property.bhk.in_(bhk_list))
 
     furnished = request.args.get('furnished')
     if furnished:
         query = query.filter_by(furnished=furnished)
 
-    min_price = request.args.get('min_price', type=float)
-    max_price = request.args.get('max_price', type=float)
+    # Prices are entered in lakhs, or rupees a month when browsing rentals
+    price_unit = 'month' if listing_type == 'rent' else 'lakh'
+    min_price = price_to_inr(request.args.get('min_price', type=float), price_unit)
+    max_price = price_to_inr(request.args.get('max_price', type=float), price_unit)
     if min_price is not None:
-        query = query.filter(Property.price >= min_price)
+        query = query.filter(Property.price_inr >= min_price)
     if max_price is not None:
-        query = query.filter(Property.price <= max_price)
+        query = query.filter(Property.price_inr <= max_price)
 
-    search_q = request.args.get('q', '').strip()
-    if search_q:
-        search_term = f"%{search_q}%"
-        query = query.filter(
-            db.or_(
-                Property.title.ilike(search_term),
-                Property.description.ilike(search_term),
-                Property.address.ilike(search_term)
-            )
-        )
+    # The counts only depend on the filters, so every page and sort order shares them
+    filter_args = sorted((k, v) for k, v in request.args.items(multi=True) if k not in ('page', 'sort'))
+    counts = response_cache.get_or_set(
+        f'/properties facets?{urlencode(filter_args)}',
+        lambda: facet_counts(base, selected_facets(request.args), min_price, max_price)['facets'],
+    )
+    facets = {name: {v['value']: v['count'] for v in values} for name, values in counts.items() if name != 'price'}
 
     # Sort
-    sort = request.args.get('sort', 'newest')
-    if sort == 'price_low':
-        query = query.order_by(Property.price.asc())
+    sort = request.args.get('sort', 'relevance' if search_q else 'newest')
+    if sort == 'relevance' and search_q:
+        query = query.order_by(search_rank(search_q))
+    elif sort == 'price_low':
+        query = query.order_by(Property.price_inr.asc())
     elif sort == 'price_high':
-        query = query.order_by(Property.price.desc())
+        query = query.order_by(Property.price_inr.desc())
     elif sort == 'area':
         query = query.order_by(Property.area_sqft.desc())
     else:
         query = query.order_by(Property.created_at.desc())
 
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    localities = db.session.query(Locality).order_by(Locality.zone, Locality.name).all()
+    load_cards(pagination.items)
+    localities = locality_registry.all()
 
     return render_template('public/properties.html',
                            properties=pagination.items,
                            pagination=pagination,
                            localities=localities,
+                           facets=facets,
                            filters=request.args)
 
 
@@ -109,20 +126,10 @@ def properties():
 def property_detail(slug):
     prop = db.session.query(Property).filter_by(slug=slug).first_or_404()
 
-    # Increment view count
-    prop.views_count = (prop.views_count or 0) + 1
-    db.session.commit()
-
-    # Similar properties
-    similar = db.session.query(Property).filter(
-        Property.id != prop.id,
-        Property.is_approved == True,
-        Property.status == 'active',
-        db.or_(
-            Property.locality_id == prop.locality_id,
-            Property.property_type == prop.property_type
-        )
-    ).limit(4).all()
+    view_counter.record(prop.id)
+
+    similar = similar_properties(prop, 4)
+    load_cards([prop] + similar)
 
     return render_template('public/property_detail.html', property=prop, similar=similar)
 
@@ -134,6 +141,7 @@ def locality_detail(slug):
     pagination = db.session.query(Property).filter_by(
         locality_id=locality.id, is_approved=True, status='active'
     ).order_by(Property.created_at.desc()).paginate(page=page, per_page=12, error_out=False)
+    load_cards(pagination.items)
 
     return render_template('public/locality.html',
                            locality=locality,
@@ -143,18 +151,21 @@ def locality_detail(slug):
 
 @public_bp.route('/api/enquiry', methods=['POST'])
 def log_enquiry():
-    data = request.get_json()
-    log = EnquiryLog(
-        property_id=data.get('property_id'),
-        action=data.get('action'),
-        visitor_ip=request.remote_addr
-    )
-    db.session.add(log)
-    db.session.commit()
+    data = request.get_json(silent=True) or {}
+    property_id = data.get('property_id')
+    action = data.get('action')
+    try:
+        property_id = int(property_id)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid data'}), 400
+    if action not in ENQUIRY_ACTIONS:
+        return jsonify({'error': 'Invalid data'}), 400
+
+    if not enquiry_queue.submit(property_id, action, request.remote_addr):
+        return jsonify({'error': 'Busy, try again'}), 503
     return jsonify({'status': 'ok'})
 
 
 @public_bp.route('/api/localities')
 def api_localities():
-    localities = db.session.query(Locality).order_by(Locality.zone, Locality.name).all()
-    return jsonify([{'id': l.id, 'name': l.name, 'zone': l.zone} for l in localities])
+    return jsonify([{'id': l.id, 'name': l.name, 'zone': l.zone} for l in locality_registry.all()])
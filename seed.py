@@ -1,3 +1,4 @@
+import json
 from extensions import db
 from models import Locality, User
 import re
@@ -281,6 +282,7 @@ def seed_sample_properties():
     ]
 
     for p_data in sample_properties:
+        p_data['amenities'] = json.loads(p_data['amenities'])
         prop = Property(**p_data)
         db.session.add(prop)
 
@@ -292,3 +294,22 @@ def seed_all():
     seed_localities()
     seed_admin()
     seed_sample_properties()
+
+
+def init_db():
+    """Bring the schema up to date, then seed; safe to run again.
+
+    An empty database gets every table straight from the models and is stamped
+    at the latest migration. One that already has tables, whether versioned or
+    created before the migrations existed, is migrated instead: the models may
+    carry columns only a migration adds, so nothing can query them first.
+    """
+    from flask_migrate import stamp, upgrade
+    from sqlalchemy import inspect
+
+    if inspect(db.engine).get_table_names():
+        upgrade()
+    else:
+        db.create_all()
+        stamp()
+    seed_all()
@@ -0,0 +1,170 @@
+"""Attach photos from a ZIP archive to properties created by the bulk importer.
+
+The bulk uploader commits the sheet's rows, stages the archive and queues a
+``bulk_images`` job, so the work below never runs inside a web request. The
+sheet's ``image_files`` column names the archive members for each row.
+Members are read one at a time straight out of the archive, never extracted
+to disk, and stored through ``services.image_store``. Photos already in the
+store, such as a brochure shot shared by a whole project, are not rendered
+again. New ones are rendered in a process pool of its own,
+``BULK_IMAGE_WORKERS`` processes for the length of the job, rather than in
+the job runner's shared pool. At most two renders per process are in flight,
+which keeps memory flat however large the archive is. The ``PropertyImage``
+rows are then written with chunked multi-row inserts.
+"""
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from flask import current_app
+from sqlalchemy import insert
+from extensions import db
+from helpers import IMAGE_EXTENSIONS, stage_upload
+from models import Property, PropertyImage
+from services.image_store import BlobWriter
+from services.jobs import job_runner
+from services.response_cache import response_cache
+
+CHUNK_SIZE = 1000
+HEARTBEAT_INTERVAL = 60  # seconds between pushes of the job's stale deadline
+
+
+def _property_ids(slugs):
+    ids = {}
+    slugs = list(slugs)
+    for start in range(0, len(slugs), CHUNK_SIZE):
+        chunk = slugs[start:start + CHUNK_SIZE]
+        ids.update(db.session.query(Property.slug, Property.id).filter(Property.slug.in_(chunk)).all())
+    return ids
+
+
+def _archive_members(archive):
+    """Map lower-cased base names to archive entries; folders inside the ZIP are ignored."""
+    members = {}
+    for info in archive.infolist():
+        if not info.is_dir():
+            members.setdefault(os.path.basename(info.filename).lower(), info)
+    return members
+
+
+def ingest_images(zip_file, rows, pool, workers, progress=None):
+    """Render and attach the photos listed in ``rows`` ((sheet row, slug, names)).
+
+    New photos are rendered in ``pool``, which runs ``workers`` processes;
+    ``progress`` is called after each photo is dealt with. Returns a summary
+    with per-photo problems as (sheet row, message).
+    """
+    started = time.perf_counter()
+    max_size = current_app.config['BULK_IMAGE_MAX_SIZE']
+    writer = BlobWriter(pool)
+    window = workers * 2
+
+    errors = []
+    records = []
+    pending = {}  # future -> [(sheet row, name, record)]; duplicates share a future
+
+    def collect(futures):
+        for future in futures:
+            for sheet_row, name, record in pending.pop(future):
+                try:
+                    record['renditions'] = json.dumps(future.result())
+                except Exception as e:
+                    errors.append((sheet_row, f'{name}: could not read image ({e})'))
+                    continue
+                records.append(record)
+            if progress is not None:
+                progress()
+
+    ids = _property_ids(slug for _, slug, _ in rows)
+    with zipfile.ZipFile(zip_file) as archive:
+        members = _archive_members(archive)
+        for sheet_row, slug, names in rows:
+            prop_id = ids.get(slug)
+            if prop_id is None:
+                continue
+            for sort_order, name in enumerate(names):
+                info = members.get(os.path.basename(name).lower())
+                if info is None:
+                    errors.append((sheet_row, f'{name} is not in the archive'))
+                    continue
+                if os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS:
+                    errors.append((sheet_row, f'{name} is not a JPG, PNG or WebP image'))
+                    continue
+                if info.file_size > max_size:
+                    errors.append((sheet_row, f'{name} is larger than {max_size // (1024 * 1024)} MB'))
+                    continue
+
+                filename, future = writer.submit(archive.read(info))
+                pending.setdefault(future, []).append((sheet_row, name, {
+                    'property_id': prop_id,
+                    'filename': filename,
+                    'is_primary': False,
+                    'sort_order': sort_order,
+                }))
+                if future.done():
+                    collect([future])
+                elif len(pending) >= window:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+        collect(list(pending))
+
+    # The first photo that made it in becomes the primary one
+    records.sort(key=lambda r: (r['property_id'], r['sort_order']))
+    seen = set()
+    for record in records:
+        if record['property_id'] not in seen:
+            record['is_primary'] = True
+            seen.add(record['property_id'])
+
+    writer.save()
+    for start in range(0, len(records), CHUNK_SIZE):
+        db.session.execute(insert(PropertyImage.__table__), records[start:start + CHUNK_SIZE])
+    db.session.commit()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'saved': len(records),
+        'failed': len(errors),
+        'rendered': writer.rendered,
+        'reused': writer.reused,
+        'errors': sorted(errors),
+        'workers': workers,
+        'seconds': elapsed,
+        'images_per_sec': len(records) / elapsed if elapsed else 0.0,
+    }
+
+
+def enqueue_bulk_images(zip_file, rows, user_id):
+    """Stage the uploaded archive and queue attaching its photos to ``rows``; returns the job."""
+    zip_file.stream.seek(0)  # zipfile.is_zipfile has read it
+    path = stage_upload(zip_file, extensions=('.zip',))
+    return job_runner.enqueue('bulk_images', {'path': path, 'rows': rows}, user_id=user_id)
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@job_runner.handler('bulk_images')
+def process_bulk_images(job, payload):
+    workers = current_app.config['BULK_IMAGE_WORKERS']
+    beat = [time.monotonic()]
+
+    def progress():
+        # Keeps a long archive from being taken for a dead worker's job and run twice
+        if time.monotonic() - beat[0] >= HEARTBEAT_INTERVAL:
+            job_runner.heartbeat(job.id)
+            beat[0] = time.monotonic()
+
+    try:
+        with job_runner.process_pool(workers) as pool:
+            result = ingest_images(payload['path'], payload['rows'], pool, workers, progress)
+    finally:
+        _discard(payload['path'])
+    # The rows go in through Core inserts, which bypass the ORM change hooks
+    response_cache.bump_version()
+    return result
@@ -0,0 +1,78 @@
+"""Batched loading of the data every property card needs.
+
+Listing pages render a card per property, and each card touches
+``primary_image`` and ``locality``. Loading those lazily costs two or three
+queries per card; ``load_cards`` fetches them for the whole page in one
+query each so the query count no longer depends on page size.
+``serialize_property_card`` is the JSON shape of a card used by the API;
+its ``image`` is the smallest rendition that fills a card, in the preferred
+format, with every format listed under ``image_sources``.
+"""
+from flask import current_app
+from sqlalchemy.orm.attributes import set_committed_value
+from extensions import db
+from models import Locality, PropertyImage
+
+
+def load_cards(properties):
+    """Preload images and localities for a list of properties, return it."""
+    properties = [p for p in properties if p is not None]
+    if not properties:
+        return properties
+
+    prop_ids = [p.id for p in properties]
+    images = {pid: [] for pid in prop_ids}
+    rows = db.session.query(PropertyImage).filter(
+        PropertyImage.property_id.in_(prop_ids)
+    ).order_by(PropertyImage.property_id, PropertyImage.sort_order, PropertyImage.id).all()
+    for img in rows:
+        images[img.property_id].append(img)
+
+    loc_ids = {p.locality_id for p in properties if p.locality_id}
+    localities = {}
+    if loc_ids:
+        localities = {
+            loc.id: loc
+            for loc in db.session.query(Locality).filter(Locality.id.in_(loc_ids)).all()
+        }
+
+    for prop in properties:
+        prop._preloaded_images = images[prop.id]
+        set_committed_value(prop, 'locality', localities.get(prop.locality_id))
+
+    return properties
+
+
+def image_sources(img, width):
+    """URL of the smallest rendition of ``img`` that fills ``width``, per format."""
+    return {fmt: f'/static/{img.path(width, fmt)}' for fmt in img.formats}
+
+
+def serialize_property_card(prop):
+    """Minimal property data for list/card views."""
+    primary = prop.primary_image
+    sources = image_sources(primary, current_app.config['CARD_IMAGE_WIDTH']) if primary else {}
+    locality = prop.locality
+    return {
+        'id': prop.id,
+        'title': prop.title,
+        'slug': prop.slug,
+        'property_type': prop.property_type,
+        'listing_type': prop.listing_type,
+        'price': prop.price,
+        'price_unit': prop.price_unit,
+        'price_inr': prop.price_inr,
+        'formatted_price': prop.formatted_price,
+        'bhk': prop.bhk,
+        'area_sqft': prop.area_sqft,
+        'carpet_area': prop.carpet_area,
+        'furnished': prop.furnished,
+        'locality': locality.name if locality else None,
+        'zone': locality.zone if locality else None,
+        'locality_id': prop.locality_id,
+        'image': sources[primary.formats[0]] if primary else None,
+        'image_sources': sources,
+        'is_featured': prop.is_featured,
+        'views_count': prop.views_count,
+        'created_at': prop.created_at.isoformat() if prop.created_at else None,
+    }
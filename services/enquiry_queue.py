@@ -0,0 +1,151 @@
+"""Batched, asynchronous ingestion of enquiry (phone/WhatsApp) clicks.
+
+The enquiry endpoints hand events to ``enquiry_queue.submit`` and return
+without touching the database. A per-worker background thread drains the
+bounded buffer in micro-batches of up to ``ENQUIRY_BATCH_SIZE`` rows, written
+with a single multi-row ``INSERT``. When the buffer is full the submitting
+request first flushes a batch itself (backpressure); only if there is still
+no room is the event dropped. A batch that cannot be written is logged and
+counted as failed, never raised to the request. Remaining events are flushed
+at exit.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import EnquiryLog, Property
+
+log = logging.getLogger(__name__)
+
+ACTIONS = ('phone_click', 'whatsapp_click')
+
+
+class EnquiryQueue:
+
+    def __init__(self):
+        self.app = None
+        self._queue = queue.Queue()
+        self._thread_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self.batch_size = 500
+        self.interval = 2.0
+        self.stats = {'accepted': 0, 'flushed': 0, 'dropped': 0, 'failed': 0}
+
+    def init_app(self, app):
+        self.app = app
+        self._queue = queue.Queue(maxsize=app.config.get('ENQUIRY_QUEUE_SIZE', 10000))
+        self.batch_size = app.config.get('ENQUIRY_BATCH_SIZE', 500)
+        self.interval = app.config.get('ENQUIRY_FLUSH_INTERVAL', 2.0)
+        atexit.register(self.drain)
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def report(self):
+        with self._stats_lock:
+            return dict(self.stats, queued=self._queue.qsize(), capacity=self._queue.maxsize)
+
+    def submit(self, property_id, action, visitor_ip):
+        """Queue one click; returns False if it had to be dropped."""
+        event = {
+            'property_id': property_id,
+            'action': action,
+            'visitor_ip': visitor_ip,
+            'created_at': datetime.utcnow(),
+        }
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.flush()
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._count('dropped')
+                return False
+        self._count('accepted')
+        return True
+
+    def _take_batch(self, block):
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.interval) if block else self._queue.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def flush(self, block=False):
+        """Insert one batch; returns the number of rows written."""
+        batch = self._take_batch(block)
+        if not batch or self.app is None:
+            return 0
+        with self.app.app_context():
+            try:
+                self._insert(batch)
+            except IntegrityError:
+                # A click on a since-deleted listing: retry without those
+                try:
+                    batch = self._existing_only(batch)
+                    self._insert(batch)
+                except Exception:
+                    return self._failed(batch)
+            except Exception:
+                return self._failed(batch)
+        self._count('flushed', len(batch))
+        return len(batch)
+
+    def _failed(self, batch):
+        log.exception('Failed to write %d enquiry events', len(batch))
+        self._count('failed', len(batch))
+        return 0
+
+    def drain(self):
+        """Flush batches until the buffer is empty, written or not."""
+        while not self._queue.empty():
+            self.flush()
+
+    def _insert(self, batch):
+        if batch:
+            with db.engine.begin() as conn:
+                conn.execute(insert(EnquiryLog.__table__), batch)
+
+    def _existing_only(self, batch):
+        ids = {e['property_id'] for e in batch}
+        with db.engine.connect() as conn:
+            existing = {row[0] for row in conn.execute(
+                db.select(Property.id).where(Property.id.in_(ids))
+            )}
+        kept = [e for e in batch if e['property_id'] in existing]
+        self._count('failed', len(batch) - len(kept))
+        return kept
+
+    def _ensure_thread(self):
+        # Started lazily so that each forked gunicorn worker gets its own thread
+        if self._thread_pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread_pid == os.getpid() and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='enquiry-flush', daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.flush(block=True)
+            except Exception:
+                log.exception('Enquiry flush loop error')
+
+
+enquiry_queue = EnquiryQueue()
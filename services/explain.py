@@ -0,0 +1,65 @@
+"""EXPLAIN-based check that the hot listing queries are served by indexes.
+
+Run with ``flask explain-queries``. On Postgres sequential scans are disabled
+for the check so that tiny development tables still report whether an index
+*can* serve the query; on SQLite ``EXPLAIN QUERY PLAN`` is inspected for full
+table scans.
+"""
+import json
+from sqlalchemy import text
+from extensions import db
+from models import Property, EnquiryLog
+
+
+def hot_queries():
+    """Representative queries from routes/public.py, routes/api.py and the dashboards."""
+    live = db.session.query(Property).filter_by(is_approved=True, status='active')
+    return {
+        'home featured': live.filter_by(is_featured=True).order_by(Property.created_at.desc()).limit(8),
+        'listing newest': live.order_by(Property.created_at.desc()).limit(12),
+        'listing price_low': live.order_by(Property.price_inr.asc()).limit(12),
+        'listing price_high': live.order_by(Property.price_inr.desc()).limit(12),
+        'listing area': live.order_by(Property.area_sqft.desc()).limit(12),
+        'listing by type': live.filter_by(listing_type='buy', property_type='flat')
+                               .order_by(Property.created_at.desc()).limit(12),
+        'listing by locality': live.filter_by(locality_id=1).order_by(Property.created_at.desc()).limit(12),
+        'listing by bhk': live.filter(Property.bhk.in_([2, 3])).order_by(Property.price_inr.asc()).limit(12),
+        'similar': live.filter(Property.locality_id == 1).order_by(Property.views_count.desc()).limit(6),
+        'agent properties': db.session.query(Property).filter_by(user_id=1)
+                                .order_by(Property.created_at.desc()).limit(10),
+        'property enquiries': db.session.query(EnquiryLog).filter_by(property_id=1, action='phone_click'),
+    }
+
+
+def _compile(query):
+    return str(query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+
+
+def _postgres_seq_scans(plan):
+    scans = []
+    if plan.get('Node Type') == 'Seq Scan':
+        scans.append(plan.get('Relation Name'))
+    for child in plan.get('Plans', []):
+        scans.extend(_postgres_seq_scans(child))
+    return scans
+
+
+def explain_query(query):
+    """Return ``(plan_text, full_scans)`` for a query on the current engine."""
+    sql = _compile(query)
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text('SET LOCAL enable_seqscan = off'))
+        raw = db.session.execute(text('EXPLAIN (FORMAT JSON) ' + sql)).scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]['Plan']
+        db.session.rollback()
+        return json.dumps(plan, indent=1), _postgres_seq_scans(plan)
+
+    rows = db.session.execute(text('EXPLAIN QUERY PLAN ' + sql)).all()
+    details = [row[-1] for row in rows]
+    scans = [d.split()[1] for d in details if d.startswith('SCAN ') and ' USING ' not in d]
+    return '\n'.join(details), scans
+
+
+def check_indexes():
+    """Explain every hot query, return ``{name: (plan_text, full_scans)}``."""
+    return {name: explain_query(q) for name, q in hot_queries().items()}
@@ -0,0 +1,126 @@
+"""Facet counts for the listing filters, computed in one aggregated query.
+
+The live listings matching the filters that are not facets (locality,
+amenities, search text) are grouped by every facet column at once: listing
+type, property type, BHK, furnishing, zone and price bucket, plus whether the
+row falls inside the requested price range. That gives at most a few
+thousand groups, which are folded into the per-facet counts in Python.
+
+Counts are disjunctive: each facet is counted with the other facets'
+selections applied but not its own, so the sidebar can show what choosing a
+different value would return.
+"""
+from collections import Counter
+from sqlalchemy import and_, case, func, literal
+from extensions import db
+from models import Locality, Property
+
+FACETS = ('listing_type', 'property_type', 'bhk', 'furnished', 'zone', 'price')
+
+# (label, min rupees, max rupees exclusive) per listing type
+PRICE_BUCKETS = {
+    'buy': [
+        ('Under ₹50 L', 0, 5000000),
+        ('₹50 L – 1 Cr', 5000000, 10000000),
+        ('₹1 – 2 Cr', 10000000, 20000000),
+        ('₹2 – 5 Cr', 20000000, 50000000),
+        ('₹5 Cr+', 50000000, None),
+    ],
+    'rent': [
+        ('Under ₹25k', 0, 25000),
+        ('₹25k – 50k', 25000, 50000),
+        ('₹50k – 1 L', 50000, 100000),
+        ('₹1 L+', 100000, None),
+    ],
+}
+
+
+def requested_amenities(args):
+    """Names from ``amenities=Gym,Swimming Pool`` (or repeated); listings must have all of them."""
+    return [a.strip() for value in args.getlist('amenities') for a in value.split(',') if a.strip()]
+
+
+def selected_facets(args):
+    """The facet values chosen in request ``args`` (comma-separated or repeated)."""
+    selected = {}
+    for name in ('listing_type', 'property_type', 'furnished', 'zone'):
+        values = {v.strip() for value in args.getlist(name) for v in value.split(',') if v.strip()}
+        if values:
+            selected[name] = values
+    bhk = {int(b) for value in args.getlist('bhk') for b in value.split(',') if b.strip().isdigit()}
+    if bhk:
+        selected['bhk'] = bhk
+    return selected
+
+
+def _price_bucket():
+    whens = []
+    for listing_type, buckets in PRICE_BUCKETS.items():
+        for i, (_, low, high) in enumerate(buckets):
+            if high is not None:
+                whens.append(((Property.listing_type == listing_type) & (Property.price_inr < high), i))
+        whens.append((Property.listing_type == listing_type, len(buckets) - 1))
+    return case(*whens, else_=None)
+
+
+def facet_counts(query, selected, min_price=None, max_price=None):
+    """Count live listings per facet value.
+
+    ``query`` is a Property query with the non-facet filters applied,
+    ``selected`` comes from ``selected_facets`` and the price range is in
+    rupees.
+    """
+    bounds = []
+    if min_price is not None:
+        bounds.append(Property.price_inr >= min_price)
+    if max_price is not None:
+        bounds.append(Property.price_inr <= max_price)
+    in_range = case((and_(*bounds), 1), else_=0) if bounds else literal(1)
+
+    listings = query.outerjoin(Locality, Property.locality_id == Locality.id).order_by(None).with_entities(
+        Property.listing_type, Property.property_type, Property.bhk, Property.furnished, Locality.zone,
+        _price_bucket().label('price_bucket'), in_range.label('in_range'),
+    ).subquery()
+    columns = list(listings.c)
+    rows = db.session.query(*columns, func.count()).group_by(*columns).all()
+
+    counts = {name: Counter() for name in FACETS}
+    total = 0
+    for listing_type, property_type, bhk, furnished, zone, bucket, inside, count in rows:
+        values = {'listing_type': listing_type, 'property_type': property_type, 'bhk': bhk,
+                  'furnished': furnished, 'zone': zone}
+        matches = {name: name not in selected or value in selected[name] for name, value in values.items()}
+        matches['price'] = bool(inside)
+        values['price'] = (listing_type, bucket)
+        misses = [name for name, ok in matches.items() if not ok]
+        if not misses:
+            total += count
+        if len(misses) <= 1:
+            # A row missing only facet X still counts towards X's other values
+            for name in (misses or FACETS):
+                counts[name][values[name]] += count
+
+    return {
+        'total': total,
+        'facets': {
+            'listing_type': _values(counts['listing_type']),
+            'property_type': _values(counts['property_type']),
+            'bhk': sorted(_values(counts['bhk']), key=lambda v: v['value']),
+            'furnished': _values(counts['furnished']),
+            'zone': _values(counts['zone']),
+            'price': _price_values(counts['price'], selected.get('listing_type') or PRICE_BUCKETS),
+        },
+    }
+
+
+def _values(counter):
+    return [{'value': value, 'count': count} for value, count in counter.most_common() if value is not None]
+
+
+def _price_values(counter, listing_types):
+    return [
+        {'listing_type': listing_type, 'label': label, 'min_inr': low, 'max_inr': high,
+         'count': counter[(listing_type, i)]}
+        for listing_type in PRICE_BUCKETS if listing_type in listing_types
+        for i, (label, low, high) in enumerate(PRICE_BUCKETS[listing_type])
+    ]
@@ -0,0 +1,121 @@
+"""Cached listing counts for the web and API home screens.
+
+Every count comes from one round trip: a ``UNION ALL`` of the live listings
+grouped by zone, listing type and property type, the localities grouped by
+zone and the approved agents, rolled up in Python. The result is cached per
+process for ``HOME_STATS_TTL`` seconds and dropped as soon as a commit
+touches anything that changes a count (a listing's status, approval, type
+or locality; a locality; an agent's approval). A flush only notes the change
+in ``session.info``, so nobody recomputes from data that is not committed
+yet, and a result computed while an invalidation landed is not cached.
+"""
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event, func, inspect, literal_column, null, select, union_all
+from sqlalchemy.orm import Session
+from extensions import db
+from models import Locality, Property, User
+
+_COUNTED_FIELDS = {
+    Property: ('status', 'is_approved', 'listing_type', 'property_type', 'locality_id'),
+    User: ('role', 'is_approved'),
+    Locality: ('zone',),
+}
+
+_lock = threading.Lock()
+_cache = {'stats': None, 'expires': 0.0, 'generation': 0}
+
+
+def compute_home_stats():
+    listings = select(
+        literal_column("'listings'").label('kind'), Locality.zone, Property.listing_type, Property.property_type,
+        func.count(Property.id),
+    ).outerjoin(Locality, Property.locality_id == Locality.id).where(
+        Property.is_approved == True, Property.status == 'active'
+    ).group_by(Locality.zone, Property.listing_type, Property.property_type)
+    localities = select(
+        literal_column("'localities'"), Locality.zone, null(), null(), func.count(Locality.id),
+    ).group_by(Locality.zone)
+    agents = select(
+        literal_column("'agents'"), null(), null(), null(), func.count(User.id),
+    ).where(User.role.in_(['agent', 'broker']), User.is_approved == True)
+    rows = db.session.execute(union_all(listings, localities, agents)).all()
+
+    by_zone = {zone: 0 for kind, zone, _, _, _ in rows if kind == 'localities'}
+    by_listing_type = {}
+    by_property_type = {}
+    total = total_localities = total_agents = 0
+    for kind, zone, listing_type, property_type, count in rows:
+        if kind == 'localities':
+            total_localities += count
+            continue
+        if kind == 'agents':
+            total_agents = count
+            continue
+        total += count
+        if zone is not None:
+            by_zone[zone] = by_zone.get(zone, 0) + count
+        by_listing_type[listing_type] = by_listing_type.get(listing_type, 0) + count
+        by_property_type[property_type] = by_property_type.get(property_type, 0) + count
+
+    return {
+        'total_properties': total,
+        'by_zone': dict(sorted(by_zone.items())),
+        'by_listing_type': by_listing_type,
+        'by_property_type': dict(sorted(by_property_type.items())),
+        'total_localities': total_localities,
+        'total_agents': total_agents,
+    }
+
+
+def get_home_stats():
+    now = time.monotonic()
+    stats = _cache['stats']
+    if stats is not None and now < _cache['expires']:
+        return stats
+    generation = _cache['generation']
+    stats = compute_home_stats()
+    with _lock:
+        # Invalidated while computing: the counts may predate that commit
+        if _cache['generation'] == generation:
+            _cache['stats'] = stats
+            _cache['expires'] = now + current_app.config.get('HOME_STATS_TTL', 60)
+    return stats
+
+
+def invalidate():
+    with _lock:
+        _cache['stats'] = None
+        _cache['generation'] += 1
+
+
+def _touches_counts(obj, dirty):
+    fields = _COUNTED_FIELDS.get(type(obj))
+    if fields is None:
+        return False
+    if not dirty:
+        return True
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in fields)
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_changes(session, flush_context):
+    if session.info.get('home_stats_dirty'):
+        return
+    if any(_touches_counts(obj, False) for obj in session.new) or \
+            any(_touches_counts(obj, False) for obj in session.deleted) or \
+            any(_touches_counts(obj, True) for obj in session.dirty):
+        session.info['home_stats_dirty'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    if session.info.pop('home_stats_dirty', False):
+        invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_on_rollback(session):
+    session.info.pop('home_stats_dirty', None)
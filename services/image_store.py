@@ -0,0 +1,174 @@
+"""Content-addressed storage for property photos.
+
+A photo's renditions are stored under ``<rendition>/<ab>/<sha256>.<ext>``.
+The hash covers the uploaded bytes and the rendition settings. Every
+``PropertyImage`` of the same upload points at the same files, and an
+``image_blobs`` row records what was written. So when brokers re-upload the
+same brochure photo across 30 listings, it is decoded and encoded once;
+later uploads only insert a ``PropertyImage`` row.
+
+Deleting a listing or a photo never removes shared files. Instead,
+``collect_garbage`` (``flask gc-images``) removes blobs that no
+``PropertyImage`` references any more and that have not been used for
+``IMAGE_GC_GRACE`` seconds. An upload that reuses a blob marks it used at
+once, in a transaction of its own, and only reuses it if its files are all
+there; the sweep deletes a blob's row, re-checking both conditions, before
+touching its files. So the grace period covers an upload that found a blob
+but has not committed its ``PropertyImage`` yet. The same sweep removes
+profile photos no user points at.
+"""
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, exists, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from extensions import db
+from helpers import OUTPUT_FORMATS, image_settings, render_property_image
+from models import ImageBlob, PropertyImage, User
+from services.jobs import job_runner
+
+
+def _insert_ignoring_duplicates(table, rows):
+    # Two workers can render the same new photo at once; the files are identical
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        stmt = postgresql.insert(table).on_conflict_do_nothing()
+    elif dialect == 'sqlite':
+        stmt = sqlite.insert(table).on_conflict_do_nothing()
+    else:
+        stmt = insert(table)
+    db.session.execute(stmt, rows)
+
+
+class BlobWriter:
+    """Render uploads into the store, once per distinct content.
+
+    ``submit`` returns the blob's filename and a future for its renditions.
+    Content already in the store, or already submitted to this writer,
+    resolves at once without touching the process pool. Call ``save`` once
+    the futures are done to record new blobs; the caller commits.
+    """
+
+    def __init__(self, pool=None):
+        self.pool = pool  # the job runner's shared pool unless given one
+        self.settings = image_settings()
+        self.upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'properties')
+        self._salt = json.dumps(self.settings, sort_keys=True).encode()
+        self._blobs = {}  # filename -> (future, source size, already stored)
+        self.rendered = 0
+        self.reused = 0
+
+    def filename_for(self, data):
+        digest = hashlib.sha256(self._salt + data).hexdigest()
+        return f'{digest[:2]}/{digest}'
+
+    def submit(self, data):
+        filename = self.filename_for(data)
+        if filename in self._blobs:
+            self.reused += 1
+            return filename, self._blobs[filename][0]
+
+        blob = db.session.get(ImageBlob, filename)
+        if blob is not None and not self._reuse(blob):
+            blob = None  # collected meanwhile: render it again
+        if blob is not None:
+            future = Future()
+            future.set_result(blob.renditions)
+            self.reused += 1
+        else:
+            future = (self.pool or job_runner.pool).submit(render_property_image, io.BytesIO(data),
+                                            self.upload_dir, filename, **self.settings)
+            self.rendered += 1
+        self._blobs[filename] = (future, len(data), blob is not None)
+        return filename, future
+
+    def _reuse(self, blob):
+        """Mark ``blob`` used now, so ``collect_garbage`` keeps it, if it is still whole."""
+        with db.engine.begin() as conn:
+            touched = conn.execute(update(ImageBlob.__table__).where(
+                ImageBlob.__table__.c.filename == blob.filename,
+            ).values(last_used_at=datetime.utcnow())).rowcount
+        return touched and all(os.path.exists(path) for path in _blob_paths(self.upload_dir, blob))
+
+    def save(self):
+        now = datetime.utcnow()
+        new_rows, used = [], []
+        for filename, (future, size, stored) in self._blobs.items():
+            if not future.done() or future.exception() is not None:
+                continue
+            if stored:
+                used.append(filename)
+            else:
+                new_rows.append({
+                    'filename': filename,
+                    'renditions': json.dumps(future.result()),
+                    'source_bytes': size,
+                    'created_at': now,
+                    'last_used_at': now,
+                })
+        if new_rows:
+            _insert_ignoring_duplicates(ImageBlob.__table__, new_rows)
+        if used:
+            db.session.query(ImageBlob).filter(ImageBlob.filename.in_(used)).update(
+                {'last_used_at': now}, synchronize_session=False)
+
+
+def _blob_paths(upload_dir, blob):
+    renditions = blob.renditions
+    return [
+        os.path.join(upload_dir, name, f'{blob.filename}.{OUTPUT_FORMATS[fmt][1]}')
+        for name in renditions['sizes'] for fmt in renditions['formats']
+    ]
+
+
+def _remove(path, dry_run):
+    try:
+        size = os.path.getsize(path)
+        if not dry_run:
+            os.remove(path)
+    except FileNotFoundError:
+        return 0, 0
+    return 1, size
+
+
+def collect_garbage(grace=None, dry_run=False):
+    """Remove unreferenced photo blobs and profile photos; returns what was (or would be) freed."""
+    if grace is None:
+        grace = current_app.config['IMAGE_GC_GRACE']
+    cutoff = datetime.utcnow() - timedelta(seconds=grace)
+    upload_root = current_app.config['UPLOAD_FOLDER']
+    report = {'blobs': 0, 'files': 0, 'bytes': 0}
+
+    upload_dir = os.path.join(upload_root, 'properties')
+    orphaned = [ImageBlob.last_used_at < cutoff, ~exists().where(PropertyImage.filename == ImageBlob.filename)]
+    orphans = [(blob.filename, _blob_paths(upload_dir, blob))
+               for blob in db.session.query(ImageBlob).filter(*orphaned).all()]
+    for filename, paths in orphans:
+        if not dry_run:
+            # Re-checked in the delete: an upload may have reused the blob since the query
+            deleted = db.session.execute(delete(ImageBlob).where(
+                ImageBlob.filename == filename, *orphaned,
+            ).execution_options(synchronize_session=False)).rowcount
+            db.session.commit()
+            if not deleted:
+                continue
+        for path in paths:
+            files, size = _remove(path, dry_run)
+            report['files'] += files
+            report['bytes'] += size
+        report['blobs'] += 1
+
+    users_dir = os.path.join(upload_root, 'users')
+    if os.path.isdir(users_dir):
+        in_use = {photo for (photo,) in db.session.query(User.photo).filter(User.photo.isnot(None))}
+        for entry in os.scandir(users_dir):
+            if entry.is_file() and entry.name not in in_use and \
+                    datetime.utcfromtimestamp(entry.stat().st_mtime) < cutoff:
+                files, size = _remove(entry.path, dry_run)
+                report['files'] += files
+                report['bytes'] += size
+    return report
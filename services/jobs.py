@@ -0,0 +1,195 @@
+"""Database-backed background job runner.
+
+Routes call ``job_runner.enqueue(kind, payload)``, which only inserts a row
+in ``jobs``. Each gunicorn worker runs a dispatcher thread that claims queued
+jobs with a conditional ``UPDATE`` (so a job runs once even with several
+workers polling) and runs the handler registered for its kind. Handlers push
+CPU-heavy work into a process pool of ``JOB_WORKERS`` processes and do the
+database bookkeeping themselves once the results are back.
+
+A job left ``running`` for longer than ``JOB_STALE_AFTER`` seconds (its
+worker died) is claimed again, up to ``JOB_MAX_ATTEMPTS`` times. Handlers
+that can outlast that call ``job_runner.heartbeat`` as they go.
+
+``job_runner.schedule(kind, every)`` makes the dispatchers queue a job of
+that kind every ``every`` seconds. Each checks at that interval and skips it
+if one is already queued or running, or finished within the interval, so
+several workers still queue about one job per interval between them.
+"""
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import and_, insert, or_, update
+from extensions import db
+from models import Job
+
+log = logging.getLogger(__name__)
+
+
+class JobRunner:
+
+    def __init__(self):
+        self.app = None
+        self.handlers = {}
+        self.schedules = {}
+        self._next_check = {}
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pool = None
+        self._pid = None
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config.get('JOB_WORKERS') or 1
+        self.poll_interval = app.config.get('JOB_POLL_INTERVAL', 2.0)
+        self.stale_after = app.config.get('JOB_STALE_AFTER', 600)
+        self.max_attempts = app.config.get('JOB_MAX_ATTEMPTS', 3)
+        app.before_request(self.ensure_started)
+        atexit.register(self.shutdown)
+
+    def handler(self, kind):
+        def register(func):
+            self.handlers[kind] = func
+            return func
+        return register
+
+    def schedule(self, kind, every, payload=None):
+        """Queue a ``kind`` job every ``every`` seconds from the dispatcher."""
+        self.schedules[kind] = (every, payload or {})
+
+    def enqueue(self, kind, payload, user_id=None, property_id=None):
+        job = Job(kind=kind, status='queued', user_id=user_id, property_id=property_id)
+        job.payload = payload
+        db.session.add(job)
+        db.session.commit()
+        self._wake.set()
+        return job
+
+    def enqueue_batch(self, kind, items):
+        """Queue one job per (payload, property_id) in ``items`` on a connection of its own.
+
+        Usable from session event hooks, where the session itself cannot be.
+        """
+        now = datetime.utcnow()
+        with db.engine.begin() as conn:
+            conn.execute(insert(Job.__table__), [
+                {'kind': kind, 'status': 'queued', 'payload': json.dumps(payload),
+                 'property_id': property_id, 'attempts': 0, 'created_at': now}
+                for payload, property_id in items
+            ])
+        self._wake.set()
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = self.process_pool(self.workers)
+        return self._pool
+
+    def process_pool(self, workers):
+        """A new pool of ``workers`` processes, for a handler that needs one of its own."""
+        # spawn, not fork: gunicorn workers are multi-threaded by now
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def ensure_started(self):
+        # One dispatcher per worker process, started after gunicorn forks
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pool = None
+            self._thread = threading.Thread(target=self._run, name='job-dispatcher', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def shutdown(self):
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _claimable(self):
+        stale = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        return or_(Job.status == 'queued', and_(Job.status == 'running', Job.started_at < stale))
+
+    def claim(self):
+        """Atomically take the oldest runnable job, or return None."""
+        while True:
+            job_id = db.session.query(Job.id).filter(self._claimable()).order_by(Job.id).limit(1).scalar()
+            if job_id is None:
+                return None
+            claimed = db.session.query(Job).filter(Job.id == job_id, self._claimable()).update({
+                'status': 'running',
+                'started_at': datetime.utcnow(),
+                'attempts': Job.attempts + 1,
+            }, synchronize_session=False)
+            db.session.commit()
+            if claimed:
+                return db.session.get(Job, job_id)
+
+    def heartbeat(self, job_id):
+        """Restart a running job's ``JOB_STALE_AFTER`` clock, so a long one is not claimed again."""
+        with db.engine.begin() as conn:
+            conn.execute(update(Job.__table__).where(
+                Job.__table__.c.id == job_id, Job.__table__.c.status == 'running',
+            ).values(started_at=datetime.utcnow()))
+
+    def run_next(self):
+        """Run one job to completion; returns False if there was nothing to do."""
+        job = self.claim()
+        if job is None:
+            return False
+
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f'No handler for job kind {job.kind!r}')
+            if (job.attempts or 0) > self.max_attempts:
+                raise RuntimeError('Too many attempts')
+            result = handler(job, job.payload)
+        except Exception as e:
+            log.exception('Job %s (%s) failed', job.id, job.kind)
+            db.session.rollback()
+            job = db.session.get(Job, job.id)
+            job.status = 'failed'
+            job.error = str(e)
+        else:
+            job.status = 'done'
+            job.result = result
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return True
+
+    def enqueue_due(self):
+        """Queue the scheduled jobs that are due."""
+        now = time.monotonic()
+        for kind, (every, payload) in self.schedules.items():
+            if self._next_check.get(kind, 0) > now:
+                continue
+            self._next_check[kind] = now + every
+            latest = db.session.query(Job.status, Job.finished_at).filter(Job.kind == kind).order_by(
+                Job.id.desc()).first()
+            since = datetime.utcnow() - timedelta(seconds=every)
+            if latest is None or (latest.status in ('done', 'failed') and latest.finished_at < since):
+                self.enqueue(kind, payload)
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self.enqueue_due()
+                    ran = self.run_next()
+            except Exception:
+                log.exception('Job dispatcher error')
+                ran = False
+            if not ran:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+
+job_runner = JobRunner()
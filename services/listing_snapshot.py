@@ -0,0 +1,239 @@
+"""Optional in-memory columnar snapshot of the live listings.
+
+With ``LISTING_SNAPSHOT`` on, each worker keeps the filter and sort columns
+of the approved, active listings in NumPy arrays. ``api.properties_list``
+then evaluates its filters as boolean masks and its sort with a partial
+argsort, and only loads the rows of the requested page from SQL. Requests
+with search text or a cursor still go to SQL, as does everything while the
+snapshot is off.
+
+Commits that touch a listing add a row to ``listing_changes``; a NULL
+``property_id`` asks for a full reload (bulk imports, locality edits). Each
+worker reads the rows it has not seen at most every ``LISTING_SNAPSHOT_POLL``
+seconds and swaps the changed listings into its arrays, without writing
+anything. A ``listing_changes_prune`` job, scheduled every
+``LISTING_SNAPSHOT_PRUNE_INTERVAL`` seconds, deletes rows older than
+``LISTING_SNAPSHOT_KEEP`` seconds, so a worker that has not polled for that
+long reloads from scratch.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import delete, event, func, inspect, insert, select
+from sqlalchemy.orm import Session
+from extensions import db
+from models import ListingChange, Locality, Property, amenity_bits
+from services.jobs import job_runner
+
+CATEGORIES = ('listing_type', 'property_type', 'furnished', 'zone')
+
+# Columns whose changes never affect the snapshot
+_IGNORED_FIELDS = {'views_count'}
+
+
+def _load(ids=None):
+    query = select(
+        Property.id, Property.listing_type, Property.property_type, Property.furnished, Locality.zone,
+        Property.bhk, Property.price_inr, Property.area_sqft, Property.locality_id, Property.amenity_bits,
+        Property.created_at,
+    ).outerjoin(Locality, Property.locality_id == Locality.id).where(
+        Property.is_approved == True, Property.status == 'active',
+    )
+    if ids is not None:
+        query = query.where(Property.id.in_(ids))
+    return db.session.execute(query).all()
+
+
+class ListingSnapshot:
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._snapshot = None  # (column arrays, category value -> code), swapped together
+        self._last_change = 0
+        self._polled_at = 0.0
+
+    def init_app(self, app):
+        self.enabled = app.config.get('LISTING_SNAPSHOT', False)
+        self.poll_interval = app.config.get('LISTING_SNAPSHOT_POLL', 1.0)
+        self.keep = app.config.get('LISTING_SNAPSHOT_KEEP', 3600)
+
+    def __len__(self):
+        return 0 if self._snapshot is None else len(self._snapshot[0]['id'])
+
+    @staticmethod
+    def _arrays(rows, codes):
+        def encode(name, values):
+            known = codes[name]
+            return np.array([-1 if v is None else known.setdefault(v, len(known)) for v in values], dtype=np.int16)
+
+        (ids, listing_type, property_type, furnished, zone, bhk, price, area, locality_id, amenities,
+         created_at) = zip(*rows) if rows else [()] * 11
+        created = np.array(created_at, dtype='datetime64[us]')
+        created_seconds = created.astype(np.int64) / 1e6
+        created_seconds[np.isnat(created)] = np.nan
+        return {
+            'id': np.array(ids, dtype=np.int64),
+            'listing_type': encode('listing_type', listing_type),
+            'property_type': encode('property_type', property_type),
+            'furnished': encode('furnished', furnished),
+            'zone': encode('zone', zone),
+            'bhk': np.array([-1 if v is None else v for v in bhk], dtype=np.int16),
+            'price_inr': np.array(price, dtype=np.float64),
+            'area_sqft': np.array(area, dtype=np.float64),
+            'locality_id': np.array([-1 if v is None else v for v in locality_id], dtype=np.int32),
+            'amenity_bits': np.array([v or 0 for v in amenities], dtype=np.int64),
+            'created_at': created_seconds,
+        }
+
+    def rebuild(self):
+        """Reload every live listing; returns how many there are."""
+        # Read the position first: changes committed meanwhile are applied again, harmlessly
+        last_change = db.session.query(func.max(ListingChange.id)).scalar() or 0
+        codes = {name: {} for name in CATEGORIES}
+        self._snapshot = (self._arrays(_load(), codes), codes)
+        self._last_change = last_change
+        self._polled_at = time.monotonic()
+        return len(self)
+
+    def _apply_changes(self):
+        rows = db.session.query(ListingChange.id, ListingChange.property_id).filter(
+            ListingChange.id > self._last_change
+        ).order_by(ListingChange.id).all()
+        self._polled_at = time.monotonic()
+        if not rows:
+            return
+
+        changed = {property_id for _, property_id in rows}
+        if None in changed:
+            self.rebuild()
+            return
+        data, codes = self._snapshot
+        fresh = self._arrays(_load(sorted(changed)), codes)
+        kept = ~np.isin(data['id'], list(changed))
+        self._snapshot = ({name: np.concatenate([column[kept], fresh[name]]) for name, column in data.items()}, codes)
+        self._last_change = rows[-1].id
+
+    def refresh(self):
+        """Bring the snapshot up to date if it is due a poll."""
+        since = time.monotonic() - self._polled_at
+        if self._snapshot is not None and since < self.poll_interval:
+            return
+        # While one thread refreshes, the others keep reading the current arrays
+        if not self._lock.acquire(blocking=self._snapshot is None):
+            return
+        try:
+            if self._snapshot is None or since > self.keep:
+                self.rebuild()
+            elif time.monotonic() - self._polled_at >= self.poll_interval:
+                self._apply_changes()
+        finally:
+            self._lock.release()
+
+    def select(self, filters, sort, offset, limit):
+        """Return (ids of one page, total matches) for ``filters`` as ``api.requested_filters`` builds them."""
+        self.refresh()
+        data, codes = self._snapshot
+        mask = np.ones(len(data['id']), dtype=bool)
+        for name in CATEGORIES:
+            if filters.get(name):
+                mask &= np.isin(data[name], [codes[name].get(value, -2) for value in filters[name]])
+        if filters.get('locality_id'):
+            mask &= data['locality_id'] == filters['locality_id']
+        if filters.get('bhk'):
+            mask &= np.logical_or.reduce([data['bhk'] == bhk for bhk in filters['bhk']])
+        if filters.get('amenities'):
+            bits = amenity_bits(filters['amenities'])
+            mask &= (data['amenity_bits'] & bits) == bits
+        if filters.get('min_price') is not None:
+            mask &= data['price_inr'] >= filters['min_price']
+        if filters.get('max_price') is not None:
+            mask &= data['price_inr'] <= filters['max_price']
+
+        rows = np.flatnonzero(mask)
+        total = len(rows)
+        end = min(offset + limit, total)
+        if end <= offset:
+            return [], total
+
+        # Ascending sort key with ties broken on id; NULLs sort last either way
+        ids = data['id'][rows]
+        if sort == 'price_low':
+            key, tie = data['price_inr'][rows], ids
+        elif sort == 'price_high':
+            key, tie = -data['price_inr'][rows], -ids
+        elif sort == 'area':
+            key, tie = -data['area_sqft'][rows], -ids
+        else:
+            key, tie = -data['created_at'][rows], -ids
+        key = np.where(np.isnan(key), np.inf, key)
+
+        # Only the rows up to the end of the page need a full sort
+        if end < total:
+            kth = np.partition(key, end - 1)[end - 1]
+            candidates = np.flatnonzero(key <= kth)
+        else:
+            candidates = np.arange(total)
+        order = candidates[np.lexsort((tie[candidates], key[candidates]))]
+        return ids[order[offset:end]].tolist(), total
+
+    def record_reload(self):
+        """Ask every worker to reload, after writes that bypass the ORM (bulk imports)."""
+        if self.enabled:
+            _record({None})
+
+
+listing_snapshot = ListingSnapshot()
+
+
+@job_runner.handler('listing_changes_prune')
+def prune_changes(job, payload):
+    """Drop change-log rows older than ``LISTING_SNAPSHOT_KEEP`` seconds."""
+    cutoff = datetime.utcnow() - timedelta(seconds=listing_snapshot.keep)
+    with db.engine.begin() as conn:
+        pruned = conn.execute(delete(ListingChange.__table__).where(
+            ListingChange.__table__.c.created_at < cutoff)).rowcount
+    return {'pruned': pruned}
+
+
+def _record(property_ids):
+    now = datetime.utcnow()
+    with db.engine.begin() as conn:
+        conn.execute(insert(ListingChange.__table__), [
+            {'property_id': property_id, 'created_at': now} for property_id in property_ids
+        ])
+
+
+def _changed(obj, dirty):
+    if not isinstance(obj, (Property, Locality)):
+        return False
+    if not dirty:
+        return True
+    state = inspect(obj)
+    return any(attr.key not in _IGNORED_FIELDS and attr.history.has_changes() for attr in state.attrs)
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_changes(session, flush_context):
+    if not listing_snapshot.enabled:
+        return
+    changed = session.info.setdefault('listing_changes', set())
+    for obj in list(session.new) + list(session.deleted):
+        if _changed(obj, False):
+            changed.add(obj.id if isinstance(obj, Property) else None)
+    for obj in session.dirty:
+        if _changed(obj, True):
+            changed.add(obj.id if isinstance(obj, Property) else None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _record_on_commit(session):
+    changed = session.info.pop('listing_changes', None)
+    if changed:
+        _record({None} if None in changed else changed)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_on_rollback(session):
+    session.info.pop('listing_changes', None)
@@ -0,0 +1,73 @@
+"""Per-process registry of the localities.
+
+Localities change about once a month but are read on most pages: the zone
+filter, the locality dropdowns and the zone lists. The registry loads them
+once into plain read-only records and answers those lookups without SQL.
+
+``admin.add_locality``/``delete_locality`` call ``invalidate`` so the worker
+that handled the edit reloads at once; other workers reload after at most
+``LOCALITY_REGISTRY_TTL`` seconds.
+"""
+import threading
+import time
+from collections import namedtuple
+from flask import current_app
+from extensions import db
+from models import Locality
+
+LocalityInfo = namedtuple('LocalityInfo', 'id name zone slug image')
+
+
+class LocalityRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = None  # (sorted records, id -> record, zone -> records)
+        self.loaded_at = None
+
+    def _load(self):
+        records = [
+            LocalityInfo(*row) for row in db.session.query(
+                Locality.id, Locality.name, Locality.zone, Locality.slug, Locality.image
+            ).order_by(Locality.zone, Locality.name)
+        ]
+        by_zone = {}
+        for loc in records:
+            by_zone.setdefault(loc.zone, []).append(loc)
+        return records, {loc.id: loc for loc in records}, by_zone
+
+    def _get(self):
+        ttl = current_app.config.get('LOCALITY_REGISTRY_TTL', 300)
+        data = self._data
+        if data is not None and time.monotonic() - self.loaded_at <= ttl:
+            return data
+        with self._lock:
+            if self._data is data:
+                self._data = self._load()
+                self.loaded_at = time.monotonic()
+            return self._data
+
+    def all(self):
+        """Every locality, sorted by zone then name."""
+        return self._get()[0]
+
+    def get(self, loc_id):
+        return self._get()[1].get(loc_id)
+
+    def name(self, loc_id):
+        loc = self.get(loc_id)
+        return loc.name if loc else None
+
+    def by_zone(self):
+        """Zone -> its localities sorted by name, zones in order."""
+        return self._get()[2]
+
+    def zone_ids(self, zone):
+        return [loc.id for loc in self._get()[2].get(zone, ())]
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+
+
+locality_registry = LocalityRegistry()
@@ -0,0 +1,87 @@
+"""Keyset (cursor) pagination for property listings.
+
+Instead of ``OFFSET``, each page is fetched with a ``WHERE`` on the sort key
+of the last row seen, so deep pages cost the same as the first one and no
+``COUNT`` is needed. The cursor is an opaque url-safe token that encodes the
+sort name, the sort value of the last row and its id as a tie-breaker.
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+from models import Property
+
+# sort name -> (column, descending)
+SORT_KEYS = {
+    'newest': (Property.created_at, True),
+    'price_low': (Property.price_inr, False),
+    'price_high': (Property.price_inr, True),
+    'area': (Property.area_sqft, True),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort, prop):
+    column, _ = SORT_KEYS[sort]
+    value = getattr(prop, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, prop.id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, sort):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor_sort, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise InvalidCursor('Malformed cursor')
+    if cursor_sort != sort or not isinstance(last_id, int):
+        raise InvalidCursor('Cursor does not match sort order')
+    if value is not None and sort == 'newest':
+        try:
+            value = datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise InvalidCursor('Malformed cursor')
+    return value, last_id
+
+
+def keyset_page(query, sort, after, per_page):
+    """Return ``(items, next_cursor)`` for the page following ``after``.
+
+    ``query`` must be unordered; ordering is applied here so it always matches
+    the cursor. Rows with a NULL sort value come last, as with ``nullslast``.
+    """
+    if sort not in SORT_KEYS:
+        sort = 'newest'
+    column, descending = SORT_KEYS[sort]
+
+    if after:
+        value, last_id = decode_cursor(after, sort)
+        if value is None:
+            query = query.filter(column.is_(None), Property.id < last_id if descending else Property.id > last_id)
+        elif descending:
+            query = query.filter(or_(
+                column < value,
+                and_(column == value, Property.id < last_id),
+                column.is_(None),
+            ))
+        else:
+            query = query.filter(or_(
+                column > value,
+                and_(column == value, Property.id > last_id),
+                column.is_(None),
+            ))
+
+    if descending:
+        query = query.order_by(column.desc().nullslast(), Property.id.desc())
+    else:
+        query = query.order_by(column.asc().nullslast(), Property.id.asc())
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = encode_cursor(sort, items[-1]) if len(rows) > per_page else None
+    return items, next_cursor
@@ -0,0 +1,213 @@
+"""Per-endpoint request profiling: SQL queries, DB time, rendering, JSON.
+
+Every request's SQL statements are counted and timed from the engine's
+``before_cursor_execute``/``after_cursor_execute`` events, template rendering
+from Flask's ``before_render_template``/``template_rendered`` signals and
+JSON serialization from the app's JSON provider. ``request_finished`` files
+the totals under the request's endpoint:
+
+- cumulative histograms, exported in Prometheus text format by
+  ``/admin/perf/metrics``;
+- the last ``PERF_SAMPLES`` requests per endpoint, whose percentiles the
+  ``/admin/perf`` page shows.
+
+Figures are per worker process. Queries a template triggers while rendering
+(lazy loads) count towards both DB and render time. With
+``PERF_SLOW_QUERY_MS`` set, statements slower than that are logged with
+their bound parameters.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from flask import before_render_template, g, has_request_context, request, request_finished, request_started, \
+    template_rendered
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+log = logging.getLogger(__name__)
+
+METRICS = ('queries', 'db_ms', 'render_ms', 'serialize_ms', 'total_ms')
+MS_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+PERCENTILES = (50, 95, 99)
+
+_HELP = {
+    'queries': 'SQL statements executed per request',
+    'db_ms': 'Time spent executing SQL per request',
+    'render_ms': 'Time spent rendering templates per request',
+    'serialize_ms': 'Time spent serializing JSON per request',
+    'total_ms': 'Request handling time',
+}
+
+
+class _Histogram:
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        i = 0
+        while i < len(self.bounds) and value > self.bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+
+
+class _Endpoint:
+
+    def __init__(self, samples):
+        self.count = 0
+        self.histograms = {name: _Histogram(QUERY_BUCKETS if name == 'queries' else MS_BUCKETS) for name in METRICS}
+        self.recent = deque(maxlen=samples)
+
+
+class _TimedJSONProvider(DefaultJSONProvider):
+    """Adds the time ``dumps`` takes to the current request's serialization time."""
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            _add('serialize_ms', (time.perf_counter() - started) * 1000)
+
+
+def _add(name, value):
+    if has_request_context():
+        timings = g.get('_perf')
+        if timings is not None:
+            timings[name] += value
+
+
+class PerfMonitor:
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = None
+        self.samples = 1000
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def init_app(self, app):
+        self.enabled = app.config.get('PERF_MONITOR', True)
+        self.slow_query_ms = app.config.get('PERF_SLOW_QUERY_MS')
+        self.samples = app.config.get('PERF_SAMPLES', 1000)
+        if not self.enabled:
+            return
+        app.json = _TimedJSONProvider(app)
+        request_started.connect(self._request_started, app)
+        request_finished.connect(self._request_finished, app)
+        before_render_template.connect(self._render_started, app)
+        template_rendered.connect(self._render_finished, app)
+
+    def _request_started(self, sender, **extra):
+        g._perf = dict.fromkeys(METRICS, 0)
+        g._perf_started = time.perf_counter()
+
+    def _render_started(self, sender, template, context, **extra):
+        g.setdefault('_perf_renders', []).append(time.perf_counter())
+
+    def _render_finished(self, sender, template, context, **extra):
+        renders = g.get('_perf_renders')
+        if renders:
+            _add('render_ms', (time.perf_counter() - renders.pop()) * 1000)
+
+    def _request_finished(self, sender, response, **extra):
+        timings = g.pop('_perf', None)
+        if timings is None:
+            return
+        timings['total_ms'] = (time.perf_counter() - g._perf_started) * 1000
+        self.record(request.endpoint or '<unmatched>', timings)
+
+    def record(self, endpoint, timings):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = _Endpoint(self.samples)
+            stats.count += 1
+            for name in METRICS:
+                stats.histograms[name].observe(timings[name])
+            stats.recent.append(tuple(timings[name] for name in METRICS))
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def report(self):
+        """Per endpoint: request count and percentiles of the recent samples, busiest first."""
+        with self._lock:
+            endpoints = {name: (stats.count, list(stats.recent)) for name, stats in self._endpoints.items()}
+        report = []
+        for endpoint, (count, recent) in endpoints.items():
+            row = {'endpoint': endpoint, 'requests': count, 'samples': len(recent)}
+            for i, name in enumerate(METRICS):
+                values = sorted(sample[i] for sample in recent)
+                row[name] = {f'p{p}': _percentile(values, p) for p in PERCENTILES}
+                row[name]['mean'] = sum(values) / len(values) if values else 0
+            report.append(row)
+        report.sort(key=lambda row: row['total_ms']['mean'] * row['samples'], reverse=True)
+        return report
+
+    def prometheus(self):
+        """The cumulative histograms in Prometheus text exposition format."""
+        with self._lock:
+            endpoints = sorted(
+                (name, stats.count, {metric: (list(h.counts), h.sum) for metric, h in stats.histograms.items()})
+                for name, stats in self._endpoints.items()
+            )
+        lines = []
+        for metric in METRICS:
+            name, scale, bounds = ('app_request_queries', 1, QUERY_BUCKETS) if metric == 'queries' else \
+                (f'app_request_{metric[:-3]}_seconds', 1000, MS_BUCKETS)
+            lines.append(f'# HELP {name} {_HELP[metric]}')
+            lines.append(f'# TYPE {name} histogram')
+            for endpoint, count, histograms in endpoints:
+                counts, total = histograms[metric]
+                label = 'endpoint="{}"'.format(endpoint.replace('\\', '\\\\').replace('"', '\\"'))
+                cumulative = 0
+                for bound, n in zip(list(bounds) + ['+Inf'], counts):
+                    cumulative += n
+                    le = bound if bound == '+Inf' else f'{bound / scale:g}'
+                    lines.append(f'{name}_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label}}} {total / scale:.6f}')
+                lines.append(f'{name}_count{{{label}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _percentile(values, p):
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+perf_monitor = PerfMonitor()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    if perf_monitor.enabled:
+        conn.info.setdefault('_perf_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('_perf_started')
+    if not started:
+        return
+    elapsed = (time.perf_counter() - started.pop()) * 1000
+    _add('queries', 1)
+    _add('db_ms', elapsed)
+    if perf_monitor.slow_query_ms is not None and elapsed >= perf_monitor.slow_query_ms:
+        log.warning('Slow query (%.1f ms) in %s: %s; parameters: %.1000r', elapsed,
+                    request.endpoint if has_request_context() else 'background', statement, parameters)
+
+
+@event.listens_for(Engine, 'handle_error')
+def _query_failed(context):
+    started = context.connection.info.get('_perf_started') if context.connection is not None else None
+    if started:
+        started.pop()
@@ -0,0 +1,94 @@
+"""Background processing of uploaded property photos.
+
+The add/edit property routes only stage the raw uploads
+(``helpers.stage_upload``) and enqueue a ``property_images`` job. The job
+stores every photo through ``services.image_store`` (rendering new ones in
+the job runner's process pool), then creates the ``PropertyImage`` rows.
+"""
+import logging
+import os
+from extensions import db
+from models import Property, PropertyImage
+from services.image_store import BlobWriter
+from services.jobs import job_runner
+from services.suggest import suggestion_index
+
+log = logging.getLogger(__name__)
+
+
+def enqueue_property_images(prop, staged_paths, user_id):
+    """Queue processing of staged uploads for ``prop``; returns the job (or None)."""
+    if not staged_paths:
+        return None
+    existing_count = prop.images.count()
+    files = [
+        {'path': path, 'is_primary': existing_count == 0 and i == 0, 'sort_order': existing_count + i}
+        for i, path in enumerate(staged_paths)
+    ]
+    return job_runner.enqueue('property_images', {'property_id': prop.id, 'files': files},
+                              user_id=user_id, property_id=prop.id)
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@job_runner.handler('property_images')
+def process_property_images(job, payload):
+    prop = db.session.get(Property, payload['property_id'])
+    files = payload['files']
+    if prop is None:
+        for item in files:
+            _discard(item['path'])
+        return {'saved': 0, 'failed': 0, 'skipped': len(files)}
+
+    writer = BlobWriter()
+    pending = []
+    saved = failed = 0
+    try:
+        for item in files:
+            try:
+                with open(item['path'], 'rb') as f:
+                    data = f.read()
+            except OSError:
+                log.warning('Staged image %s is gone', item['path'])
+                failed += 1
+                continue
+            filename, future = writer.submit(data)
+            pending.append((item, filename, future))
+
+        for item, filename, future in pending:
+            try:
+                renditions = future.result()
+            except Exception:
+                log.exception('Could not process staged image %s', item['path'])
+                failed += 1
+                continue
+            db.session.add(PropertyImage(
+                property_id=prop.id,
+                filename=filename,
+                renditions=renditions,
+                is_primary=item['is_primary'],
+                sort_order=item['sort_order'],
+            ))
+            saved += 1
+    finally:
+        for item in files:
+            _discard(item['path'])
+
+    with db.session.no_autoflush:
+        still_exists = db.session.query(Property.id).filter_by(id=prop.id).scalar() is not None
+    if not still_exists:
+        # Deleted while we were resizing; the blobs are left for the garbage collector
+        db.session.rollback()
+        writer.save()
+        db.session.commit()
+        return {'saved': 0, 'failed': failed, 'skipped': saved}
+
+    writer.save()
+    db.session.commit()
+    suggestion_index.update_property(prop)
+    return {'saved': saved, 'failed': failed, 'reused': writer.reused}
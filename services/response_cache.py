@@ -0,0 +1,284 @@
+"""Response cache for the read-only JSON API.
+
+``@response_cache.cached`` stores the body of successful GET responses keyed
+on the path plus the sorted query arguments the view declares it reads, and a
+data version. Every
+response carries a strong ETag (a hash of the body), and a matching
+``If-None-Match`` is answered with 304.
+
+The data version changes whenever a commit touches listings, images,
+localities or users, so stale entries are never served; it lives in the
+backend, which makes the filesystem backend consistent across gunicorn
+workers. Backends are chosen with ``RESPONSE_CACHE_BACKEND``:
+
+* ``memory``: per-process LRU of ``RESPONSE_CACHE_SIZE`` entries; writes in
+  another worker are only seen once an entry outlives ``RESPONSE_CACHE_TTL``
+* ``filesystem``: files under ``RESPONSE_CACHE_DIR``, shared by all workers;
+  the least recently used go beyond ``RESPONSE_CACHE_DIR_ENTRIES`` files or
+  ``RESPONSE_CACHE_DIR_BYTES``
+* ``null``: no caching, ETags only
+
+``get_or_set`` caches other JSON-serializable data the same way, such as
+the facet counts on the HTML listings page.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from models import Locality, Property, PropertyImage, User
+
+# Columns whose changes never show up in cached API responses
+_IGNORED_FIELDS = {Property: {'views_count'}}
+_VERSIONED_MODELS = (Property, PropertyImage, Locality, User)
+
+
+class NullBackend:
+
+    def __init__(self):
+        self._version = str(time.time_ns())
+
+    def get(self, key):
+        return None
+
+    def set(self, key, etag, body):
+        pass
+
+    def version(self):
+        return self._version
+
+    def bump_version(self):
+        self._version = str(time.time_ns())
+
+
+class MemoryBackend(NullBackend):
+
+    def __init__(self, max_entries=512, ttl=60):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[:2]
+
+    def set(self, key, etag, body):
+        with self._lock:
+            self._entries[key] = (etag, body, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump_version(self):
+        with self._lock:
+            super().bump_version()
+            self._entries.clear()
+
+
+class FileSystemBackend:
+    """One file per entry (ETag line + body); the version is a file too.
+
+    A file's mtime is its last use: hits touch it, and every ``SWEEP_EVERY``
+    writes a worker removes the least recently used files beyond
+    ``max_entries`` or ``max_bytes``. Workers sweep independently, so the
+    directory can briefly hold a few sweeps' worth of writes more than that.
+    """
+    SWEEP_EVERY = 64
+
+    def __init__(self, directory, max_entries=10000, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._version_path = os.path.join(directory, 'VERSION')
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.cache')
+
+    def _write(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                etag, _, body = f.read().partition(b'\n')
+            os.utime(path)
+        except OSError:
+            return None
+        return etag.decode(), body
+
+    def set(self, key, etag, body):
+        self._write(self._path(key), etag.encode() + b'\n' + body)
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % self.SWEEP_EVERY == 0
+        if sweep:
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until both limits hold."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.cache'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        count, size = len(entries), sum(e[1] for e in entries)
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        entries.sort()
+        for _, nbytes, path in entries:
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            count -= 1
+            size -= nbytes
+
+    def version(self):
+        try:
+            with open(self._version_path) as f:
+                return f.read().strip() or '0'
+        except OSError:
+            return '0'
+
+    def bump_version(self):
+        self._write(self._version_path, str(time.time_ns()).encode())
+        for name in os.listdir(self.directory):
+            if name.endswith('.cache'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+class ResponseCache:
+
+    def __init__(self):
+        self.backend = NullBackend()
+        self.max_age = 0
+
+    def init_app(self, app):
+        kind = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        if kind == 'filesystem':
+            self.backend = FileSystemBackend(app.config['RESPONSE_CACHE_DIR'],
+                                             app.config.get('RESPONSE_CACHE_DIR_ENTRIES', 10000),
+                                             app.config.get('RESPONSE_CACHE_DIR_BYTES', 256 * 1024 * 1024))
+        elif kind == 'memory':
+            self.backend = MemoryBackend(app.config.get('RESPONSE_CACHE_SIZE', 512),
+                                         app.config.get('RESPONSE_CACHE_TTL', 60))
+        else:
+            self.backend = NullBackend()
+        self.max_age = app.config.get('RESPONSE_CACHE_MAX_AGE', 0)
+
+    def bump_version(self):
+        self.backend.bump_version()
+
+    def get_or_set(self, name, compute):
+        """``compute()``'s JSON-serializable result, cached under ``name`` and the data version."""
+        key = f'{self.backend.version()}|{name}'
+        hit = self.backend.get(key)
+        if hit is not None:
+            return json.loads(hit[1])
+        value = compute()
+        self.backend.set(key, '', json.dumps(value).encode())
+        return value
+
+    def _key(self, names):
+        args = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)) if k in names)
+        return f'{self.backend.version()}|{request.path.rstrip("/")}?{args}'
+
+    def _respond(self, etag, body):
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f'public, max-age={self.max_age}'
+        return response.make_conditional(request)
+
+    def cached(self, view=None, args=()):
+        """Cache ``view``'s responses; only the query arguments named in ``args`` vary the key.
+
+        Arguments the view never reads, such as cache busters, would otherwise
+        each store another copy of the same body.
+        """
+        if view is None:
+            return lambda view: self.cached(view, args)
+        names = frozenset(args)
+
+        @wraps(view)
+        def decorated(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            key = self._key(names)
+            hit = self.backend.get(key)
+            if hit is not None:
+                return self._respond(*hit)
+
+            rv = view(*args, **kwargs)
+            response = rv if isinstance(rv, Response) else None
+            if response is None or response.status_code != 200 or not response.is_json:
+                return rv
+            body = response.get_data()
+            etag = hashlib.sha256(body).hexdigest()
+            self.backend.set(key, etag, body)
+            return self._respond(etag, body)
+        return decorated
+
+
+response_cache = ResponseCache()
+
+
+def _has_versioned_changes(obj, dirty):
+    if not isinstance(obj, _VERSIONED_MODELS):
+        return False
+    if not dirty:
+        return True
+    ignored = _IGNORED_FIELDS.get(type(obj), set())
+    state = inspect(obj)
+    return any(attr.key not in ignored and attr.history.has_changes() for attr in state.attrs)
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_changes(session, flush_context):
+    if session.info.get('response_cache_dirty'):
+        return
+    if any(_has_versioned_changes(obj, False) for obj in session.new) or \
+            any(_has_versioned_changes(obj, False) for obj in session.deleted) or \
+            any(_has_versioned_changes(obj, True) for obj in session.dirty):
+        session.info['response_cache_dirty'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_on_commit(session):
+    if session.info.pop('response_cache_dirty', False):
+        response_cache.bump_version()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_on_rollback(session):
+    session.info.pop('response_cache_dirty', None)
@@ -0,0 +1,297 @@
+"""Daily activity rollups behind the admin dashboard and analytics pages.
+
+Three append-only sources feed them: enquiry clicks in ``enquiry_logs``,
+views in ``view_batches`` (one row per listing per view-counter flush) and
+new listings in ``properties``. The ``analytics_rollup`` job, scheduled every
+``ANALYTICS_ROLLUP_INTERVAL`` seconds, reads each source past its
+``rollup_state`` watermark in id order, groups the new rows by UTC day and
+adds them to the per-property, per-locality, per-agent and site-wide daily
+tables, and to monthly totals per listing and per agent. Totals and the
+watermark are written in one transaction, and the watermark only moves if it
+still holds the value the batch started from, so overlapping runs never
+count a row twice.
+
+Rows younger than ``ANALYTICS_ROLLUP_LAG`` seconds wait for the next run:
+ids are handed out before commit, so a lower id can still turn up after a
+higher one has been read. Clicks and views count towards the locality and
+agent their listing had when they were rolled up. Views were only ever kept
+as a running total per listing, so their daily history starts with the
+rollups; clicks and listings are backfilled from the first run.
+
+The admin pages read these tables through ``totals``, ``top_properties``,
+``top_localities`` and ``top_agents``. Listings and agents are summed from
+the monthly tables for the whole months in a range and from the daily ones
+for the days either side, so a range of years reads a row per month, not
+per day.
+"""
+import time
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import case, delete, func, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import (AgentDailyStats, AgentMonthlyStats, EnquiryLog, LocalityDailyStats, Property, PropertyDailyStats,
+                    PropertyMonthlyStats, RollupState, SiteDailyStats, User, ViewBatch)
+from services.jobs import job_runner
+from services.localities import locality_registry
+
+COUNTERS = ('views', 'phone_clicks', 'whatsapp_clicks', 'new_listings')
+# (model, key columns) of each rollup; rows are summed into every one whose columns they carry
+_TARGETS = (
+    (PropertyDailyStats, ('day', 'property_id')),
+    (PropertyMonthlyStats, ('month', 'property_id')),
+    (LocalityDailyStats, ('day', 'locality_id')),
+    (AgentDailyStats, ('day', 'user_id')),
+    (AgentMonthlyStats, ('month', 'user_id')),
+    (SiteDailyStats, ('day',)),
+)
+
+
+def _enquiries(first, last):
+    day = func.date(EnquiryLog.created_at)
+    return db.session.query(
+        day.label('day'), EnquiryLog.property_id, Property.locality_id, Property.user_id,
+        func.sum(case((EnquiryLog.action == 'phone_click', 1), else_=0)).label('phone_clicks'),
+        func.sum(case((EnquiryLog.action == 'whatsapp_click', 1), else_=0)).label('whatsapp_clicks'),
+    ).outerjoin(Property, Property.id == EnquiryLog.property_id).filter(
+        EnquiryLog.id > first, EnquiryLog.id <= last,
+    ).group_by(day, EnquiryLog.property_id, Property.locality_id, Property.user_id)
+
+
+def _views(first, last):
+    day = func.date(ViewBatch.created_at)
+    return db.session.query(
+        day.label('day'), ViewBatch.property_id, Property.locality_id, Property.user_id,
+        func.sum(ViewBatch.views).label('views'),
+    ).outerjoin(Property, Property.id == ViewBatch.property_id).filter(
+        ViewBatch.id > first, ViewBatch.id <= last,
+    ).group_by(day, ViewBatch.property_id, Property.locality_id, Property.user_id)
+
+
+def _listings(first, last):
+    day = func.date(Property.created_at)
+    return db.session.query(
+        day.label('day'), Property.locality_id, Property.user_id, func.count(Property.id).label('new_listings'),
+    ).filter(Property.id > first, Property.id <= last).group_by(day, Property.locality_id, Property.user_id)
+
+
+# name -> (source model, grouped query over an id range)
+SOURCES = {
+    'enquiries': (EnquiryLog, _enquiries),
+    'views': (ViewBatch, _views),
+    'listings': (Property, _listings),
+}
+
+
+def _day(value):
+    # date() comes back as text on SQLite
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _add(model, keys, rows):
+    """Add ``rows`` to the counters of ``model``, inserting the days and ids it has not seen."""
+    table = model.__table__
+    dialect = db.engine.dialect.name
+    counters = [name for name in rows[0] if name not in keys]
+    if dialect in ('postgresql', 'sqlite'):
+        stmt = (postgresql if dialect == 'postgresql' else sqlite).insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + stmt.excluded[name] for name in counters},
+        )
+        db.session.execute(stmt, rows)
+        return
+    for row in rows:
+        match = [table.c[key] == row[key] for key in keys]
+        updated = db.session.execute(update(table).where(*match).values(
+            {name: table.c[name] + row[name] for name in counters}))
+        if not updated.rowcount:
+            db.session.execute(table.insert().values(row))
+
+
+def _merge(grouped):
+    """Sum the grouped source rows into the row lists for each rollup table."""
+    merged = [{} for _ in _TARGETS]
+    for row in grouped:
+        values = row._asdict()
+        if values['day'] is None:  # no created_at to date it by
+            continue
+        values['day'] = _day(values['day'])
+        values['month'] = values['day'].replace(day=1)
+        # NULL cannot be part of a primary key
+        for name in ('locality_id', 'user_id'):
+            if name in values:
+                values[name] = values[name] or 0
+        counts = {name: int(values[name] or 0) for name in COUNTERS if name in values}
+        for (model, keys), rows in zip(_TARGETS, merged):
+            if not all(key in values for key in keys):
+                continue
+            total = rows.setdefault(tuple(values[key] for key in keys), dict(zip(keys, (values[key] for key in keys))))
+            for name, n in counts.items():
+                total[name] = total.get(name, 0) + n
+    return [(model, keys, list(rows.values())) for (model, keys), rows in zip(_TARGETS, merged) if rows]
+
+
+def _watermark(name):
+    last_id = db.session.query(RollupState.last_id).filter_by(name=name).scalar()
+    if last_id is None:
+        db.session.add(RollupState(name=name, last_id=0))
+        try:
+            db.session.commit()
+        except IntegrityError:  # created by a concurrent run
+            db.session.rollback()
+        last_id = 0
+    return last_id
+
+
+def _next_batch(model, after, batch_size, cutoff):
+    """Last id of the next batch past ``after``, stopping short of rows newer than ``cutoff``."""
+    ids = db.session.query(model.id.label('id'), model.created_at.label('created_at')).filter(
+        model.id > after).order_by(model.id).limit(batch_size).subquery()
+    last, first_recent = db.session.query(
+        func.max(ids.c.id), func.min(case((ids.c.created_at >= cutoff, ids.c.id))),
+    ).one()
+    if first_recent is not None:
+        last = first_recent - 1
+    return last if last is not None and last > after else None
+
+
+def roll_up(name, batch_size=None, lag=None):
+    """Add one batch of ``name``'s new rows to the rollups; returns the ids covered, 0 once caught up."""
+    config = current_app.config
+    batch_size = batch_size or config.get('ANALYTICS_ROLLUP_BATCH', 50000)
+    lag = config.get('ANALYTICS_ROLLUP_LAG', 60) if lag is None else lag
+    model, grouped = SOURCES[name]
+
+    after = _watermark(name)
+    now = datetime.utcnow()
+    last = _next_batch(model, after, batch_size, now - timedelta(seconds=lag))
+    if last is None:
+        db.session.query(RollupState).filter_by(name=name).update({'updated_at': now})
+        db.session.commit()
+        return 0
+    try:
+        for target, keys, rows in _merge(grouped(after, last)):
+            _add(target, keys, rows)
+        moved = db.session.execute(update(RollupState).where(
+            RollupState.name == name, RollupState.last_id == after,
+        ).values(last_id=last)).rowcount
+        if not moved:  # another run got there first
+            db.session.rollback()
+            return 0
+        if model is ViewBatch:
+            db.session.execute(delete(ViewBatch).where(ViewBatch.id <= last))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return last - after
+
+
+def run(budget=None):
+    """Bring every rollup up to date, or as close as ``budget`` seconds allow.
+
+    Returns the ids covered per source and whether anything was left behind.
+    """
+    deadline = time.monotonic() + budget if budget else None
+    covered = {name: 0 for name in SOURCES}
+    pending = list(SOURCES)
+    while pending:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        name = pending.pop(0)
+        n = roll_up(name)
+        if n:
+            covered[name] += n
+            pending.append(name)
+    return {'covered': covered, 'behind': bool(pending)}
+
+
+@job_runner.handler('analytics_rollup')
+def _rollup_job(job, payload):
+    return run(budget=current_app.config.get('ANALYTICS_ROLLUP_BUDGET', 60))
+
+
+def updated_at():
+    """When every source was last found caught up, or None before the first complete run."""
+    return db.session.query(func.min(RollupState.updated_at)).scalar()
+
+
+def _in_range(column, start, end):
+    conditions = []
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column <= end)
+    return conditions
+
+
+def _next_month(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _spans(start, end):
+    """Split the days ``start`` to ``end`` into (monthly, first, last) spans: whole months, and the ends by day."""
+    first_month = start if start is None or start.day == 1 else _next_month(start)
+    if end is not None and _next_month(end) - timedelta(days=1) == end:
+        stop_month = _next_month(end)
+    else:
+        stop_month = (end or datetime.utcnow().date()).replace(day=1)
+    if first_month is not None and first_month >= stop_month:
+        return [(False, start, end)]
+    spans = [(True, first_month, stop_month - timedelta(days=1))]
+    if start is not None and start < first_month:
+        spans.append((False, start, first_month - timedelta(days=1)))
+    if end is None or end >= stop_month:
+        spans.append((False, stop_month, end))
+    return spans
+
+
+def _top(daily, monthly, key, start, end, order, limit):
+    """Counters of ``daily`` summed per ``key`` over the range, reading whole months from ``monthly`` if given.
+
+    ``order`` maps the summed columns by name to the expressions to sort on, highest first.
+    """
+    names = [name for name in COUNTERS if hasattr(daily, name)]
+    spans = _spans(start, end) if monthly is not None else [(False, start, end)]
+    parts = []
+    for by_month, first, last in spans:
+        model = monthly if by_month else daily
+        parts.append(select(getattr(model, key).label('id'), *(getattr(model, name) for name in names)).where(
+            getattr(model, key) != 0, *_in_range(model.month if by_month else model.day, first, last)))
+    rows = union_all(*parts).subquery()
+    sums = {name: func.sum(rows.c[name]) for name in names}
+    return db.session.query(rows.c.id, *(total.label(name) for name, total in sums.items())).group_by(
+        rows.c.id).order_by(*(column.desc() for column in order(sums))).limit(limit).all()
+
+
+def totals(start=None, end=None):
+    """Site-wide counters summed over the days ``start`` to ``end`` (inclusive; None: unbounded)."""
+    row = db.session.query(*(
+        func.coalesce(func.sum(getattr(SiteDailyStats, name)), 0).label(name) for name in COUNTERS
+    )).filter(*_in_range(SiteDailyStats.day, start, end)).one()
+    return row._asdict()
+
+
+def top_properties(start=None, end=None, limit=10):
+    """The most clicked listings: (property or None if deleted, views, phone clicks, WhatsApp clicks)."""
+    rows = _top(PropertyDailyStats, PropertyMonthlyStats, 'property_id', start, end,
+                lambda s: (s['phone_clicks'] + s['whatsapp_clicks'], s['views']), limit)
+    found = {p.id: p for p in db.session.query(Property).filter(Property.id.in_([r.id for r in rows]))}
+    return [(found.get(r.id), r.views, r.phone_clicks, r.whatsapp_clicks) for r in rows]
+
+
+def top_localities(start=None, end=None, limit=10):
+    """Localities by new listings: (LocalityInfo or None if deleted, new listings, views, clicks)."""
+    rows = _top(LocalityDailyStats, None, 'locality_id', start, end,
+                lambda s: (s['new_listings'], s['phone_clicks'] + s['whatsapp_clicks']), limit)
+    return [(locality_registry.get(r.id), r.new_listings, r.views, r.phone_clicks + r.whatsapp_clicks) for r in rows]
+
+
+def top_agents(start=None, end=None, limit=10):
+    """Agents by new listings: (User or None if deleted, new listings, views, clicks)."""
+    rows = _top(AgentDailyStats, AgentMonthlyStats, 'user_id', start, end,
+                lambda s: (s['new_listings'], s['phone_clicks'] + s['whatsapp_clicks']), limit)
+    found = {u.id: u for u in db.session.query(User).filter(User.id.in_([r.id for r in rows]))}
+    return [(found.get(r.id), r.new_listings, r.views, r.phone_clicks + r.whatsapp_clicks) for r in rows]
@@ -0,0 +1,55 @@
+"""Full-text property search over title, address and description.
+
+One API for both backends: Postgres matches against the generated
+``search_vector`` column (GIN index), SQLite against the ``properties_fts``
+FTS5 table. Every word of the query is matched as a prefix, so "andh wes"
+finds "Andheri West".
+"""
+import re
+from sqlalchemy import column, func, literal_column, table
+from extensions import db
+from models import Property
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+_fts = table('properties_fts', column('rowid'))
+_search_vector = literal_column('properties.search_vector')
+
+
+def _is_postgres():
+    return db.engine.dialect.name == 'postgresql'
+
+
+def _terms(text):
+    return _WORD.findall(text.lower())
+
+
+def _match_expression(terms):
+    if _is_postgres():
+        return ' & '.join(f'{t}:*' for t in terms)
+    return ' '.join(f'"{t}"*' for t in terms)
+
+
+def apply_search(query, text):
+    """Restrict a Property query to rows matching ``text``."""
+    terms = _terms(text)
+    if not terms:
+        return query
+    match = _match_expression(terms)
+    if _is_postgres():
+        return query.filter(_search_vector.op('@@')(func.to_tsquery('english', match)))
+    return query.join(_fts, _fts.c.rowid == Property.id).filter(
+        literal_column('properties_fts').op('MATCH')(match)
+    )
+
+
+def search_rank(text):
+    """Order-by expression, best match first, for a query from ``apply_search``."""
+    terms = _terms(text)
+    if not terms:
+        return Property.created_at.desc()
+    if _is_postgres():
+        tsquery = func.to_tsquery('english', _match_expression(terms))
+        return func.ts_rank_cd(_search_vector, tsquery).desc()
+    # bm25 is lower-is-better; weights follow the column order title, description, address
+    return func.bm25(literal_column('properties_fts'), 10.0, 1.0, 4.0).asc()
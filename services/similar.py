@@ -0,0 +1,244 @@
+"""Precomputed "similar properties" for the detail pages.
+
+Every live listing is turned into a NumPy feature vector: log ``price_inr``,
+BHK, log built-up area, property type, zone, locality and the amenities as a
+bitmask. Each part is weighted so that one unit of distance means roughly
+the same to a buyer. Fixed weights, rather than scaling by the data, keep a
+single listing's refresh consistent with a full rebuild. Listings are only
+compared with others of the same listing type (buy or rent).
+
+``rebuild`` computes the top ``SIMILAR_PROPERTIES_K`` neighbours of every
+live listing in blocks. ``refresh`` recomputes one listing and slots it into
+the stored lists it now belongs to. Both run as background jobs: a session
+hook queues a refresh after any commit that changes a listing's features,
+and ``flask build-similar`` (also queued after bulk imports) rebuilds
+everything. The detail pages read a listing's neighbours back with a single
+primary-key lookup on ``similar_properties``.
+"""
+import json
+from datetime import datetime
+import numpy as np
+from flask import current_app
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Session
+from extensions import db
+from helpers import AMENITY_ICONS
+from models import Locality, Property, SimilarProperties
+from services.jobs import job_runner
+
+AMENITIES = list(AMENITY_ICONS)
+
+# Distance contributed by one unit of each feature
+WEIGHTS = {
+    'price': 2.0,       # per e-fold (about 2.7x) difference in price
+    'bhk': 0.75,        # per bedroom
+    'area': 1.5,        # per e-fold difference in built-up area
+    'type': 1.5,        # flat vs villa etc.
+    'zone': 0.7,
+    'locality': 0.7,
+    'amenity': 0.15,    # per amenity one has and the other lacks
+}
+
+_FEATURE_FIELDS = ('listing_type', 'property_type', 'price', 'price_unit', 'bhk', 'area_sqft',
+                   'locality_id', '_amenities', 'status', 'is_approved')
+BLOCK_SIZE = 512
+CHUNK_SIZE = 1000
+
+
+def _live_rows(listing_type):
+    return db.session.query(
+        Property.id, Property.property_type, Property.price_inr, Property.bhk,
+        Property.area_sqft, Property.locality_id, Locality.zone, Property.amenity_bits,
+    ).outerjoin(Locality, Property.locality_id == Locality.id).filter(
+        Property.is_approved == True, Property.status == 'active', Property.listing_type == listing_type,
+    ).order_by(Property.id).all()
+
+
+def _one_hot(values, weight):
+    keys = sorted({v for v in values if v is not None}, key=str)
+    index = {key: i for i, key in enumerate(keys)}
+    out = np.zeros((len(values), len(keys)), dtype=np.float32)
+    for row, value in enumerate(values):
+        if value is not None:
+            out[row, index[value]] = weight
+    return out
+
+
+def build_features(rows):
+    """Return (ids, feature matrix) for rows from ``_live_rows``."""
+    ids = np.array([r.id for r in rows], dtype=np.int64)
+    price = np.array([r.price_inr or 0 for r in rows], dtype=np.float64)
+    bhk = np.array([r.bhk or 0 for r in rows], dtype=np.float32)
+    area = np.array([r.area_sqft or np.nan for r in rows], dtype=np.float64)
+    if np.isnan(area).all():
+        area[:] = 1.0
+    else:
+        area[np.isnan(area)] = np.nanmedian(area)
+
+    amenities = np.zeros((len(rows), len(AMENITIES)), dtype=np.float32)
+    bits = np.array([r.amenity_bits or 0 for r in rows], dtype=np.int64)
+    for i in range(len(AMENITIES)):
+        amenities[:, i] = (bits >> i) & 1
+
+    matrix = np.hstack([
+        (np.log(np.maximum(price, 1.0)) * WEIGHTS['price'])[:, None],
+        (bhk * WEIGHTS['bhk'])[:, None],
+        (np.log(np.maximum(area, 1.0)) * WEIGHTS['area'])[:, None],
+        _one_hot([r.property_type for r in rows], WEIGHTS['type']),
+        _one_hot([r.zone for r in rows], WEIGHTS['zone']),
+        _one_hot([r.locality_id for r in rows], WEIGHTS['locality']),
+        amenities * WEIGHTS['amenity'],
+    ]).astype(np.float32)
+    return ids, matrix
+
+
+def _squared_distances(block, matrix, matrix_norms):
+    d = (block ** 2).sum(axis=1)[:, None] + matrix_norms[None, :] - 2.0 * (block @ matrix.T)
+    return np.maximum(d, 0.0)
+
+
+def top_k(ids, matrix, k):
+    """Yield (id, [[neighbour id, distance], ...]) for every row, nearest first."""
+    n = len(ids)
+    k = min(k, n - 1)
+    if k <= 0:
+        for prop_id in ids:
+            yield int(prop_id), []
+        return
+    norms = (matrix ** 2).sum(axis=1)
+    for start in range(0, n, BLOCK_SIZE):
+        block = matrix[start:start + BLOCK_SIZE]
+        d = _squared_distances(block, matrix, norms)
+        d[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+        nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+        for row, cols in enumerate(nearest):
+            cols = cols[np.argsort(d[row, cols])]
+            yield int(ids[start + row]), [[int(ids[c]), round(float(np.sqrt(d[row, c])), 4)] for c in cols]
+
+
+def _record(prop_id, neighbours, k, now):
+    return {
+        'property_id': prop_id,
+        'neighbours': json.dumps(neighbours),
+        'kth_distance': neighbours[-1][1] if len(neighbours) >= k else None,
+        'computed_at': now,
+    }
+
+
+def rebuild():
+    """Recompute the neighbours of every live listing; returns how many were written."""
+    k = current_app.config['SIMILAR_PROPERTIES_K']
+    now = datetime.utcnow()
+    records = []
+    for listing_type in ('buy', 'rent'):
+        rows = _live_rows(listing_type)
+        if rows:
+            ids, matrix = build_features(rows)
+            records.extend(_record(prop_id, neighbours, k, now) for prop_id, neighbours in top_k(ids, matrix, k))
+
+    db.session.query(SimilarProperties).delete(synchronize_session=False)
+    for start in range(0, len(records), CHUNK_SIZE):
+        db.session.execute(insert(SimilarProperties.__table__), records[start:start + CHUNK_SIZE])
+    db.session.commit()
+    return len(records)
+
+
+def refresh(prop_id):
+    """Recompute one listing's neighbours and add it to the lists it now belongs in."""
+    k = current_app.config['SIMILAR_PROPERTIES_K']
+    prop = db.session.get(Property, prop_id)
+    live = prop is not None and prop.is_approved and prop.status == 'active'
+    if not live:
+        # Stored lists still naming it are filtered when read
+        db.session.query(SimilarProperties).filter_by(property_id=prop_id).delete(synchronize_session=False)
+        db.session.commit()
+        return 0
+
+    rows = _live_rows(prop.listing_type)
+    ids, matrix = build_features(rows)
+    me = int(np.searchsorted(ids, prop_id))
+    d = np.sqrt(_squared_distances(matrix[me:me + 1], matrix, (matrix ** 2).sum(axis=1))[0])
+    d[me] = np.inf
+    order = np.argsort(d)[:min(k, len(ids) - 1)]
+    now = datetime.utcnow()
+    mine = [[int(ids[c]), round(float(d[c]), 4)] for c in order]
+
+    db.session.query(SimilarProperties).filter_by(property_id=prop_id).delete(synchronize_session=False)
+    db.session.execute(insert(SimilarProperties.__table__), [_record(prop_id, mine, k, now)])
+
+    # Lists that are not full yet, or whose furthest neighbour it now beats. Lists
+    # that already hold it keep the old distance until the next rebuild.
+    kth = dict(db.session.query(SimilarProperties.property_id, SimilarProperties.kth_distance))
+    candidates = [int(ids[i]) for i in range(len(ids)) if i != me and (
+        kth.get(int(ids[i])) is None or d[i] < kth[int(ids[i])])]
+    position = {int(pid): i for i, pid in enumerate(ids)}
+    stored = db.session.query(SimilarProperties).filter(
+        SimilarProperties.property_id.in_(candidates)
+    ).all() if candidates else []
+    for row in stored:
+        neighbours = [n for n in row.neighbours if n[0] != prop_id]
+        neighbours.append([prop_id, round(float(d[position[row.property_id]]), 4)])
+        neighbours = sorted(neighbours, key=lambda n: n[1])[:k]
+        row.neighbours = neighbours
+        row.kth_distance = neighbours[-1][1] if len(neighbours) >= k else None
+        row.computed_at = now
+    db.session.commit()
+    return 1 + len(stored)
+
+
+def similar_properties(prop, limit):
+    """Live neighbours of ``prop``, nearest first, from the precomputed table."""
+    row = db.session.get(SimilarProperties, prop.id)
+    if row is None:
+        return []
+    ids = [n[0] for n in row.neighbours]
+    if not ids:
+        return []
+    found = {p.id: p for p in db.session.query(Property).filter(
+        Property.id.in_(ids), Property.is_approved == True, Property.status == 'active',
+    ).all()}
+    return [found[i] for i in ids if i in found][:limit]
+
+
+@job_runner.handler('similar_properties')
+def _refresh_job(job, payload):
+    return {'updated': refresh(payload['property_id'])}
+
+
+@job_runner.handler('similar_rebuild')
+def _rebuild_job(job, payload):
+    return {'listings': rebuild()}
+
+
+def _features_changed(obj, dirty):
+    if not isinstance(obj, Property):
+        return False
+    if not dirty:
+        return True
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _FEATURE_FIELDS)
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_changes(session, flush_context):
+    changed = session.info.setdefault('similar_changed', set())
+    for obj in list(session.new) + list(session.deleted):
+        if _features_changed(obj, False):
+            changed.add(obj.id)
+    for obj in session.dirty:
+        if _features_changed(obj, True):
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _queue_on_commit(session):
+    changed = session.info.pop('similar_changed', None)
+    if changed and job_runner.app is not None:
+        job_runner.enqueue_batch('similar_properties', [
+            ({'property_id': prop_id}, prop_id) for prop_id in sorted(changed)
+        ])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_on_rollback(session):
+    session.info.pop('similar_changed', None)
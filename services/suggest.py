@@ -0,0 +1,202 @@
+"""In-memory prefix index behind /api/v1/search/suggestions.
+
+Locality names and live property titles/addresses are indexed by every word
+suffix ("andheri west" -> "andheri west", "west") in a sorted list, so a
+lookup is a ``bisect`` plus a short scan and never touches the database.
+Property entries carry their serialized card, ready to return.
+
+The index is per process and built off the request path: a background
+thread starts when a gunicorn worker boots (or on the first suggestion
+request elsewhere), builds the index and rebuilds it every
+``SUGGEST_INDEX_TTL`` seconds, swapping it in whole so requests keep
+reading the old one meanwhile. Routes that change a listing call
+``update_property``/``remove_property`` so the worker that handled the write
+is current at once; other workers pick changes up on their next rebuild.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from flask import current_app
+from extensions import db
+from models import Locality, Property
+from services.cards import load_cards, serialize_property_card
+
+log = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+MAX_KEY_LENGTH = 48
+
+
+def normalize(text):
+    return _NON_WORD.sub(' ', (text or '').lower()).strip()
+
+
+def _word_suffixes(text):
+    text = normalize(text)
+    keys = set()
+    for i, ch in enumerate(text):
+        if ch != ' ' and (i == 0 or text[i - 1] == ' '):
+            keys.add(text[i:i + MAX_KEY_LENGTH])
+    return keys
+
+
+def _keys(texts):
+    keys = set()
+    for text in texts:
+        keys |= _word_suffixes(text)
+    return keys
+
+
+class PrefixIndex:
+    """Sorted ``(key, item_id)`` pairs searched with bisect."""
+
+    def __init__(self):
+        self._keys = []
+        self._entries = {}  # item_id -> (payload, keys)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def build(cls, items):
+        """Index every ``(item_id, texts, payload)`` in ``items`` with a single sort."""
+        index = cls()
+        for item_id, texts, payload in items:
+            keys = _keys(texts)
+            index._keys.extend((key, item_id) for key in keys)
+            index._entries[item_id] = (payload, keys)
+        index._keys.sort()
+        return index
+
+    def add(self, item_id, texts, payload):
+        self.remove(item_id)
+        keys = _keys(texts)
+        for key in keys:
+            insort(self._keys, (key, item_id))
+        self._entries[item_id] = (payload, keys)
+
+    def remove(self, item_id):
+        entry = self._entries.pop(item_id, None)
+        if not entry:
+            return
+        for key in entry[1]:
+            i = bisect_left(self._keys, (key, item_id))
+            if i < len(self._keys) and self._keys[i] == (key, item_id):
+                del self._keys[i]
+
+    def search(self, prefix, limit):
+        prefix = normalize(prefix)[:MAX_KEY_LENGTH]
+        found = []
+        if not prefix:
+            return found
+        i = bisect_left(self._keys, (prefix,))
+        while i < len(self._keys) and len(found) < limit:
+            key, item_id = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            if item_id not in found:
+                found.append(item_id)
+            i += 1
+        return [self._entries[item_id][0] for item_id in found]
+
+
+class SuggestionIndex:
+
+    def __init__(self):
+        self.app = None
+        self.ttl = 300
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._built = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+        self.localities = PrefixIndex()
+        self.properties = PrefixIndex()
+        self.built_at = None
+
+    def init_app(self, app):
+        self.app = app
+        self.ttl = app.config.get('SUGGEST_INDEX_TTL', 300)
+
+    def rebuild(self):
+        with self._rebuild_lock:
+            localities = PrefixIndex.build(
+                (loc.id, [loc.name], {'id': loc.id, 'name': loc.name, 'zone': loc.zone})
+                for loc in db.session.query(Locality).all()
+            )
+            live = load_cards(db.session.query(Property).filter_by(is_approved=True, status='active').all())
+            properties = PrefixIndex.build(
+                (prop.id, [prop.title, prop.address], serialize_property_card(prop)) for prop in live
+            )
+            with self._lock:
+                self.localities, self.properties = localities, properties
+                self.built_at = time.monotonic()
+            self._built.set()
+
+    def start(self):
+        """Build the index in a background thread of this process, which then keeps it fresh."""
+        if self._thread_pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid() and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='suggest-index', daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def request_rebuild(self):
+        """Rebuild soon in the background, e.g. after a bulk import."""
+        self.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self.rebuild()
+            except Exception:
+                log.exception('Failed to rebuild the suggestion index')
+            self._wake.wait(self.ttl)
+            self._wake.clear()
+
+    def suggest(self, query, limit=5):
+        """(localities, properties) matching ``query``, or None if the index is not built yet."""
+        self.start()
+        # Only a worker's first requests can arrive before its first build
+        if not self._built.wait(current_app.config.get('SUGGEST_INDEX_WAIT', 5)):
+            return None
+        with self._lock:
+            return self.localities.search(query, limit), self.properties.search(query, limit)
+
+    def update_property(self, prop):
+        """Re-index a property after a write; drops it if no longer live."""
+        if self.built_at is None:
+            return
+        if not (prop.is_approved and prop.status == 'active'):
+            self.remove_property(prop.id)
+            return
+        load_cards([prop])
+        payload = serialize_property_card(prop)
+        with self._lock:
+            self.properties.add(prop.id, [prop.title, prop.address], payload)
+
+    def remove_property(self, prop_id):
+        with self._lock:
+            self.properties.remove(prop_id)
+
+    def update_locality(self, loc):
+        if self.built_at is None:
+            return
+        with self._lock:
+            self.localities.add(loc.id, [loc.name], {'id': loc.id, 'name': loc.name, 'zone': loc.zone})
+
+    def remove_locality(self, loc_id):
+        with self._lock:
+            self.localities.remove(loc_id)
+
+
+suggestion_index = SuggestionIndex()
@@ -0,0 +1,100 @@
+"""Write-behind counter for property page views.
+
+Detail pages call ``view_counter.record(prop_id)``, which only bumps an
+in-memory tally. Pending counts are written in one ``executemany`` of
+``UPDATE properties SET views_count = views_count + n`` when
+``VIEW_COUNT_FLUSH_SIZE`` views have piled up, every
+``VIEW_COUNT_FLUSH_INTERVAL`` seconds from a background thread, and at
+process exit. The additive update means concurrent workers never overwrite
+each other's counts. The same transaction adds one ``view_batches`` row per
+listing, which services.rollups turns into daily view counts.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import bindparam, func, insert, update
+from extensions import db
+from models import Property, ViewBatch
+
+log = logging.getLogger(__name__)
+
+_properties = Property.__table__
+_increment = update(_properties).where(
+    _properties.c.id == bindparam('prop_id')
+).values(views_count=func.coalesce(_properties.c.views_count, 0) + bindparam('n'))
+
+
+class ViewCounter:
+
+    def __init__(self):
+        self.app = None
+        self._pending = {}
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self.interval = 10
+        self.max_pending = 500
+
+    def init_app(self, app):
+        self.app = app
+        self.interval = app.config.get('VIEW_COUNT_FLUSH_INTERVAL', 10)
+        self.max_pending = app.config.get('VIEW_COUNT_FLUSH_SIZE', 500)
+        atexit.register(self.flush)
+
+    def record(self, prop_id):
+        with self._lock:
+            self._pending[prop_id] = self._pending.get(prop_id, 0) + 1
+            self._pending_total += 1
+            full = self._pending_total >= self.max_pending
+        self._ensure_thread()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write all pending counts; returns the number of views written."""
+        with self._lock:
+            batch, self._pending, self._pending_total = self._pending, {}, 0
+        if not batch or self.app is None:
+            return 0
+        rows = [{'prop_id': prop_id, 'n': n} for prop_id, n in batch.items()]
+        now = datetime.utcnow()
+        with self._flush_lock:
+            try:
+                with self.app.app_context():
+                    with db.engine.begin() as conn:
+                        conn.execute(_increment, rows)
+                        conn.execute(insert(ViewBatch.__table__), [
+                            {'property_id': prop_id, 'views': n, 'created_at': now} for prop_id, n in batch.items()
+                        ])
+            except Exception:
+                log.exception('Failed to flush %d view counts; requeueing', len(rows))
+                with self._lock:
+                    for prop_id, n in batch.items():
+                        self._pending[prop_id] = self._pending.get(prop_id, 0) + n
+                        self._pending_total += n
+                return 0
+        return sum(batch.values())
+
+    def _ensure_thread(self):
+        # Started lazily so that each forked gunicorn worker gets its own thread
+        if self._thread_pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid() and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+view_counter = ViewCounter()
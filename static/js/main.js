@@ -21,6 +21,23 @@ document.addEventListener('click', function(e) {
     }
 });
 
+// Reload once background photo processing finishes
+document.addEventListener('DOMContentLoaded', function() {
+    const pending = document.querySelectorAll('.job-pending[data-job-id]');
+    if (!pending.length) return;
+    const poll = setInterval(function() {
+        Promise.all(Array.from(pending).map(el =>
+            fetch('/agent/jobs/' + el.dataset.jobId).then(r => r.json())
+        )).then(jobs => {
+            if (jobs.every(job => job.finished || job.error === 'Job not found')) {
+                clearInterval(poll);
+                const next = pending[0].dataset.doneUrl;
+                next ? window.location.assign(next) : window.location.reload();
+            }
+        }).catch(() => clearInterval(poll));
+    }, 3000);
+});
+
 // Image upload preview
 function previewImages(input) {
     const container = document.getElementById('imagePreviewContainer');